@@ -40,18 +40,22 @@ def test_import():
         with open('vnpy/trader/multiprocess_manager.py', 'r', encoding='utf-8') as f:
             code = f.read()
         
-        # 检查__init__方法中是否包含启动方法设置
-        init_start = code.find('def __init__')
+        # 检查ProcessManager.__init__中是否使用私有上下文选择启动方法，且不修改全局启动方法
+        init_start = code.find('def __init__', code.find('class ProcessManager'))
         init_end = code.find('def ', init_start + 1) if init_start != -1 else len(code)
         init_code = code[init_start:init_end] if init_start != -1 else ''
-        has_init_set_start_method = 'multiprocessing.set_start_method' in init_code and 'is_mac_system()' in init_code
+        has_init_start_method = (
+            'multiprocessing.get_context(' in init_code
+            and 'is_mac_system()' in init_code
+            and 'multiprocessing.set_start_method' not in code
+        )
         
         checks = {
             '信号处理器为独立函数': 'def _signal_handler(' in code and 'self._signal_handler' not in code,
             '信号处理器正确调用': 'signal.signal(signal.SIGTERM, _signal_handler)' in code,
-            '共享状态清理使用正确锁': 'with self.shared_locks[strategy_id]:' in code,
-            'Mac启动方法在__init__中设置': has_init_set_start_method,
-            'TypeError处理改进': 'if \'_process_comm\' in str(e)' in code,
+            '共享状态清理无需加锁': 'handle.state.unlink()' in code and 'remove_prefix' not in code,
+            'Mac启动方法在__init__中设置': has_init_start_method,
+            'TypeError处理改进': 'if _accepts_process_comm(strategy_func):' in code and 'except TypeError as e:' not in code,
             '没有self._signal_handler引用': 'self._signal_handler' not in code,
             '没有错误的manager.Lock()使用': 'with self.manager.Lock()' not in code or ('if hasattr' in code and 'self.shared_locks' in code)
         }
@@ -91,7 +95,7 @@ def test_code_structure():
             if 'def _signal_handler(' in line and 'self' not in line:
                 has_signal_handler = True
                 print(f"✓ 找到独立信号处理器函数 (行 {i})")
-            if 'def __init__' in line and 'multiprocessing.set_start_method' in ''.join(lines[i:i+20]):
+            if 'def __init__' in line and 'multiprocessing.get_context(' in ''.join(lines[i:i+40]):
                 has_init = True
                 print(f"✓ __init__中包含启动方法设置 (行 {i})")
         
@@ -108,6 +112,38 @@ def test_code_structure():
         return False
 
 
+def test_message_roundtrip():
+    """测试进程间消息编码往返"""
+    print("\n" + "=" * 60)
+    print("测试4: 进程间消息编码往返")
+    print("=" * 60)
+    
+    try:
+        from vnpy.trader.multiprocess_manager import HAS_MSGPACK, dumps_message, loads_message
+        
+        if not HAS_MSGPACK:
+            print("⚠ 未安装msgpack，消息使用pickle编码，跳过")
+            return True
+        
+        messages = [
+            {'a': (1, 2)},
+            {(1, 'x'): 'tuple key'},
+            {('k', 2): [(1, 2), {'nested': (3,)}]},
+            ('type', {'data': ()}),
+        ]
+        for message in messages:
+            result = loads_message(dumps_message(message))
+            if result != message or type(result) is not type(message):
+                print(f"✗ 往返结果不一致: {message!r} -> {result!r}")
+                return False
+            print(f"✓ 往返一致: {message!r}")
+        
+        return True
+    except Exception as e:
+        print(f"✗ 消息编码测试失败: {e}")
+        return False
+
+
 def main():
     """主测试函数"""
     print("\n" + "=" * 60)
@@ -126,6 +162,9 @@ def main():
     # 测试3: 代码结构检查
     results.append(("代码结构检查", test_code_structure()))
     
+    # 测试4: 消息编码往返
+    results.append(("消息编码往返", test_message_roundtrip()))
+    
     # 总结
     print("\n" + "=" * 60)
     print("测试总结")
@@ -142,7 +181,7 @@ def main():
         print("\n🎉 所有修复验证通过！")
         print("\n修复内容：")
         print("  1. ✓ 信号处理器改为独立函数（可在子进程中使用）")
-        print("  2. ✓ 共享状态清理使用正确的锁机制")
+        print("  2. ✓ 共享状态按策略独立存放，清理时无需加锁")
         print("  3. ✓ Mac系统multiprocessing启动方法在__init__中设置")
         print("  4. ✓ TypeError处理改进，更精确地捕获参数错误")
         return 0
@@ -41,6 +41,78 @@ def test_optimization_metrics():
         print(f"  ✓ Profit Factor: {profit_factor:.4f}")
         print(f"  ✓ All Metrics: {len(all_metrics)} 个指标")
         
+        # 常数序列的标准差为0，不能因相消误差得到巨大的比率
+        assert metrics.calculate_sharpe_ratio([0.01] * 3) == 0.0
+        assert metrics.calculate_sharpe_ratio([0.1] * 7) == 0.0
+        assert metrics.calculate_sortino_ratio([0.02, -0.01, -0.01, 0.03, -0.01]) == float('inf')
+        assert metrics.calculate_r_cubed([0.01] * 3) == metrics.calculate_r_cubed([0.01] * 5)
+        print("  ✓ 常数序列标准差为0")
+        
+        return True
+    except Exception as e:
+        print(f"  ✗ 测试失败: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def test_optimization_metrics_batch():
+    """测试批量优化指标计算和指标缓存"""
+    print("\n测试: OptimizationMetrics 批量计算")
+    print("-" * 60)
+    try:
+        import math
+        import numpy as np
+        from vnpy.trader.optimization_metrics import OptimizationMetrics, clear_metrics_cache
+        
+        metrics = OptimizationMetrics()
+        clear_metrics_cache()
+        
+        # 随机收益率行，加上常数行和只有一笔亏损的行
+        rng = np.random.default_rng(7)
+        returns_matrix = np.vstack([
+            rng.normal(0.001, 0.02, (4, 60)),
+            np.full((1, 60), 0.01),
+            np.full((1, 60), -0.005),
+            np.r_[np.full(59, 0.01), -0.02][None, :],
+            np.tile([0.02, -0.01, -0.01, 0.03, -0.01], 12)[None, :]
+        ])
+        equity_matrix = 100 * np.cumprod(1 + returns_matrix, axis=1)
+        
+        def same(a, b, rel_tol):
+            return a == b or math.isclose(a, b, rel_tol=rel_tol, abs_tol=1e-9)
+        
+        # 批量结果与逐行计算一致
+        batch = metrics.calculate_all_metrics_batch(returns_matrix, equity_matrix)
+        r_cubed_batch = metrics.calculate_r_cubed_batch(returns_matrix)
+        for i, row in enumerate(returns_matrix):
+            expected = metrics.calculate_all_metrics(list(row), list(equity_matrix[i]))
+            for name, values in batch.items():
+                assert same(expected[name], float(values[i]), 1e-9), (i, name, expected[name], values[i])
+            assert same(expected['r_cubed'], float(r_cubed_batch[i]), 1e-9), (i, expected['r_cubed'])
+        
+        assert batch['sharpe_ratio'][4] == 0.0 and batch['sharpe_ratio'][5] == 0.0
+        assert batch['sortino_ratio'][4] == float('inf') and batch['sortino_ratio'][6] == float('inf')
+        print(f"  ✓ 批量计算与逐行计算一致: {len(returns_matrix)} 行")
+        
+        # float32精度：常数行仍为0，其余行在float32误差范围内
+        batch32 = metrics.calculate_all_metrics_batch(returns_matrix, dtype=np.float32)
+        for name in ('sharpe_ratio', 'r_cubed', 'win_rate'):
+            assert batch32[name].dtype == np.float64
+            for i in range(len(returns_matrix)):
+                assert same(float(batch[name][i]), float(batch32[name][i]), 1e-3), (i, name)
+        assert batch32['sharpe_ratio'][4] == 0.0
+        print("  ✓ float32批量计算")
+        
+        # 缓存命中时返回的结果被调用方修改，不影响缓存
+        returns = list(returns_matrix[0])
+        first = metrics.calculate_all_metrics(returns)
+        sharpe = first['sharpe_ratio']
+        first['sharpe_ratio'] = 999.0
+        first['extra'] = 1.0
+        second = metrics.calculate_all_metrics(returns)
+        assert second['sharpe_ratio'] == sharpe and 'extra' not in second
+        print("  ✓ 缓存结果不可被调用方修改")
+        
         return True
     except Exception as e:
         print(f"  ✗ 测试失败: {e}")
@@ -252,6 +324,7 @@ def main():
     
     tests = [
         ("优化指标", test_optimization_metrics),
+        ("批量优化指标", test_optimization_metrics_batch),
         ("数据过滤", test_data_filter),
         ("风险控制", test_enhanced_risk_manager),
         ("状态监控", test_status_monitor),
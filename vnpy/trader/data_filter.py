@@ -10,6 +10,8 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime, time
 from collections import defaultdict
 
+import numpy as np
+
 from .object import TickData, BarData
 from .constant import Exchange, Product
 from .logger import logger
@@ -47,6 +49,11 @@ DEFAULT_TRADING_HOURS: Dict[Exchange, Dict] = {
 }
 
 
+def _time_ns(t: time) -> int:
+    """time对象换算为当日纳秒数"""
+    return (((t.hour * 60 + t.minute) * 60 + t.second) * 1_000_000 + t.microsecond) * 1000
+
+
 class DataFilter:
     """
     数据过滤器
@@ -125,6 +132,49 @@ class DataFilter:
         
         return False
     
+    def is_trading_time_array(self, times: np.ndarray, exchange: Exchange) -> np.ndarray:
+        """
+        批量判断时间是否为交易时段
+        
+        与is_trading_time的判断规则一致，一次对整个数组做向量化比较。
+        
+        Args:
+            times: 交易所本地时间的datetime64数组（不带时区）
+            exchange: 交易所
+            
+        Returns:
+            np.ndarray: 布尔数组，True表示是交易时段
+        """
+        times = np.asarray(times, dtype="datetime64[ns]")
+        
+        if exchange not in self.trading_hours_config:
+            logger.warning(f"交易所 {exchange} 未配置交易时段，不过滤数据")
+            return np.ones(times.shape, dtype=np.bool_)
+        
+        config = self.trading_hours_config[exchange]
+        
+        # 当日时间（纳秒），与time对象换算后的纳秒数比较
+        t = (times - times.astype("datetime64[D]")).astype(np.int64)
+        mask = np.zeros(times.shape, dtype=np.bool_)
+        
+        # A股交易时段判断
+        if 'morning_open' in config and 'afternoon_close' in config:
+            mask |= (_time_ns(config['morning_open']) <= t) & (t <= _time_ns(config['morning_close']))
+            mask |= (_time_ns(config['afternoon_open']) <= t) & (t <= _time_ns(config['afternoon_close']))
+        
+        # 期货交易时段判断（包含夜盘）
+        if 'night_open' in config:
+            morning_open = config.get('morning_open', time(9, 0))
+            morning_close = config.get('morning_close', time(11, 30))
+            afternoon_open = config.get('afternoon_open', time(13, 30))
+            afternoon_close = config.get('afternoon_close', time(15, 0))
+            
+            mask |= (_time_ns(config['night_open']) <= t) | (t <= _time_ns(config['night_close']))
+            mask |= (_time_ns(morning_open) <= t) & (t <= _time_ns(morning_close))
+            mask |= (_time_ns(afternoon_open) <= t) & (t <= _time_ns(afternoon_close))
+        
+        return mask
+    
     def filter_tick(self, tick: TickData) -> bool:
         """
         过滤Tick数据
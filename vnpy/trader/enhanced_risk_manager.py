@@ -5,9 +5,10 @@
 参考Elite版RiskManager设计，提供完善的事前交易风控。
 """
 
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, Optional, Callable, ContextManager
 from datetime import datetime, timedelta
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
+from contextlib import nullcontext
 import threading
 import time
 
@@ -16,6 +17,11 @@ from .constant import Direction, Offset
 from .logger import logger
 
 
+def _new_stats() -> Dict[str, int]:
+    """创建空的订单统计"""
+    return {'total': 0, 'cancelled': 0, 'filled': 0}
+
+
 class EnhancedRiskManager:
     """
     增强型风险控制管理器
@@ -27,12 +33,13 @@ class EnhancedRiskManager:
     4. 实时风险监控
     """
     
-    def __init__(self, main_engine: Optional[object] = None):
+    def __init__(self, main_engine: Optional[object] = None, thread_safe: bool = True):
         """
         初始化风险控制管理器
         
         Args:
             main_engine: 主引擎实例（可选）
+            thread_safe: 是否启用线程锁（仅在单线程中调用时可设为False）
         """
         self.main_engine = main_engine
         
@@ -43,6 +50,8 @@ class EnhancedRiskManager:
         # 撤单比例限制配置
         self.cancel_ratio_limit: float = 0.5  # 最大撤单比例（50%）
         self.cancel_ratio_window: int = 100  # 统计窗口（最近N笔订单）
+        self.cancel_ratio_min_orders: int = 20  # 触发自动阻止所需的最少订单数
+        self.cancel_block_duration: float = 60.0  # 自动阻止持续时间（秒）
         
         # 持仓限额配置 {vt_symbol: max_position}
         self.position_limits: Dict[str, float] = {}
@@ -50,22 +59,25 @@ class EnhancedRiskManager:
         # 委托记录（用于速率限制）
         self.order_timestamps: deque = deque(maxlen=1000)
         
-        # 订单统计（用于撤单比例）
-        self.order_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {
-            'total': 0,
-            'cancelled': 0,
-            'filled': 0
-        })
+        # 订单累计统计（启动以来，不随统计窗口滚动）
+        self.order_stats: Dict[str, Dict[str, int]] = defaultdict(_new_stats)
+        
+        # 撤单比例统计窗口：每个合约最近cancel_ratio_window笔订单的结果
+        # {vt_symbol: {vt_orderid: [是否已撤单, 成交笔数]}}，按委托顺序排列，超出窗口的订单从头部移除
+        self.window_orders: Dict[str, OrderedDict] = defaultdict(OrderedDict)
+        # 窗口内订单的统计，随订单进出窗口增减
+        self.window_stats: Dict[str, Dict[str, int]] = defaultdict(_new_stats)
         
         # 订单历史（最近N笔）
         self.recent_orders: deque = deque(maxlen=1000)
         
-        # 线程锁
-        self.lock = threading.RLock()
+        # 线程锁（单线程部署时使用空上下文，省去加锁开销）
+        self.lock: ContextManager = threading.RLock() if thread_safe else nullcontext()
         
         # 风控状态
         self.risk_enabled: bool = True
         self.blocked_symbols: set = set()  # 被风控阻止的合约
+        self.cancel_block_until: Dict[str, float] = {}  # 撤单超限自动阻止的解除时间
         
         logger.info("EnhancedRiskManager初始化完成")
     
@@ -114,9 +126,9 @@ class EnhancedRiskManager:
             return True, ""
         
         with self.lock:
-            stats = self.order_stats[vt_symbol]
+            stats = self.window_stats[vt_symbol]
             
-            # 计算撤单比例
+            # 计算统计窗口内的撤单比例
             total = stats['total']
             cancelled = stats['cancelled']
             
@@ -193,8 +205,8 @@ class EnhancedRiskManager:
         
         vt_symbol = req.vt_symbol
         
-        # 检查是否被阻止
-        if vt_symbol in self.blocked_symbols:
+        # 检查是否被阻止（撤单比例超限时由record_cancel自动阻止）
+        if vt_symbol in self.blocked_symbols and not self._release_cancel_block(vt_symbol):
             return False, f"合约 {vt_symbol} 已被风控阻止"
         
         # 1. 检查委托速率
@@ -202,12 +214,7 @@ class EnhancedRiskManager:
         if not passed:
             return False, error
         
-        # 2. 检查撤单比例
-        passed, error = self.check_cancel_ratio(vt_symbol)
-        if not passed:
-            return False, error
-        
-        # 3. 检查持仓限额
+        # 2. 检查持仓限额
         if current_position is None:
             # 尝试从引擎获取
             if self.main_engine:
@@ -234,12 +241,30 @@ class EnhancedRiskManager:
         """
         记录订单（用于统计）
         
+        同一订单重复记录时只统计一次。订单进入统计窗口，窗口已满时移出最早的订单，
+        并从窗口统计中减去它的撤单和成交。
+        
         Args:
             order: 订单数据
         """
         with self.lock:
             vt_symbol = order.vt_symbol
+            window = self.window_orders[vt_symbol]
+            if order.vt_orderid in window:
+                return
+            
             self.order_stats[vt_symbol]['total'] += 1
+            
+            window_stats = self.window_stats[vt_symbol]
+            window[order.vt_orderid] = [False, 0]
+            window_stats['total'] += 1
+            
+            while len(window) > self.cancel_ratio_window:
+                _, (cancelled, fills) = window.popitem(last=False)
+                window_stats['total'] -= 1
+                window_stats['cancelled'] -= cancelled
+                window_stats['filled'] -= fills
+            
             self.recent_orders.append({
                 'vt_symbol': vt_symbol,
                 'vt_orderid': order.vt_orderid,
@@ -257,6 +282,50 @@ class EnhancedRiskManager:
         with self.lock:
             vt_symbol = order.vt_symbol
             self.order_stats[vt_symbol]['cancelled'] += 1
+            
+            # 只有仍在统计窗口内的订单计入窗口撤单数，同一订单只计一次
+            outcome = self.window_orders[vt_symbol].get(order.vt_orderid)
+            if outcome is None or outcome[0]:
+                return
+            outcome[0] = True
+            
+            stats = self.window_stats[vt_symbol]
+            stats['cancelled'] += 1
+            
+            # 撤单比例超限时自动阻止，委托路径上只需检查blocked_symbols
+            total = stats['total']
+            if (
+                self.risk_enabled
+                and total >= self.cancel_ratio_min_orders
+                and stats['cancelled'] > total * self.cancel_ratio_limit
+                and vt_symbol not in self.blocked_symbols
+            ):
+                self.cancel_block_until[vt_symbol] = time.time() + self.cancel_block_duration
+                self.block_symbol(vt_symbol)
+    
+    def _release_cancel_block(self, vt_symbol: str) -> bool:
+        """
+        检查撤单超限的自动阻止是否到期，到期则解除阻止并开始新的统计窗口
+        
+        Args:
+            vt_symbol: 合约代码
+            
+        Returns:
+            bool: 是否已解除阻止
+        """
+        with self.lock:
+            block_until = self.cancel_block_until.get(vt_symbol)
+            if block_until is None or time.time() < block_until:
+                return False
+            
+            self._clear_window(vt_symbol)
+            self.unblock_symbol(vt_symbol)
+            return True
+    
+    def _clear_window(self, vt_symbol: str) -> None:
+        """清空合约的撤单比例统计窗口（调用方需持有锁）"""
+        self.window_orders.pop(vt_symbol, None)
+        self.window_stats.pop(vt_symbol, None)
     
     def record_fill(self, trade: TradeData) -> None:
         """
@@ -268,6 +337,11 @@ class EnhancedRiskManager:
         with self.lock:
             vt_symbol = trade.vt_symbol
             self.order_stats[vt_symbol]['filled'] += 1
+            
+            outcome = self.window_orders[vt_symbol].get(trade.vt_orderid)
+            if outcome is not None:
+                outcome[1] += 1
+                self.window_stats[vt_symbol]['filled'] += 1
     
     def set_order_rate_limit(self, limit: int, window: float = 1.0) -> None:
         """
@@ -280,7 +354,7 @@ class EnhancedRiskManager:
         with self.lock:
             self.order_rate_limit = limit
             self.order_rate_window = window
-            logger.info(f"设置委托速率限制: {limit} 笔/秒 (窗口: {window}秒)")
+            logger.info("设置委托速率限制: {} 笔/秒 (窗口: {}秒)", limit, window)
     
     def set_cancel_ratio_limit(self, limit: float, window: int = 100) -> None:
         """
@@ -293,7 +367,7 @@ class EnhancedRiskManager:
         with self.lock:
             self.cancel_ratio_limit = limit
             self.cancel_ratio_window = window
-            logger.info(f"设置撤单比例限制: {limit:.2%} (窗口: {window}笔)")
+            logger.info("设置撤单比例限制: {:.2%} (窗口: {}笔)", limit, window)
     
     def set_position_limit(self, vt_symbol: str, max_position: float) -> None:
         """
@@ -305,7 +379,7 @@ class EnhancedRiskManager:
         """
         with self.lock:
             self.position_limits[vt_symbol] = max_position
-            logger.info(f"设置 {vt_symbol} 持仓限额: {max_position:.2f}")
+            logger.info("设置 {} 持仓限额: {:.2f}", vt_symbol, max_position)
     
     def remove_position_limit(self, vt_symbol: str) -> None:
         """
@@ -317,7 +391,7 @@ class EnhancedRiskManager:
         with self.lock:
             if vt_symbol in self.position_limits:
                 del self.position_limits[vt_symbol]
-                logger.info(f"移除 {vt_symbol} 持仓限额")
+                logger.info("移除 {} 持仓限额", vt_symbol)
     
     def block_symbol(self, vt_symbol: str) -> None:
         """
@@ -328,7 +402,7 @@ class EnhancedRiskManager:
         """
         with self.lock:
             self.blocked_symbols.add(vt_symbol)
-            logger.warning(f"风控阻止合约: {vt_symbol}")
+            logger.warning("风控阻止合约: {}", vt_symbol)
     
     def unblock_symbol(self, vt_symbol: str) -> None:
         """
@@ -338,14 +412,18 @@ class EnhancedRiskManager:
             vt_symbol: 合约代码
         """
         with self.lock:
+            self.cancel_block_until.pop(vt_symbol, None)
             if vt_symbol in self.blocked_symbols:
                 self.blocked_symbols.remove(vt_symbol)
-                logger.info(f"解除合约阻止: {vt_symbol}")
+                logger.info("解除合约阻止: {}", vt_symbol)
     
     def get_risk_stats(self, vt_symbol: Optional[str] = None) -> Dict:
         """
         获取风控统计信息
         
+        total_orders等为启动以来的累计统计；window_*为撤单比例统计窗口
+        （最近cancel_ratio_window笔订单）内的统计，撤单比例风控按窗口统计判断。
+        
         Args:
             vt_symbol: 合约代码（None表示所有合约）
             
@@ -355,12 +433,17 @@ class EnhancedRiskManager:
         with self.lock:
             if vt_symbol:
                 stats = self.order_stats.get(vt_symbol, {})
+                window_stats = self.window_stats.get(vt_symbol, {})
                 return {
                     'vt_symbol': vt_symbol,
                     'total_orders': stats.get('total', 0),
                     'cancelled_orders': stats.get('cancelled', 0),
                     'filled_orders': stats.get('filled', 0),
                     'cancel_ratio': stats.get('cancelled', 0) / max(stats.get('total', 1), 1),
+                    'window_orders': window_stats.get('total', 0),
+                    'window_cancelled': window_stats.get('cancelled', 0),
+                    'window_filled': window_stats.get('filled', 0),
+                    'window_cancel_ratio': window_stats.get('cancelled', 0) / max(window_stats.get('total', 1), 1),
                     'recent_order_rate': len(self.order_timestamps) / self.order_rate_window,
                     'is_blocked': vt_symbol in self.blocked_symbols
                 }
@@ -381,10 +464,13 @@ class EnhancedRiskManager:
         with self.lock:
             if vt_symbol:
                 if vt_symbol in self.order_stats:
-                    self.order_stats[vt_symbol] = {'total': 0, 'cancelled': 0, 'filled': 0}
-                    logger.info(f"重置 {vt_symbol} 风控统计")
+                    self.order_stats[vt_symbol] = _new_stats()
+                    self._clear_window(vt_symbol)
+                    logger.info("重置 {} 风控统计", vt_symbol)
             else:
                 self.order_stats.clear()
+                self.window_orders.clear()
+                self.window_stats.clear()
                 self.order_timestamps.clear()
                 self.recent_orders.clear()
                 logger.info("重置所有风控统计")
@@ -412,6 +498,8 @@ class EnhancedRiskManager:
             'order_rate_window': self.order_rate_window,
             'cancel_ratio_limit': self.cancel_ratio_limit,
             'cancel_ratio_window': self.cancel_ratio_window,
+            'cancel_ratio_min_orders': self.cancel_ratio_min_orders,
+            'cancel_block_duration': self.cancel_block_duration,
             'position_limits': dict(self.position_limits),
             'blocked_symbols': list(self.blocked_symbols)
         }
@@ -434,9 +522,14 @@ class EnhancedRiskManager:
                 self.cancel_ratio_limit = config['cancel_ratio_limit']
             if 'cancel_ratio_window' in config:
                 self.cancel_ratio_window = config['cancel_ratio_window']
+            if 'cancel_ratio_min_orders' in config:
+                self.cancel_ratio_min_orders = config['cancel_ratio_min_orders']
+            if 'cancel_block_duration' in config:
+                self.cancel_block_duration = config['cancel_block_duration']
             if 'position_limits' in config:
                 self.position_limits.update(config['position_limits'])
             if 'blocked_symbols' in config:
                 self.blocked_symbols = set(config['blocked_symbols'])
+                self.cancel_block_until.clear()
             
             logger.info("风控配置已更新")
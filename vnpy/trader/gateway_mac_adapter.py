@@ -23,6 +23,10 @@ from .platform_utils import (
 from .logger import logger
 
 
+# 非Mac系统加载动态库时立即绑定所有符号，避免首次调用接口函数时的延迟绑定开销
+LIBRARY_LOAD_MODE: int = getattr(os, "RTLD_NOW", 0) | getattr(os, "RTLD_GLOBAL", 0)
+
+
 class GatewayMacAdapter:
     """
     Mac系统Gateway动态库适配器
@@ -43,7 +47,7 @@ class GatewayMacAdapter:
         self.library_paths: Dict[str, str] = {}
         
         if not is_mac_system():
-            logger.warning(f"{gateway_name}适配器在非Mac系统上初始化")
+            logger.warning("{}适配器在非Mac系统上初始化", gateway_name)
     
     def find_library(
         self,
@@ -75,7 +79,7 @@ class GatewayMacAdapter:
         if framework_name:
             framework_path = find_framework_library(framework_name, lib_name)
             if framework_path and validate_mac_library(framework_path):
-                logger.info(f"找到Framework: {framework_path}")
+                logger.info("找到Framework: {}", framework_path)
                 return framework_path
         
         # 2. 在指定路径中查找
@@ -84,14 +88,14 @@ class GatewayMacAdapter:
                 # 尝试.dylib
                 dylib_path = get_dylib_path(base_path, lib_name)
                 if os.path.exists(dylib_path) and validate_mac_library(dylib_path):
-                    logger.info(f"找到动态库: {dylib_path}")
+                    logger.info("找到动态库: {}", dylib_path)
                     return dylib_path
                 
                 # 尝试.framework
                 if framework_name:
                     framework_path = get_framework_path(base_path, framework_name, lib_name)
                     if os.path.exists(framework_path) and validate_mac_library(framework_path):
-                        logger.info(f"找到Framework: {framework_path}")
+                        logger.info("找到Framework: {}", framework_path)
                         return framework_path
         
         # 3. 使用系统默认查找
@@ -99,7 +103,7 @@ class GatewayMacAdapter:
         if lib_path:
             return lib_path
         
-        logger.warning(f"未找到库: {lib_name}")
+        logger.warning("未找到库: {}", lib_name)
         return None
     
     def load_library(
@@ -107,7 +111,8 @@ class GatewayMacAdapter:
         lib_name: str,
         search_paths: Optional[List[str]] = None,
         framework_name: Optional[str] = None,
-        required: bool = True
+        required: bool = True,
+        symbols: Optional[List[str]] = None
     ) -> Optional[ctypes.CDLL]:
         """
         加载动态库
@@ -117,6 +122,7 @@ class GatewayMacAdapter:
             search_paths: 搜索路径列表
             framework_name: Framework名称
             required: 是否必需（如果必需但未找到会抛出异常）
+            symbols: 加载后需要预先解析的函数符号列表（可选）
             
         Returns:
             Optional[ctypes.CDLL]: 加载的库对象，如果未找到且非必需返回None
@@ -126,7 +132,7 @@ class GatewayMacAdapter:
         """
         # 检查是否已加载
         if lib_name in self.loaded_libraries:
-            logger.debug(f"库 {lib_name} 已加载，返回已加载的实例")
+            logger.debug("库 {} 已加载，返回已加载的实例", lib_name)
             return self.loaded_libraries[lib_name]
         
         # 查找库路径
@@ -138,7 +144,7 @@ class GatewayMacAdapter:
                 logger.error(error_msg)
                 raise OSError(error_msg)
             else:
-                logger.warning(f"{self.gateway_name}: 未找到可选库 {lib_name}")
+                logger.warning("{}: 未找到可选库 {}", self.gateway_name, lib_name)
                 return None
         
         # 加载库
@@ -146,12 +152,16 @@ class GatewayMacAdapter:
             if is_mac_system():
                 lib = load_mac_library(lib_path)
             else:
-                lib = ctypes.CDLL(lib_path)
+                lib = ctypes.CDLL(lib_path, mode=LIBRARY_LOAD_MODE)
             
             self.loaded_libraries[lib_name] = lib
             self.library_paths[lib_name] = lib_path
             
-            logger.info(f"{self.gateway_name}: 成功加载库 {lib_name} from {lib_path}")
+            logger.info("{}: 成功加载库 {} from {}", self.gateway_name, lib_name, lib_path)
+            
+            if symbols:
+                self.warmup_symbols(lib_name, symbols)
+            
             return lib
             
         except OSError as e:
@@ -161,6 +171,36 @@ class GatewayMacAdapter:
                 raise OSError(error_msg) from e
             return None
     
+    def warmup_symbols(self, lib_name: str, symbols: List[str]) -> List[str]:
+        """
+        预先解析已加载库中的函数符号
+        
+        ctypes会在库对象上缓存解析得到的函数指针，在启动时完成解析
+        可以避免交易过程中首次调用接口函数时的额外开销。
+        
+        Args:
+            lib_name: 库名称
+            symbols: 函数符号列表
+            
+        Returns:
+            List[str]: 未能解析的符号列表
+        """
+        lib = self.loaded_libraries.get(lib_name)
+        if lib is None:
+            return list(symbols)
+        
+        missing: List[str] = []
+        for name in symbols:
+            try:
+                getattr(lib, name)
+            except AttributeError:
+                missing.append(name)
+        
+        if missing:
+            logger.warning("{}: 库 {} 中未找到符号 {}", self.gateway_name, lib_name, ', '.join(missing))
+        
+        return missing
+    
     def get_library_path(self, lib_name: str) -> Optional[str]:
         """
         获取已加载库的路径
@@ -212,7 +252,7 @@ class GatewayMacAdapter:
             # 这里只是从记录中移除
             del self.loaded_libraries[lib_name]
             del self.library_paths[lib_name]
-            logger.info(f"{self.gateway_name}: 从记录中移除库 {lib_name}")
+            logger.info("{}: 从记录中移除库 {}", self.gateway_name, lib_name)
             return True
         except KeyError:
             return False
@@ -5,11 +5,16 @@
 参考Elite版HistoryManager设计，优化数据访问性能。
 """
 
-from typing import Dict, List, Optional, Callable
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Callable, Tuple, Iterable, Iterator, Union
+from datetime import datetime, timedelta, timezone, tzinfo
+from dataclasses import dataclass, field, fields, replace
 from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache
 import threading
 
+import numpy as np
+
 from .object import BarData, TickData
 from .constant import Interval, Exchange
 from .database import get_database, BaseDatabase
@@ -22,6 +27,527 @@ except ImportError:
     HAS_PANDAS = False
     logger.warning("pandas未安装，HistoryManager的DataFrame功能将不可用")
 
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+# 缓存锁分段数量
+LOCK_STRIPES: int = 64
+
+# Tick DataFrame包含的字段
+TICK_DATAFRAME_FIELDS: Tuple[str, ...] = (
+    "last_price",
+    "volume",
+    "turnover",
+    "open_interest",
+    "bid_price_1",
+    "ask_price_1",
+    "bid_volume_1",
+    "ask_volume_1"
+)
+
+# K线结构化数组格式（datetime为UTC时间）
+BAR_DTYPE: np.dtype = np.dtype([
+    ("datetime", "datetime64[ns]"),
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("volume", "f8"),
+    ("turnover", "f8"),
+    ("open_interest", "f8")
+])
+
+# iter_bars每次生成结构化数组的K线数量
+ITER_CHUNK_SIZE: int = 4096
+
+# 由K线缓存生成BarData时使用的接口名称（与数据库模块加载的数据一致）
+DB_GATEWAY_NAME: str = "DB"
+
+
+@lru_cache(maxsize=4096)
+def get_vt_symbol(symbol: str, exchange: Exchange) -> str:
+    """
+    生成本地代码（结果缓存，避免重复拼接字符串）
+    """
+    return f"{symbol}.{exchange.value}"
+
+
+@lru_cache(maxsize=64)
+def get_interval_str(interval: Interval) -> str:
+    """
+    获取K线周期字符串（结果缓存）
+    """
+    return interval.value if hasattr(interval, 'value') else str(interval)
+
+
+def to_datetime64(dt: datetime) -> np.datetime64:
+    """
+    转换为datetime64[ns]（带时区的时间统一转换为UTC）
+    """
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(dt, "ns")
+
+
+def to_datetime64_array(dts: Iterable[datetime]) -> np.ndarray:
+    """
+    批量转换为datetime64[ns]数组（带时区的时间统一转换为UTC）
+    """
+    return np.array(
+        [dt.astimezone(timezone.utc).replace(tzinfo=None) if dt.tzinfo is not None else dt for dt in dts],
+        dtype="datetime64[ns]"
+    )
+
+
+def _missing_ranges(
+    covered: List[Tuple[datetime, datetime]],
+    start: datetime,
+    end: datetime
+) -> List[Tuple[datetime, datetime]]:
+    """
+    计算[start, end]中未被已加载区间覆盖的部分
+
+    Args:
+        covered: 已加载的时间区间（按时间排序且互不重叠）
+        start: 开始时间
+        end: 结束时间
+
+    Returns:
+        List[Tuple[datetime, datetime]]: 需要补充加载的时间区间
+    """
+    gaps: List[Tuple[datetime, datetime]] = []
+    cursor: datetime = start
+    cursor_covered: bool = False
+
+    for lo, hi in covered:
+        if hi < cursor:
+            continue
+        if lo > end:
+            break
+
+        if lo > cursor:
+            gaps.append((cursor, lo))
+
+        cursor = hi
+        cursor_covered = True
+
+        if cursor >= end:
+            return gaps
+
+    if cursor < end or not cursor_covered:
+        gaps.append((cursor, end))
+
+    return gaps
+
+
+def _add_range(
+    covered: List[Tuple[datetime, datetime]],
+    start: datetime,
+    end: datetime
+) -> List[Tuple[datetime, datetime]]:
+    """
+    将[start, end]并入已加载区间，返回合并后的新列表（不修改原列表）
+    """
+    merged: List[Tuple[datetime, datetime]] = []
+
+    for lo, hi in sorted(covered + [(start, end)]):
+        if merged and lo <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+        else:
+            merged.append((lo, hi))
+
+    return merged
+
+
+def _merge_dedup_loop(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    双指针归并两个已排序的int64时间戳数组
+
+    Args:
+        a: 已有数据的时间戳
+        b: 新数据的时间戳
+
+    Returns:
+        np.ndarray: 合并结果在a、b拼接数组中的索引，时间重复时保留a中的记录
+    """
+    n: int = len(a)
+    m: int = len(b)
+    out: np.ndarray = np.empty(n + m, dtype=np.int64)
+
+    i: int = 0
+    j: int = 0
+    k: int = 0
+
+    while i < n and j < m:
+        if a[i] < b[j]:
+            out[k] = i
+            i += 1
+            k += 1
+        elif b[j] < a[i]:
+            out[k] = n + j
+            j += 1
+            k += 1
+        else:
+            j += 1
+
+    while i < n:
+        out[k] = i
+        i += 1
+        k += 1
+
+    while j < m:
+        out[k] = n + j
+        j += 1
+        k += 1
+
+    return out[:k]
+
+
+def _merge_dedup_numpy(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    _merge_dedup_loop的NumPy实现，未安装numba时使用
+    """
+    n: int = len(a)
+    keep: np.ndarray = np.flatnonzero(~np.isin(b, a))
+
+    index: np.ndarray = np.concatenate([np.arange(n, dtype=np.int64), keep + n])
+    order: np.ndarray = np.argsort(np.concatenate([a, b[keep]]), kind="stable")
+    return index[order]
+
+
+# 编译后的归并函数执行时释放GIL，不同合约的数据可以在多个线程中并行合并
+if HAS_NUMBA:
+    merge_dedup = njit(nogil=True, cache=True)(_merge_dedup_loop)
+else:
+    merge_dedup = _merge_dedup_numpy
+
+
+class _ColBuffer:
+    """
+    预留容量的列缓冲区
+
+    只在已用长度之后追加写入，容量不足时按倍数扩容，追加的均摊开销为O(1)。
+    """
+
+    __slots__ = ("data", "size")
+
+    def __init__(self, data: np.ndarray) -> None:
+        self.data: np.ndarray = data
+        self.size: int = len(data)
+
+    def append(self, new: np.ndarray) -> np.ndarray:
+        """追加数据，返回已用部分的视图"""
+        required: int = self.size + len(new)
+
+        if required > len(self.data):
+            buffer: np.ndarray = np.empty(max(len(self.data) * 2, required), dtype=self.data.dtype)
+            buffer[:self.size] = self.data[:self.size]
+            self.data = buffer
+
+        self.data[self.size:required] = new
+        self.size = required
+        return self.data[:required]
+
+
+class _ColumnStore:
+    """
+    列式缓存基类
+
+    除tz和buffers外的各字段均为等长数组，并按时间升序排列。
+
+    已存入缓存的对象不会被原地修改，合并数据时总是生成新对象再替换缓存中的引用，
+    因此读取方拿到引用后即为一致的快照，无需加锁。追加数据时写入的是缓冲区中
+    已有快照长度之后的部分，同样不会改变已发布的数据。
+    """
+
+    dt: np.ndarray
+    tz: Optional[tzinfo]
+    buffers: Optional[Dict[str, _ColBuffer]]
+
+    def __len__(self) -> int:
+        return len(self.dt)
+
+    def column_names(self) -> List[str]:
+        """获取所有数组字段名"""
+        return [f.name for f in fields(self) if f.name not in ("tz", "buffers")]
+
+    def take(self, index: Union[slice, np.ndarray]):
+        """按切片、布尔掩码或索引数组选取数据（切片不复制数据）"""
+        return replace(self, buffers=None, **{name: getattr(self, name)[index] for name in self.column_names()})
+
+    def concat(self, other):
+        """拼接两组列式数据"""
+        return replace(
+            self,
+            tz=self.tz or other.tz,
+            buffers=None,
+            **{name: np.concatenate([getattr(self, name), getattr(other, name)]) for name in self.column_names()}
+        )
+
+    def append(self, other):
+        """
+        在已有数据之后追加（other的时间均晚于已有数据）
+
+        只有缓存中最新的对象会继续写入其缓冲区，其余对象追加时先复制到新缓冲区。
+        """
+        buffers: Optional[Dict[str, _ColBuffer]] = self.buffers
+        if buffers is None or buffers["dt"].size != len(self):
+            buffers = {name: _ColBuffer(getattr(self, name)) for name in self.column_names()}
+
+        return replace(
+            self,
+            tz=self.tz or other.tz,
+            buffers=buffers,
+            **{name: buffers[name].append(getattr(other, name)) for name in self.column_names()}
+        )
+
+    def range_slice(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> slice:
+        """
+        获取时间范围[start, end]对应的切片
+
+        数据始终按时间排序，因此通过二分查找确定边界，无需逐条比较。
+        """
+        lo: int = np.searchsorted(self.dt, to_datetime64(start), side="left") if start else 0
+        hi: int = np.searchsorted(self.dt, to_datetime64(end), side="right") if end else len(self)
+        return slice(lo, max(lo, hi))
+
+    def sort(self):
+        """按时间排序（已有序时直接返回自身）"""
+        if len(self) > 1 and (self.dt[1:] < self.dt[:-1]).any():
+            return self.take(np.argsort(self.dt, kind="stable"))
+        return self
+
+    def merge(self, other):
+        """
+        合并新数据，时间重复的记录保留已有数据
+
+        数据库返回的数据通常已按时间排序，且多数情况下位于已有数据之后，
+        此时直接追加；否则由merge_dedup计算归并索引，再按索引一次性取出各列。
+        """
+        other = other.sort()
+
+        if not len(other):
+            return self
+        if not len(self) or other.dt[0] > self.dt[-1]:
+            return self.append(other)
+        if other.dt[-1] < self.dt[0]:
+            return other.concat(self)
+
+        index: np.ndarray = merge_dedup(self.dt.view(np.int64), other.dt.view(np.int64))
+        if len(index) == len(self):
+            return self
+
+        return self.concat(other).take(index)
+
+
+def _to_object_array(items: list) -> np.ndarray:
+    """转换为一维对象数组"""
+    objects: np.ndarray = np.empty(len(items), dtype=object)
+    objects[:] = items
+    return objects
+
+
+@dataclass
+class _BarColumns(_ColumnStore):
+    """
+    K线缓存的列式存储
+
+    只保存各字段数组，按List[BarData]返回缓存数据时再由各列生成BarData对象。
+    """
+
+    dt: np.ndarray
+    open_: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    turnover: np.ndarray
+    oi: np.ndarray
+    tz: Optional[tzinfo] = None
+    buffers: Optional[Dict[str, _ColBuffer]] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_bars(cls, bars: List[BarData]) -> "_BarColumns":
+        """由BarData列表生成列式数据"""
+        n: int = len(bars)
+
+        return cls(
+            dt=to_datetime64_array(bar.datetime for bar in bars),
+            open_=np.fromiter((bar.open_price for bar in bars), dtype=np.float64, count=n),
+            high=np.fromiter((bar.high_price for bar in bars), dtype=np.float64, count=n),
+            low=np.fromiter((bar.low_price for bar in bars), dtype=np.float64, count=n),
+            close=np.fromiter((bar.close_price for bar in bars), dtype=np.float64, count=n),
+            volume=np.fromiter((bar.volume for bar in bars), dtype=np.float64, count=n),
+            turnover=np.fromiter((bar.turnover for bar in bars), dtype=np.float64, count=n),
+            oi=np.fromiter((bar.open_interest for bar in bars), dtype=np.float64, count=n),
+            tz=bars[0].datetime.tzinfo if bars else None
+        )
+
+    def to_datetimes(self) -> List[datetime]:
+        """生成datetime列表（恢复原始时区，原始数据不带时区时保持不带时区）"""
+        dts: List[datetime] = self.dt.astype("datetime64[us]").tolist()
+        if self.tz is None:
+            return dts
+        return [dt.replace(tzinfo=timezone.utc).astimezone(self.tz) for dt in dts]
+
+    def to_bars(self, symbol: str, exchange: Exchange, interval: Interval) -> List[BarData]:
+        """由各列生成BarData列表"""
+        return [
+            BarData(
+                gateway_name=DB_GATEWAY_NAME,
+                symbol=symbol,
+                exchange=exchange,
+                datetime=dt,
+                interval=interval,
+                volume=volume,
+                turnover=turnover,
+                open_interest=oi,
+                open_price=open_price,
+                high_price=high_price,
+                low_price=low_price,
+                close_price=close_price
+            )
+            for dt, open_price, high_price, low_price, close_price, volume, turnover, oi in zip(
+                self.to_datetimes(),
+                self.open_.tolist(),
+                self.high.tolist(),
+                self.low.tolist(),
+                self.close.tolist(),
+                self.volume.tolist(),
+                self.turnover.tolist(),
+                self.oi.tolist()
+            )
+        ]
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """获取各字段的只读数组视图（不复制数据）"""
+        arrays: Dict[str, np.ndarray] = {
+            "datetime": self.dt,
+            "open": self.open_,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+            "turnover": self.turnover,
+            "open_interest": self.oi
+        }
+
+        for name, array in arrays.items():
+            view: np.ndarray = array.view()
+            view.flags.writeable = False
+            arrays[name] = view
+
+        return arrays
+
+    def to_dataframe(self) -> "pd.DataFrame":
+        """生成以datetime为索引的DataFrame"""
+        index: pd.DatetimeIndex = pd.DatetimeIndex(self.dt, name="datetime")
+        if self.tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self.tz)
+
+        arrays: Dict[str, np.ndarray] = self.to_arrays()
+        arrays.pop("datetime")
+        return pd.DataFrame(arrays, index=index)
+
+    def to_records(self) -> np.ndarray:
+        """生成BAR_DTYPE格式的结构化数组"""
+        records: np.ndarray = np.empty(len(self), dtype=BAR_DTYPE)
+        for name, array in self.to_arrays().items():
+            records[name] = array
+        return records
+
+
+class BarView:
+    """
+    结构化数组中单根K线的只读视图
+
+    提供与BarData相同的行情属性名，供仍使用open_price等属性的代码读取数据，
+    无需构造BarData对象。datetime为UTC时间。
+    """
+
+    __slots__ = ("_r",)
+
+    def __init__(self, record: np.void) -> None:
+        self._r: np.void = record
+
+    @property
+    def datetime(self) -> datetime:
+        return self._r["datetime"].astype("datetime64[us]").item().replace(tzinfo=timezone.utc)
+
+    @property
+    def open_price(self) -> float:
+        return float(self._r["open"])
+
+    @property
+    def high_price(self) -> float:
+        return float(self._r["high"])
+
+    @property
+    def low_price(self) -> float:
+        return float(self._r["low"])
+
+    @property
+    def close_price(self) -> float:
+        return float(self._r["close"])
+
+    @property
+    def volume(self) -> float:
+        return float(self._r["volume"])
+
+    @property
+    def turnover(self) -> float:
+        return float(self._r["turnover"])
+
+    @property
+    def open_interest(self) -> float:
+        return float(self._r["open_interest"])
+
+
+def _barobj_view(records: np.ndarray, i: int) -> BarView:
+    """获取结构化数组中第i根K线的属性视图"""
+    return BarView(records[i])
+
+
+@dataclass
+class _TickColumns(_ColumnStore):
+    """
+    Tick缓存的列式存储
+
+    ticks保存原始TickData对象，dt用于去重和时间过滤。
+    """
+
+    dt: np.ndarray
+    ticks: np.ndarray
+    tz: Optional[tzinfo] = None
+    buffers: Optional[Dict[str, _ColBuffer]] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_ticks(cls, ticks: List[TickData]) -> "_TickColumns":
+        """由TickData列表生成列式数据"""
+        return cls(
+            dt=to_datetime64_array(tick.datetime for tick in ticks),
+            ticks=_to_object_array(ticks),
+            tz=ticks[0].datetime.tzinfo if ticks else None
+        )
+
+    def to_dataframe(self) -> "pd.DataFrame":
+        """生成以datetime为索引的DataFrame"""
+        index: pd.DatetimeIndex = pd.DatetimeIndex(self.dt, name="datetime")
+        if self.tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self.tz)
+
+        n: int = len(self)
+        data: Dict[str, np.ndarray] = {
+            name: np.fromiter((getattr(tick, name) for tick in self.ticks), dtype=np.float64, count=n)
+            for name in TICK_DATAFRAME_FIELDS
+        }
+        return pd.DataFrame(data, index=index)
+
+
 
 class HistoryManager:
     """
@@ -40,17 +566,26 @@ class HistoryManager:
         """
         self.database = database or get_database()
         
-        # K线数据缓存 {vt_symbol: {interval: [BarData]}}
-        self.bar_cache: Dict[str, Dict[str, List[BarData]]] = defaultdict(dict)
+        # K线数据缓存 {(vt_symbol, interval): _BarColumns}
+        self.bar_cache: Dict[Tuple[str, str], _BarColumns] = {}
+        
+        # K线缓存已从数据库加载过的时间区间 {(vt_symbol, interval): [(start, end)]}
+        self.bar_ranges: Dict[Tuple[str, str], List[Tuple[datetime, datetime]]] = {}
+        
+        # Tick数据缓存 {vt_symbol: _TickColumns}
+        self.tick_cache: Dict[str, _TickColumns] = {}
+        
+        # 缓存锁（按合约分段，不同合约的读写互不阻塞）
+        self.cache_locks: List[threading.RLock] = [threading.RLock() for _ in range(LOCK_STRIPES)]
         
-        # Tick数据缓存 {vt_symbol: [TickData]}
-        self.tick_cache: Dict[str, List[TickData]] = defaultdict(list)
+        # 回调函数锁
+        self.callback_lock = threading.RLock()
         
-        # 缓存锁（线程安全）
-        self.cache_lock = threading.RLock()
+        # on_history回调函数 {(vt_symbol, interval): [Callable]}
+        self.history_callbacks: Dict[Tuple[str, str], List[Callable]] = {}
         
-        # on_history回调函数 {vt_symbol: {interval: [Callable]}}
-        self.history_callbacks: Dict[str, Dict[str, List[Callable]]] = defaultdict(lambda: defaultdict(list))
+        # 向量化回调函数，直接接收各字段数组 {(vt_symbol, interval): [Callable]}
+        self.vectorized_callbacks: Dict[Tuple[str, str], List[Callable]] = {}
         
         # 缓存统计
         self.cache_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
@@ -80,52 +615,52 @@ class HistoryManager:
         Returns:
             List[BarData]: K线数据列表
         """
-        vt_symbol = f"{symbol}.{exchange.value}"
-        interval_str = interval.value if hasattr(interval, 'value') else str(interval)
+        vt_symbol = get_vt_symbol(symbol, exchange)
+        interval_str = get_interval_str(interval)
         
-        # 检查缓存
-        cache_key = f"{vt_symbol}_{interval_str}"
-        cached_bars = self._get_cached_bars(vt_symbol, interval_str, start, end)
+        cached_columns = self._ensure_bars_cached(symbol, exchange, interval, start, end)
+        if cached_columns is None or not len(cached_columns):
+            return []
         
-        if cached_bars and len(cached_bars) > 0:
-            logger.debug(f"从缓存加载 {len(cached_bars)} 根K线: {cache_key}")
-            self.cache_stats[vt_symbol][interval_str] += 1
-            
-            # 触发回调
-            if callback:
-                callback(cached_bars)
-            self._trigger_history_callbacks(vt_symbol, interval_str, cached_bars)
-            
-            return cached_bars
+        bars = cached_columns.to_bars(symbol, exchange, interval)
+        logger.debug(f"从缓存加载 {len(bars)} 根K线: {vt_symbol}_{interval_str}")
         
-        # 从数据库加载
-        logger.info(f"从数据库加载K线数据: {vt_symbol}, {interval_str}, {start} ~ {end}")
-        bars = self.database.load_bar_data(symbol, exchange, interval, start, end)
+        # 触发回调
+        if callback:
+            callback(bars)
+        self._trigger_history_callbacks(vt_symbol, interval_str, bars, cached_columns)
         
-        if bars:
-            # 更新缓存
-            with self.cache_lock:
-                if interval_str not in self.bar_cache[vt_symbol]:
-                    self.bar_cache[vt_symbol][interval_str] = []
-                
-                # 合并并去重
-                existing_bars = self.bar_cache[vt_symbol][interval_str]
-                existing_datetimes = {bar.datetime for bar in existing_bars}
-                
-                new_bars = [bar for bar in bars if bar.datetime not in existing_datetimes]
-                self.bar_cache[vt_symbol][interval_str].extend(new_bars)
-                
-                # 按时间排序
-                self.bar_cache[vt_symbol][interval_str].sort(key=lambda x: x.datetime)
-            
-            logger.info(f"加载完成，缓存 {len(self.bar_cache[vt_symbol][interval_str])} 根K线")
+        return bars
+    
+    def load_bar_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> np.ndarray:
+        """
+        加载K线数据，以结构化数组形式返回
+        
+        数组格式为BAR_DTYPE，其中datetime字段为UTC时间。缓存未覆盖的区间同样从数据库加载，
+        但直接由列式缓存生成数组，不构造BarData列表，也不触发on_history回调。
+        
+        Args:
+            symbol: 合约代码
+            exchange: 交易所
+            interval: K线周期
+            start: 开始时间
+            end: 结束时间
             
-            # 触发回调
-            if callback:
-                callback(bars)
-            self._trigger_history_callbacks(vt_symbol, interval_str, bars)
+        Returns:
+            np.ndarray: K线结构化数组
+        """
+        columns = self._ensure_bars_cached(symbol, exchange, interval, start, end)
+        if columns is None:
+            return np.empty(0, dtype=BAR_DTYPE)
         
-        return bars
+        return columns.to_records()
     
     def load_tick_data(
         self,
@@ -148,7 +683,7 @@ class HistoryManager:
         Returns:
             List[TickData]: Tick数据列表
         """
-        vt_symbol = f"{symbol}.{exchange.value}"
+        vt_symbol = get_vt_symbol(symbol, exchange)
         
         # 检查缓存
         cached_ticks = self._get_cached_ticks(vt_symbol, start, end)
@@ -169,15 +704,16 @@ class HistoryManager:
         
         if ticks:
             # 更新缓存
-            with self.cache_lock:
-                existing_ticks = self.tick_cache[vt_symbol]
-                existing_datetimes = {tick.datetime for tick in existing_ticks}
-                
-                new_ticks = [tick for tick in ticks if tick.datetime not in existing_datetimes]
-                self.tick_cache[vt_symbol].extend(new_ticks)
+            new_columns = _TickColumns.from_ticks(ticks)
+            
+            with self._get_lock(vt_symbol):
+                columns = self.tick_cache.get(vt_symbol)
                 
-                # 按时间排序
-                self.tick_cache[vt_symbol].sort(key=lambda x: x.datetime)
+                if columns is None:
+                    self.tick_cache[vt_symbol] = new_columns.sort()
+                else:
+                    # 合并去重，并按时间排序
+                    self.tick_cache[vt_symbol] = columns.merge(new_columns)
             
             logger.info(f"加载完成，缓存 {len(self.tick_cache[vt_symbol])} 条Tick")
             
@@ -212,47 +748,65 @@ class HistoryManager:
             logger.warning("pandas未安装，无法生成DataFrame")
             return None
         
-        vt_symbol = f"{symbol}.{exchange.value}"
-        interval_str = interval.value if hasattr(interval, 'value') else str(interval)
+        vt_symbol = get_vt_symbol(symbol, exchange)
+        interval_str = get_interval_str(interval)
         
-        # 从缓存获取数据
-        with self.cache_lock:
-            if interval_str not in self.bar_cache[vt_symbol]:
-                logger.warning(f"缓存中无数据: {vt_symbol}, {interval_str}")
-                return None
-            
-            bars = self.bar_cache[vt_symbol][interval_str].copy()
+        # 从缓存获取数据快照（无需加锁）
+        columns = self.bar_cache.get((vt_symbol, interval_str))
+        if columns is None:
+            logger.warning(f"缓存中无数据: {vt_symbol}, {interval_str}")
+            return None
         
         # 时间过滤
-        if start:
-            bars = [bar for bar in bars if bar.datetime >= start]
-        if end:
-            bars = [bar for bar in bars if bar.datetime <= end]
+        selected = columns.take(columns.range_slice(start, end))
         
-        if not bars:
+        if not len(selected):
             logger.warning(f"过滤后无数据: {vt_symbol}, {interval_str}")
             return None
         
         # 转换为DataFrame
-        data = []
-        for bar in bars:
-            data.append({
-                'datetime': bar.datetime,
-                'open': bar.open_price,
-                'high': bar.high_price,
-                'low': bar.low_price,
-                'close': bar.close_price,
-                'volume': bar.volume,
-                'turnover': bar.turnover,
-                'open_interest': bar.open_interest
-            })
-        
-        df = pd.DataFrame(data)
-        df.set_index('datetime', inplace=True)
+        df = selected.to_dataframe()
         
         logger.debug(f"生成DataFrame: {len(df)} 行, {vt_symbol}, {interval_str}")
         return df
     
+    def iter_bars(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Iterator[BarView]:
+        """
+        逐根遍历缓存中的K线
+        
+        按ITER_CHUNK_SIZE分批转换为结构化数组，无需生成完整的DataFrame或BarData列表。
+        只遍历调用时的缓存快照，数据需先通过load_bar_data加载。
+        
+        Args:
+            symbol: 合约代码
+            exchange: 交易所
+            interval: K线周期
+            start: 开始时间（None表示从缓存最早时间开始）
+            end: 结束时间（None表示到缓存最晚时间）
+            
+        Returns:
+            Iterator[BarView]: K线视图迭代器
+        """
+        vt_symbol = get_vt_symbol(symbol, exchange)
+        interval_str = get_interval_str(interval)
+        
+        columns = self.bar_cache.get((vt_symbol, interval_str))
+        if columns is None:
+            return
+        
+        selected = columns.take(columns.range_slice(start, end))
+        
+        for i in range(0, len(selected), ITER_CHUNK_SIZE):
+            for record in selected.take(slice(i, i + ITER_CHUNK_SIZE)).to_records():
+                yield BarView(record)
+    
     def get_tick_dataframe(
         self,
         symbol: str,
@@ -276,43 +830,23 @@ class HistoryManager:
             logger.warning("pandas未安装，无法生成DataFrame")
             return None
         
-        vt_symbol = f"{symbol}.{exchange.value}"
+        vt_symbol = get_vt_symbol(symbol, exchange)
         
-        # 从缓存获取数据
-        with self.cache_lock:
-            if vt_symbol not in self.tick_cache:
-                logger.warning(f"缓存中无Tick数据: {vt_symbol}")
-                return None
-            
-            ticks = self.tick_cache[vt_symbol].copy()
+        # 从缓存获取数据快照（无需加锁）
+        columns = self.tick_cache.get(vt_symbol)
+        if columns is None:
+            logger.warning(f"缓存中无Tick数据: {vt_symbol}")
+            return None
         
         # 时间过滤
-        if start:
-            ticks = [tick for tick in ticks if tick.datetime >= start]
-        if end:
-            ticks = [tick for tick in ticks if tick.datetime <= end]
+        selected = columns.take(columns.range_slice(start, end))
         
-        if not ticks:
+        if not len(selected):
             logger.warning(f"过滤后无Tick数据: {vt_symbol}")
             return None
         
         # 转换为DataFrame
-        data = []
-        for tick in ticks:
-            data.append({
-                'datetime': tick.datetime,
-                'last_price': tick.last_price,
-                'volume': tick.volume,
-                'turnover': tick.turnover,
-                'open_interest': tick.open_interest,
-                'bid_price_1': tick.bid_price_1,
-                'ask_price_1': tick.ask_price_1,
-                'bid_volume_1': tick.bid_volume_1,
-                'ask_volume_1': tick.ask_volume_1
-            })
-        
-        df = pd.DataFrame(data)
-        df.set_index('datetime', inplace=True)
+        df = selected.to_dataframe()
         
         logger.debug(f"生成Tick DataFrame: {len(df)} 行, {vt_symbol}")
         return df
@@ -329,18 +863,31 @@ class HistoryManager:
         
         当新数据加载到缓存时，会自动触发回调函数。
         
+        普通回调函数接收List[BarData]参数；设置了_vectorized = True属性的函数
+        （以及numba编译的函数）作为向量化回调，接收{字段名: 只读数组}字典参数，
+        无需构造BarData列表。
+        
         Args:
             symbol: 合约代码
             exchange: 交易所
             interval: K线周期
-            callback: 回调函数，接收List[BarData]参数
+            callback: 回调函数
         """
-        vt_symbol = f"{symbol}.{exchange.value}"
-        interval_str = interval.value if hasattr(interval, 'value') else str(interval)
+        vt_symbol = get_vt_symbol(symbol, exchange)
+        interval_str = get_interval_str(interval)
+        
+        key = (vt_symbol, interval_str)
         
-        with self.cache_lock:
-            if callback not in self.history_callbacks[vt_symbol][interval_str]:
-                self.history_callbacks[vt_symbol][interval_str].append(callback)
+        if getattr(callback, "_vectorized", False) or hasattr(callback, "_numba_type_"):
+            registry = self.vectorized_callbacks
+        else:
+            registry = self.history_callbacks
+        
+        with self.callback_lock:
+            callbacks = registry.get(key, [])
+            if callback not in callbacks:
+                # 替换为新列表，触发回调时遍历的列表不会被修改
+                registry[key] = callbacks + [callback]
                 logger.debug(f"注册历史数据回调: {vt_symbol}, {interval_str}")
     
     def unregister_history_callback(
@@ -359,13 +906,21 @@ class HistoryManager:
             interval: K线周期
             callback: 回调函数
         """
-        vt_symbol = f"{symbol}.{exchange.value}"
-        interval_str = interval.value if hasattr(interval, 'value') else str(interval)
+        vt_symbol = get_vt_symbol(symbol, exchange)
+        interval_str = get_interval_str(interval)
+        
+        key = (vt_symbol, interval_str)
         
-        with self.cache_lock:
-            if callback in self.history_callbacks[vt_symbol][interval_str]:
-                self.history_callbacks[vt_symbol][interval_str].remove(callback)
-                logger.debug(f"取消注册历史数据回调: {vt_symbol}, {interval_str}")
+        with self.callback_lock:
+            for registry in (self.history_callbacks, self.vectorized_callbacks):
+                callbacks = registry.get(key, [])
+                if callback in callbacks:
+                    callbacks = [cb for cb in callbacks if cb != callback]
+                    if callbacks:
+                        registry[key] = callbacks
+                    else:
+                        del registry[key]
+                    logger.debug(f"取消注册历史数据回调: {vt_symbol}, {interval_str}")
     
     def clear_cache(
         self,
@@ -381,25 +936,30 @@ class HistoryManager:
             exchange: 交易所（None表示清除所有）
             interval: K线周期（None表示清除所有周期）
         """
-        with self.cache_lock:
-            if symbol and exchange:
-                vt_symbol = f"{symbol}.{exchange.value}"
-                
+        if symbol and exchange:
+            vt_symbol = get_vt_symbol(symbol, exchange)
+            
+            with self._get_lock(vt_symbol):
                 if interval:
-                    interval_str = interval.value if hasattr(interval, 'value') else str(interval)
-                    if interval_str in self.bar_cache[vt_symbol]:
-                        del self.bar_cache[vt_symbol][interval_str]
+                    interval_str = get_interval_str(interval)
+                    self.bar_ranges.pop((vt_symbol, interval_str), None)
+                    if (vt_symbol, interval_str) in self.bar_cache:
+                        del self.bar_cache[(vt_symbol, interval_str)]
                         logger.info(f"清除缓存: {vt_symbol}, {interval_str}")
                 else:
                     # 清除该合约的所有周期
-                    if vt_symbol in self.bar_cache:
-                        del self.bar_cache[vt_symbol]
+                    for key in [key for key in list(self.bar_cache) if key[0] == vt_symbol]:
+                        del self.bar_cache[key]
+                    for key in [key for key in list(self.bar_ranges) if key[0] == vt_symbol]:
+                        del self.bar_ranges[key]
                     if vt_symbol in self.tick_cache:
                         del self.tick_cache[vt_symbol]
                     logger.info(f"清除缓存: {vt_symbol} (所有周期)")
-            else:
+        else:
+            with self._lock_all():
                 # 清除所有缓存
                 self.bar_cache.clear()
+                self.bar_ranges.clear()
                 self.tick_cache.clear()
                 logger.info("清除所有缓存")
     
@@ -416,32 +976,107 @@ class HistoryManager:
             'stats': dict(self.cache_stats)
         }
         
-        with self.cache_lock:
-            for vt_symbol, intervals in self.bar_cache.items():
-                info['bar_cache'][vt_symbol] = {}
-                for interval_str, bars in intervals.items():
-                    info['bar_cache'][vt_symbol][interval_str] = len(bars)
-                    if bars:
-                        info['bar_cache'][vt_symbol][f"{interval_str}_start"] = bars[0].datetime.isoformat()
-                        info['bar_cache'][vt_symbol][f"{interval_str}_end"] = bars[-1].datetime.isoformat()
+        with self._lock_all():
+            for (vt_symbol, interval_str), columns in self.bar_cache.items():
+                symbol_info = info['bar_cache'].setdefault(vt_symbol, {})
+                symbol_info[interval_str] = len(columns)
+                if len(columns):
+                    first, last = columns.take([0, -1]).to_datetimes()
+                    symbol_info[f"{interval_str}_start"] = first.isoformat()
+                    symbol_info[f"{interval_str}_end"] = last.isoformat()
             
-            for vt_symbol, ticks in self.tick_cache.items():
-                info['tick_cache'][vt_symbol] = len(ticks)
-                if ticks:
-                    info['tick_cache'][f"{vt_symbol}_start"] = ticks[0].datetime.isoformat()
-                    info['tick_cache'][f"{vt_symbol}_end"] = ticks[-1].datetime.isoformat()
+            for vt_symbol, columns in self.tick_cache.items():
+                info['tick_cache'][vt_symbol] = len(columns)
+                if len(columns):
+                    info['tick_cache'][f"{vt_symbol}_start"] = columns.ticks[0].datetime.isoformat()
+                    info['tick_cache'][f"{vt_symbol}_end"] = columns.ticks[-1].datetime.isoformat()
         
         return info
     
-    def _get_cached_bars(
+    def _get_lock(self, vt_symbol: str) -> threading.RLock:
+        """
+        获取合约对应的缓存锁
+        
+        Args:
+            vt_symbol: 合约代码
+            
+        Returns:
+            threading.RLock: 缓存锁
+        """
+        return self.cache_locks[hash(vt_symbol) % LOCK_STRIPES]
+    
+    @contextmanager
+    def _lock_all(self):
+        """按固定顺序获取所有缓存锁（用于全局操作）"""
+        with ExitStack() as stack:
+            for lock in self.cache_locks:
+                stack.enter_context(lock)
+            yield
+    
+    def _ensure_bars_cached(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> Optional[_BarColumns]:
+        """
+        从数据库加载缓存尚未覆盖的时间区间，合并到缓存后返回[start, end]内的列式数据
+        
+        Args:
+            symbol: 合约代码
+            exchange: 交易所
+            interval: K线周期
+            start: 开始时间
+            end: 结束时间
+            
+        Returns:
+            Optional[_BarColumns]: 缓存的K线列式数据（不复制数据），无缓存时返回None
+        """
+        vt_symbol = get_vt_symbol(symbol, exchange)
+        interval_str = get_interval_str(interval)
+        
+        key = (vt_symbol, interval_str)
+        
+        # 只从数据库加载缓存尚未覆盖的时间区间
+        gaps = _missing_ranges(self.bar_ranges.get(key, []), start, end)
+        
+        if not gaps:
+            self.cache_stats[vt_symbol][interval_str] += 1
+        
+        for gap_start, gap_end in gaps:
+            logger.info(f"从数据库加载K线数据: {vt_symbol}, {interval_str}, {gap_start} ~ {gap_end}")
+            new_bars = self.database.load_bar_data(symbol, exchange, interval, gap_start, gap_end)
+            new_columns = _BarColumns.from_bars(new_bars).sort() if new_bars else None
+            
+            with self._get_lock(vt_symbol):
+                if new_columns is not None:
+                    columns = self.bar_cache.get(key)
+                    
+                    if columns is None:
+                        self.bar_cache[key] = new_columns
+                    else:
+                        # 合并去重，并按时间排序
+                        self.bar_cache[key] = columns.merge(new_columns)
+                
+                # 没有数据的区间同样记录，避免重复查询数据库
+                self.bar_ranges[key] = _add_range(self.bar_ranges.get(key, []), gap_start, gap_end)
+        
+        if gaps and key in self.bar_cache:
+            logger.info(f"加载完成，缓存 {len(self.bar_cache[key])} 根K线")
+        
+        return self._get_cached_columns(vt_symbol, interval_str, start, end)
+    
+    def _get_cached_columns(
         self,
         vt_symbol: str,
         interval_str: str,
         start: datetime,
         end: datetime
-    ) -> List[BarData]:
+    ) -> Optional[_BarColumns]:
         """
-        从缓存获取K线数据
+        从缓存获取K线列式数据（不复制数据）
         
         Args:
             vt_symbol: 合约代码
@@ -450,21 +1085,14 @@ class HistoryManager:
             end: 结束时间
             
         Returns:
-            List[BarData]: 缓存的K线数据列表
+            Optional[_BarColumns]: 缓存的K线列式数据，无缓存时返回None
         """
-        with self.cache_lock:
-            if interval_str not in self.bar_cache[vt_symbol]:
-                return []
-            
-            bars = self.bar_cache[vt_symbol][interval_str]
-            
-            # 时间过滤
-            cached_bars = [
-                bar for bar in bars
-                if start <= bar.datetime <= end
-            ]
-            
-            return cached_bars
+        columns = self.bar_cache.get((vt_symbol, interval_str))
+        if columns is None:
+            return None
+        
+        # 时间过滤
+        return columns.take(columns.range_slice(start, end))
     
     def _get_cached_ticks(
         self,
@@ -483,25 +1111,19 @@ class HistoryManager:
         Returns:
             List[TickData]: 缓存的Tick数据列表
         """
-        with self.cache_lock:
-            if vt_symbol not in self.tick_cache:
-                return []
-            
-            ticks = self.tick_cache[vt_symbol]
-            
-            # 时间过滤
-            cached_ticks = [
-                tick for tick in ticks
-                if start <= tick.datetime <= end
-            ]
-            
-            return cached_ticks
+        columns = self.tick_cache.get(vt_symbol)
+        if columns is None:
+            return []
+        
+        # 时间过滤
+        return columns.ticks[columns.range_slice(start, end)].tolist()
     
     def _trigger_history_callbacks(
         self,
         vt_symbol: str,
         interval_str: str,
-        bars: List[BarData]
+        bars: List[BarData],
+        columns: _BarColumns
     ) -> None:
         """
         触发历史数据回调函数
@@ -510,14 +1132,28 @@ class HistoryManager:
             vt_symbol: 合约代码
             interval_str: K线周期字符串
             bars: 新加载的K线数据
+            columns: 新加载的K线列式数据
         """
         if not bars:
             return
         
-        callbacks = self.history_callbacks.get(vt_symbol, {}).get(interval_str, [])
+        key = (vt_symbol, interval_str)
         
-        for callback in callbacks:
+        callbacks = self.history_callbacks.get(key)
+        if callbacks:
+            for callback in callbacks:
+                try:
+                    callback(bars)
+                except Exception as e:
+                    logger.error(f"执行历史数据回调函数失败: {e}")
+        
+        # 向量化回调共用同一组数组，并统一处理异常
+        vectorized_callbacks = self.vectorized_callbacks.get(key)
+        if vectorized_callbacks:
+            arrays: Dict[str, np.ndarray] = columns.to_arrays()
+            
             try:
-                callback(bars)
+                for callback in vectorized_callbacks:
+                    callback(arrays)
             except Exception as e:
-                logger.error(f"执行历史数据回调函数失败: {e}")
+                logger.error(f"执行向量化历史数据回调函数失败: {e}")
@@ -6,15 +6,151 @@
 """
 
 import multiprocessing
-from typing import Dict, List, Optional, Callable, Any
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from enum import IntEnum
+from functools import partial
+from multiprocessing.context import BaseContext
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Callable, Any, Tuple
 from datetime import datetime
-from queue import Empty
+from threading import Event
 import time
 import traceback
 
-from .multiprocess_manager import ProcessManager
+import numpy as np
+
 from .logger import logger
-from .platform_utils import is_mac_system
+from .multiprocess_manager import FORKSERVER_PRELOAD as MANAGER_PRELOAD
+from .platform_utils import is_mac_system, is_windows_system
+
+
+# forkserver启动时预先导入的模块，工作进程fork后直接继承，无需重复导入。
+# 不预先导入"__main__"：服务进程会重新执行没有main保护的启动脚本。
+#
+# 同一解释器内所有forkserver上下文共用一个服务进程，预先导入列表只在服务进程首次启动时生效，
+# 之后再设置的列表不起作用。因此这里包含ProcessManager的全部预先导入模块
+# （multiprocess_manager.FORKSERVER_PRELOAD）：回测管理器先启动服务进程时策略进程同样受益；
+# ProcessManager先启动时回测工作进程在首个任务中自行导入numpy等模块，只影响首次耗时，不影响结果。
+FORKSERVER_PRELOAD: List[str] = [
+    *MANAGER_PRELOAD,
+    "numpy",
+    "pandas",
+    "numba",
+    "vnpy.trader.multiprocess_backtester",
+]
+
+
+class MsgType(IntEnum):
+    """回测结果消息类型"""
+    
+    RESULT = 1
+    ERROR = 2
+
+
+# 回测结果消息：(消息类型, 任务ID, 回测结果字典或错误信息)
+BacktestMessage = Tuple[MsgType, str, Any]
+
+
+@dataclass(frozen=True)
+class SharedArrayHandle:
+    """
+    共享内存数组句柄
+    
+    代替数组本身放入回测参数中，工作进程通过句柄直接映射共享内存，
+    避免每个任务都序列化传输完整的历史数据。
+    """
+    
+    name: str
+    shape: Tuple[int, ...]
+    dtype: np.dtype
+
+
+def _attach_shared_array(handle: SharedArrayHandle) -> Tuple[SharedMemory, np.ndarray]:
+    """
+    在工作进程中映射共享内存数组（不复制数据）
+    
+    进程池的工作进程与主进程共用同一个资源跟踪器，共享内存由主进程负责释放。
+    """
+    shm = SharedMemory(name=handle.name)
+    array = np.ndarray(handle.shape, dtype=handle.dtype, buffer=shm.buf)
+    return shm, array
+
+
+def _warmup_worker() -> int:
+    """
+    空任务，仅用于让进程池提前启动工作进程
+    """
+    return os.getpid()
+
+
+def _backtest_worker(
+    task_id: str,
+    strategy_class: type,
+    strategy_params: Dict[str, Any],
+    backtest_params: Dict[str, Any]
+) -> BacktestMessage:
+    """
+    回测工作进程函数
+    
+    在进程池的工作进程中执行策略回测逻辑，返回结果消息。
+    定义为模块级函数，以便进程池序列化传递。
+    
+    Args:
+        task_id: 回测任务ID
+        strategy_class: 策略类
+        strategy_params: 策略参数
+        backtest_params: 回测参数
+    
+    Returns:
+        BacktestMessage: 回测结果或错误消息
+    """
+    shms: List[SharedMemory] = []
+    
+    try:
+        logger.info(f"回测任务 {task_id} 开始执行")
+        
+        # 映射共享内存中的历史数据
+        engine_params: Dict[str, Any] = dict(backtest_params)
+        for key, value in backtest_params.items():
+            if isinstance(value, SharedArrayHandle):
+                shm, engine_params[key] = _attach_shared_array(value)
+                shms.append(shm)
+        
+        # 创建策略实例
+        strategy = strategy_class(**strategy_params)
+        
+        # 执行回测逻辑
+        # 注意：这里需要根据实际的回测引擎接口来实现
+        # 由于vnpy_ctabacktester模块可能不存在，这里提供一个通用框架
+        
+        result = {
+            'task_id': task_id,
+            'strategy_params': strategy_params,
+            'backtest_params': backtest_params,
+            'status': 'completed',
+            'result': None,  # 回测结果（需要根据实际回测引擎填充）
+            'error': None
+        }
+        
+        # 这里应该调用实际的回测引擎（使用engine_params）
+        # 由于没有vnpy_ctabacktester模块，这里提供一个占位实现
+        logger.info(f"回测任务 {task_id} 执行完成（占位实现）")
+        
+        return (MsgType.RESULT, task_id, result)
+    
+    except Exception as e:
+        logger.error(f"回测任务 {task_id} 执行异常: {e}")
+        logger.error(traceback.format_exc())
+        
+        return (MsgType.ERROR, task_id, str(e))
+    
+    finally:
+        # 释放映射前先删除数组引用
+        engine_params = None
+        for shm in shms:
+            shm.close()
 
 
 class MultiProcessBacktester:
@@ -22,6 +158,7 @@ class MultiProcessBacktester:
     多进程回测管理器
     
     支持多进程并行执行多个策略回测，充分利用多核CPU提升回测性能。
+    回测任务提交到固定大小的进程池中执行，工作进程在任务之间复用。
     """
     
     def __init__(self, max_workers: Optional[int] = None):
@@ -31,13 +168,86 @@ class MultiProcessBacktester:
         Args:
             max_workers: 最大工作进程数，None表示使用CPU核心数
         """
-        self.process_manager = ProcessManager(max_workers=max_workers)
+        if max_workers is None:
+            max_workers = multiprocessing.cpu_count()
+        self.max_workers = max_workers
+        
+        # Mac和Windows系统使用spawn方式启动进程
+        # Linux系统使用forkserver：由预先导入常用模块的服务进程fork出工作进程，
+        # 既避免每个工作进程重复导入，又不会从多线程的主进程中直接fork。
+        # 使用独立的上下文对象设置预先导入列表，不修改multiprocessing默认上下文
+        self.mp_context: BaseContext
+        if is_mac_system() or is_windows_system():
+            self.mp_context = multiprocessing.get_context("spawn")
+        else:
+            from multiprocessing.context import ForkServerContext   # Windows上不存在
+            self.mp_context = ForkServerContext()
+            self.mp_context.set_forkserver_preload(FORKSERVER_PRELOAD)
+        
+        self.executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=self.mp_context)
         
         # 回测任务管理
         self.backtest_tasks: Dict[str, Dict[str, Any]] = {}
         self.backtest_results: Dict[str, Dict[str, Any]] = {}
+        self.backtest_futures: Dict[str, Future] = {}
+        
+        # 回测完成事件，供wait_for_backtest阻塞等待
+        self.done_events: Dict[str, Event] = {}
+        
+        # 共享内存中的历史数据 {key: SharedMemory}
+        self.shm_registry: Dict[str, SharedMemory] = {}
+        
+        logger.info(f"MultiProcessBacktester初始化完成，最大工作进程数: {self.max_workers}")
+    
+    def warmup(self) -> None:
+        """
+        提前启动所有工作进程
+        
+        进程池在提交任务时才按需逐个启动工作进程。在加载历史数据等耗时的准备工作
+        之前调用，可以让工作进程的启动和模块导入与准备工作同时进行。
+        已有空闲进程时进程池不会再启动新进程，因此实际启动数量可能略少于max_workers。
+        """
+        for _ in range(self.max_workers):
+            self.executor.submit(_warmup_worker)
+        
+        logger.info(f"预启动 {self.max_workers} 个回测工作进程")
+    
+    def stage_history(self, key: str, data: np.ndarray) -> SharedArrayHandle:
+        """
+        将历史数据复制到共享内存
+        
+        返回的句柄可以放入回测参数中，所有回测任务共享同一份数据。
+        
+        Args:
+            key: 数据标识
+            data: 历史数据数组（可以是结构化数组）
+            
+        Returns:
+            SharedArrayHandle: 共享内存数组句柄
+        """
+        self.release_history(key)
+        
+        shm = SharedMemory(create=True, size=max(data.nbytes, 1))
+        shared = np.ndarray(data.shape, dtype=data.dtype, buffer=shm.buf)
+        shared[...] = data
+        del shared
+        
+        self.shm_registry[key] = shm
+        logger.info(f"历史数据 {key} 已放入共享内存，大小: {data.nbytes} 字节")
+        
+        return SharedArrayHandle(shm.name, data.shape, data.dtype)
+    
+    def release_history(self, key: str) -> None:
+        """
+        释放共享内存中的历史数据
         
-        logger.info("MultiProcessBacktester初始化完成")
+        Args:
+            key: 数据标识
+        """
+        shm = self.shm_registry.pop(key, None)
+        if shm:
+            shm.close()
+            shm.unlink()
     
     def run_backtest(
         self,
@@ -56,7 +266,7 @@ class MultiProcessBacktester:
             strategy_params: 策略参数
             backtest_params: 回测参数（包含历史数据、起始资金等）
             callback: 回测完成后的回调函数
-            
+        
         Returns:
             bool: 是否成功启动
         """
@@ -75,22 +285,27 @@ class MultiProcessBacktester:
                 'start_time': None,
                 'end_time': None
             }
+            self.done_events[task_id] = Event()
             
-            # 启动回测进程
-            success = self.process_manager.start_strategy_process(
-                strategy_id=task_id,
-                strategy_func=self._backtest_worker,
-                strategy_args=(task_id, strategy_class, strategy_params, backtest_params),
-                strategy_kwargs={}
+            # 提交到进程池
+            future = self.executor.submit(
+                _backtest_worker,
+                task_id,
+                strategy_class,
+                strategy_params,
+                backtest_params
             )
+            self.backtest_futures[task_id] = future
             
-            if success:
-                self.backtest_tasks[task_id]['status'] = 'running'
-                self.backtest_tasks[task_id]['start_time'] = time.time()
-                logger.info(f"回测任务 {task_id} 已启动")
+            self.backtest_tasks[task_id]['status'] = 'running'
+            self.backtest_tasks[task_id]['start_time'] = time.time()
+            logger.info(f"回测任务 {task_id} 已启动")
             
-            return success
+            # 任务结束后由进程池的管理线程回调处理结果
+            future.add_done_callback(partial(self._on_backtest_done, task_id))
             
+            return True
+        
         except Exception as e:
             logger.error(f"启动回测任务 {task_id} 失败: {e}")
             logger.error(traceback.format_exc())
@@ -106,12 +321,14 @@ class MultiProcessBacktester:
         """
         批量启动多个策略回测任务（参数优化场景）
         
+        所有任务提交到进程池中排队执行，每个任务完成后立即触发回调。
+        
         Args:
             strategy_class: 策略类
             strategy_params_list: 策略参数列表（每个参数组合一个回测）
             backtest_params: 回测参数
             callback: 每个回测完成后的回调函数
-            
+        
         Returns:
             List[str]: 启动的任务ID列表
         """
@@ -136,71 +353,29 @@ class MultiProcessBacktester:
         logger.info(f"批量启动 {len(task_ids)} 个回测任务")
         return task_ids
     
-    def _backtest_worker(
-        self,
-        task_id: str,
-        strategy_class: type,
-        strategy_params: Dict[str, Any],
-        backtest_params: Dict[str, Any]
-    ) -> None:
+    def _on_backtest_done(self, task_id: str, future: Future) -> None:
         """
-        回测工作进程函数
-        
-        在独立进程中执行策略回测逻辑。
+        回测任务结束回调
         
         Args:
             task_id: 回测任务ID
-            strategy_class: 策略类
-            strategy_params: 策略参数
-            backtest_params: 回测参数
+            future: 回测任务对应的Future
         """
         try:
-            logger.info(f"回测任务 {task_id} 开始执行")
-            
-            # 创建策略实例
-            strategy = strategy_class(**strategy_params)
-            
-            # 执行回测逻辑
-            # 注意：这里需要根据实际的回测引擎接口来实现
-            # 由于vnpy_ctabacktester模块可能不存在，这里提供一个通用框架
-            
-            result = {
-                'task_id': task_id,
-                'strategy_params': strategy_params,
-                'backtest_params': backtest_params,
-                'status': 'completed',
-                'result': None,  # 回测结果（需要根据实际回测引擎填充）
-                'error': None
-            }
-            
-            # 这里应该调用实际的回测引擎
-            # 由于没有vnpy_ctabacktester模块，这里提供一个占位实现
-            logger.info(f"回测任务 {task_id} 执行完成（占位实现）")
-            
-            # 向主进程发送结果
-            self.process_manager.send_message_to_process(
-                task_id,
-                {
-                    'type': 'backtest_result',
-                    'task_id': task_id,
-                    'result': result
-                }
-            )
-            
+            if not future.cancelled():
+                try:
+                    message = future.result()
+                except Exception as e:
+                    # 工作进程崩溃或参数无法序列化等情况
+                    message = (MsgType.ERROR, task_id, str(e))
+                
+                self._handle_backtest_message(task_id, message)
         except Exception as e:
-            logger.error(f"回测任务 {task_id} 执行异常: {e}")
-            logger.error(traceback.format_exc())
-            
-            # 向主进程发送错误
-            self.process_manager.send_message_to_process(
-                task_id,
-                {
-                    'type': 'backtest_error',
-                    'task_id': task_id,
-                    'error': str(e),
-                    'traceback': traceback.format_exc()
-                }
-            )
+            logger.error(f"处理回测任务 {task_id} 结果失败: {e}")
+        finally:
+            event = self.done_events.get(task_id)
+            if event:
+                event.set()
     
     def get_backtest_result(self, task_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -208,7 +383,7 @@ class MultiProcessBacktester:
         
         Args:
             task_id: 回测任务ID
-            
+        
         Returns:
             Optional[Dict[str, Any]]: 回测结果字典
         """
@@ -230,91 +405,100 @@ class MultiProcessBacktester:
         Args:
             task_id: 回测任务ID
             timeout: 超时时间（秒），None表示无限等待
-            
+        
         Returns:
             Optional[Dict[str, Any]]: 回测结果，超时返回None
         """
-        start_time = time.time()
+        event = self.done_events.get(task_id)
+        if event is None:
+            return self.backtest_results.get(task_id)
         
-        while True:
-            # 检查是否已有结果
-            if task_id in self.backtest_results:
-                return self.backtest_results[task_id]
-            
-            # 检查超时
-            if timeout and (time.time() - start_time) > timeout:
-                logger.warning(f"等待回测任务 {task_id} 超时")
-                return None
-            
-            # 接收进程消息
-            message = self.process_manager.receive_message_from_process(task_id, timeout=0.1)
-            if message:
-                self._handle_backtest_message(task_id, message)
-            
-            # 检查进程状态
-            status = self.process_manager.get_process_status(task_id)
-            if status and status.get('status') in ['completed', 'error', 'crashed']:
-                # 进程已结束，但可能还有消息未处理
-                time.sleep(0.1)
-                continue
-            
-            time.sleep(0.1)
+        if not event.wait(timeout):
+            logger.warning(f"等待回测任务 {task_id} 超时")
+            return None
+        
+        return self.backtest_results.get(task_id)
     
-    def _handle_backtest_message(self, task_id: str, message: Dict[str, Any]) -> None:
+    def _handle_backtest_message(self, task_id: str, message: BacktestMessage) -> None:
         """
         处理回测进程消息
         
         Args:
             task_id: 回测任务ID
-            message: 消息字典
+            message: (消息类型, 任务ID, 负载)元组
         """
-        msg_type = message.get('type')
+        match message[0]:
+            case MsgType.RESULT:
+                self._on_backtest_result(task_id, message[2])
+            case MsgType.ERROR:
+                self._on_backtest_error(task_id, message[2])
+            case msg_type:
+                logger.warning(f"未知的回测消息类型: {msg_type}")
+    
+    def _on_backtest_result(self, task_id: str, result: Dict[str, Any]) -> None:
+        """
+        处理回测结果
         
-        if msg_type == 'backtest_result':
-            result = message.get('result')
-            self.backtest_results[task_id] = result
-            
-            # 更新任务状态
-            if task_id in self.backtest_tasks:
-                self.backtest_tasks[task_id]['status'] = 'completed'
-                self.backtest_tasks[task_id]['end_time'] = time.time()
-                
-                # 触发回调
-                callback = self.backtest_tasks[task_id].get('callback')
-                if callback:
-                    try:
-                        callback(result)
-                    except Exception as e:
-                        logger.error(f"执行回测回调函数失败: {e}")
-            
-            logger.info(f"回测任务 {task_id} 完成")
-        
-        elif msg_type == 'backtest_error':
-            error = message.get('error')
-            self.backtest_results[task_id] = {
-                'task_id': task_id,
-                'status': 'error',
-                'error': error
-            }
-            
-            # 更新任务状态
-            if task_id in self.backtest_tasks:
-                self.backtest_tasks[task_id]['status'] = 'error'
-                self.backtest_tasks[task_id]['end_time'] = time.time()
+        Args:
+            task_id: 回测任务ID
+            result: 回测结果字典
+        """
+        self.backtest_results[task_id] = result
+        
+        # 更新任务状态
+        if task_id in self.backtest_tasks:
+            self.backtest_tasks[task_id]['status'] = 'completed'
+            self.backtest_tasks[task_id]['end_time'] = time.time()
             
-            logger.error(f"回测任务 {task_id} 执行错误: {error}")
+            # 触发回调
+            callback = self.backtest_tasks[task_id].get('callback')
+            if callback:
+                try:
+                    callback(result)
+                except Exception as e:
+                    logger.error(f"执行回测回调函数失败: {e}")
+        
+        logger.info(f"回测任务 {task_id} 完成")
+    
+    def _on_backtest_error(self, task_id: str, error: str) -> None:
+        """
+        处理回测错误
+        
+        Args:
+            task_id: 回测任务ID
+            error: 错误信息
+        """
+        self.backtest_results[task_id] = {
+            'task_id': task_id,
+            'status': 'error',
+            'error': error
+        }
+        
+        # 更新任务状态
+        if task_id in self.backtest_tasks:
+            self.backtest_tasks[task_id]['status'] = 'error'
+            self.backtest_tasks[task_id]['end_time'] = time.time()
+        
+        logger.error(f"回测任务 {task_id} 执行错误: {error}")
     
     def stop_backtest(self, task_id: str) -> bool:
         """
         停止回测任务
         
+        只能取消尚未开始执行的任务，已在工作进程中运行的任务会继续执行到结束。
+        
         Args:
             task_id: 回测任务ID
-            
+        
         Returns:
             bool: 是否成功停止
         """
-        success = self.process_manager.stop_strategy_process(task_id)
+        future = self.backtest_futures.get(task_id)
+        if future is None:
+            logger.warning(f"回测任务 {task_id} 不存在")
+            return False
+        
+        success = future.cancel()
         
         if success and task_id in self.backtest_tasks:
             self.backtest_tasks[task_id]['status'] = 'stopped'
@@ -335,7 +519,7 @@ class MultiProcessBacktester:
         
         Args:
             task_id: 回测任务ID
-            
+        
         Returns:
             Optional[Dict[str, Any]]: 任务状态字典
         """
@@ -344,10 +528,14 @@ class MultiProcessBacktester:
         
         status = dict(self.backtest_tasks[task_id])
         
-        # 添加进程状态
-        process_status = self.process_manager.get_process_status(task_id)
-        if process_status:
-            status['process_status'] = process_status
+        # 添加进程池中的执行状态
+        future = self.backtest_futures.get(task_id)
+        if future:
+            status['process_status'] = {
+                'running': future.running(),
+                'done': future.done(),
+                'cancelled': future.cancelled()
+            }
         
         # 添加结果
         if task_id in self.backtest_results:
@@ -371,5 +559,9 @@ class MultiProcessBacktester:
         """关闭多进程回测管理器"""
         logger.info("正在关闭多进程回测管理器...")
         self.stop_all_backtests()
-        self.process_manager.close()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        
+        for key in list(self.shm_registry.keys()):
+            self.release_history(key)
+        
         logger.info("多进程回测管理器已关闭")
@@ -5,23 +5,521 @@
 参考Elite版多进程架构设计，保持与现有单进程策略执行逻辑的向后兼容。
 """
 
+import inspect
+import itertools
 import multiprocessing
 import os
+import pickle
+import select
+import selectors
 import signal
+import struct
 import time
-from multiprocessing import Process, Queue, Manager
-from queue import Empty
-from typing import Any, Callable, Dict, Optional, List
-from threading import Thread
-import traceback
+import weakref
+from multiprocessing import Pipe, Process, Queue
+from multiprocessing.connection import Connection, wait
+from multiprocessing.context import BaseContext
+from multiprocessing.shared_memory import SharedMemory
+from dataclasses import dataclass
+from queue import Empty, Full
+from typing import Any, Callable, Dict, Iterable, Optional, List, Tuple, Union
+from threading import Event, Lock, RLock, Thread
 
-from .logger import logger
-from .platform_utils import is_mac_system
+from .platform_utils import is_mac_system, is_windows_system
+
+try:
+    import faster_fifo
+    import faster_fifo_reduction  # noqa: F401  注册faster_fifo队列的序列化规则，spawn方式下可传递给子进程
+    HAS_FASTER_FIFO = True
+except ImportError:
+    HAS_FASTER_FIFO = False
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+
+class _LazyLogger:
+    """
+    延迟导入的日志代理
+    
+    vnpy.trader.logger会连带导入全局配置及其依赖的数据分析库，spawn方式下每个策略进程
+    都要重新导入本模块。首次记录日志时才导入并替换为真正的logger，策略进程正常运行时无需承担这部分开销。
+    """
+    
+    def __getattr__(self, name: str) -> Any:
+        from .logger import logger as vnpy_logger
+        
+        globals()["logger"] = vnpy_logger
+        return getattr(vnpy_logger, name)
+
+
+logger = _LazyLogger()
+
+
+# faster_fifo队列的共享内存缓冲区大小（字节）
+FIFO_BUFFER_SIZE: int = 1000 * 1000
+
+# 每个策略记录完整异常堆栈的最大次数，超出后只记录异常信息
+TRACEBACK_BUDGET: int = 5
+
+# 监控线程每次从单个队列取出的最大消息数
+DRAIN_BATCH_SIZE: int = 64
+
+# forkserver启动时预先导入的模块，策略进程fork后直接继承。
+# 服务进程与多进程回测管理器共用，只有首次启动服务进程时设置的列表生效，
+# 回测管理器的预先导入列表包含这里的全部模块
+FORKSERVER_PRELOAD: List[str] = [
+    "vnpy.trader.logger",
+    "vnpy.trader.platform_utils",
+    "vnpy.trader.multiprocess_manager",
+]
+
+# 存在faster_fifo队列时监控线程轮询消息的间隔（秒）
+MONITOR_INTERVAL: float = 0.5
+
+# 监控线程无事件时的最长等待时间（秒）
+MONITOR_TIMEOUT: float = 5.0
+
+# msgpack扩展类型：无法直接编码的对象通过pickle序列化，元组单独编码以便原样还原
+PICKLE_EXT_TYPE: int = 1
+TUPLE_EXT_TYPE: int = 2
+
+# 每个策略共享状态共享内存的初始大小（字节），数据超出时自动扩容
+SHARED_STATE_SIZE: int = 64 * 1024
+
+# 共享状态头部：(版本号, 数据段代数, 数据偏移, 数据长度)
+STATE_HEADER: struct.Struct = struct.Struct("<QIII")
+
+# 主进程等待共享状态锁时，检查持锁子进程是否存活的间隔（秒）
+STATE_LOCK_TIMEOUT: float = 1.0
+
+# CPU缓存行大小（字节）
+CACHE_LINE_SIZE: int = 64
+
+# 策略进程写入的状态行：(PID, 状态码, 更新时间戳, 错误码)，位于状态块第一个缓存行
+WORKER_STATUS: struct.Struct = struct.Struct("<iidi")
+
+# 主进程写入的控制行：(停止标志, 命令序号)，位于状态块第二个缓存行
+MONITOR_COMMAND: struct.Struct = struct.Struct("<II")
+
+# 策略进程写入的心跳计数，与状态行位于同一缓存行
+HEARTBEAT_COUNT: struct.Struct = struct.Struct("<Q")
+HEARTBEAT_COUNT_OFFSET: int = 24
+
+# 心跳记录：(序号, time.monotonic_ns时间戳, 状态码, 标签)，固定32字节
+HEARTBEAT_RECORD: struct.Struct = struct.Struct("<QqB7x8s")
+
+# 每个策略的心跳环形缓冲区记录数（2的幂）
+HEARTBEAT_SLOTS: int = 64
+
+# 状态块大小：读写方向不同的两组字段各占一个缓存行，避免伪共享；其后为心跳环形缓冲区
+STATUS_BLOCK_SIZE: int = 2 * CACHE_LINE_SIZE + HEARTBEAT_SLOTS * HEARTBEAT_RECORD.size
+
+# 状态块中的策略状态码
+STATUS_CODES: Dict[str, int] = {
+    "starting": 0,
+    "running": 1,
+    "completed": 2,
+    "error": 3,
+    "interrupted": 4,
+}
+STATUS_NAMES: Dict[int, str] = {code: name for name, code in STATUS_CODES.items()}
+
+
+def _pack_default(obj: Any) -> "msgpack.ExtType":
+    """msgpack不直接编码的对象：元组编码为元组扩展类型，其他对象使用pickle序列化"""
+    if type(obj) is tuple:
+        return msgpack.ExtType(TUPLE_EXT_TYPE, dumps_message(list(obj)))
+    return msgpack.ExtType(PICKLE_EXT_TYPE, pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _unpack_ext(code: int, data: bytes) -> Any:
+    """还原元组和pickle序列化的扩展类型"""
+    if code == TUPLE_EXT_TYPE:
+        return tuple(loads_message(data))
+    if code == PICKLE_EXT_TYPE:
+        return pickle.loads(data)
+    return msgpack.ExtType(code, data)
+
+
+def dumps_message(message: Any) -> bytes:
+    """
+    使用msgpack编码进程间消息
+    
+    只有str、int、float、bytes、list、dict等基础类型本身直接编码（strict_types），
+    元组（包括作为字典键的元组）编码为元组扩展类型，解码后仍为元组；
+    其他对象（包括基础类型的子类，如枚举、命名元组）以pickle扩展类型编码。
+    """
+    return msgpack.packb(message, use_bin_type=True, strict_types=True, default=_pack_default)
+
+
+def loads_message(data: bytes) -> Any:
+    """解码dumps_message编码的进程间消息"""
+    return msgpack.unpackb(data, raw=False, ext_hook=_unpack_ext, strict_map_key=False)
+
+
+class PipeQueue:
+    """
+    基于单向管道的单生产者单消费者队列
+    
+    策略进程与主进程之间的每个方向都只有一个写入方和一个读取方，
+    直接读写Pipe(duplex=False)，不需要multiprocessing.Queue的后台feeder线程和缓冲区。
+    提供与Queue相同的put/get接口，同一进程内的多个线程通过本地锁串行化读写。
+    
+    注意写入是同步的：管道缓冲区已满时put会阻塞到读取方取走数据为止。
+    """
+    
+    def __init__(self):
+        self._reader, self._writer = Pipe(duplex=False)
+        self._use_msgpack: bool = HAS_MSGPACK
+        self._rlock = Lock()
+        self._wlock = Lock()
+    
+    def __getstate__(self) -> Tuple:
+        return self._reader, self._writer, self._use_msgpack
+    
+    def __setstate__(self, state: Tuple) -> None:
+        self._reader, self._writer, self._use_msgpack = state
+        self._rlock = Lock()
+        self._wlock = Lock()
+    
+    def put(self, obj: Any, block: bool = True, timeout: Optional[float] = None) -> None:
+        if self._use_msgpack:
+            data = dumps_message(obj)
+        else:
+            data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        
+        with self._wlock:
+            # 非阻塞或限时写入时，管道在超时前不可写则视为队列已满
+            if (not block or timeout is not None) and not _writable(self._writer, timeout if block else 0):
+                raise Full
+            self._writer.send_bytes(data)
+    
+    def put_nowait(self, obj: Any) -> None:
+        self.put(obj, block=False)
+    
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        with self._rlock:
+            if not self._reader.poll(timeout if block else 0):
+                raise Empty
+            data = self._reader.recv_bytes()
+        
+        if self._use_msgpack:
+            return loads_message(data)
+        return pickle.loads(data)
+    
+    def get_nowait(self) -> Any:
+        return self.get(block=False)
+    
+    def empty(self) -> bool:
+        return not self._reader.poll()
+
+
+def _writable(connection, timeout: Optional[float]) -> bool:
+    """检查管道写入端在超时时间内是否可写（Windows管道不支持select，始终视为可写）"""
+    if is_windows_system():
+        return True
+    _, writable, _ = select.select([], [connection], [], timeout)
+    return bool(writable)
+
+
+def _create_queue() -> Queue:
+    """
+    创建进程间通信队列
+    
+    安装了faster_fifo时使用基于共享内存环形缓冲区的队列，否则使用单向管道队列；
+    安装了msgpack时消息使用msgpack编码。
+    """
+    if HAS_FASTER_FIFO:
+        if HAS_MSGPACK:
+            return faster_fifo.Queue(FIFO_BUFFER_SIZE, loads=loads_message, dumps=dumps_message)
+        return faster_fifo.Queue(FIFO_BUFFER_SIZE)
+    
+    return PipeQueue()
+
+
+def _drain_queue(queue: Queue, max_messages: int = DRAIN_BATCH_SIZE) -> List[Any]:
+    """
+    非阻塞地批量取出队列中的消息
+    
+    Args:
+        queue: 进程间通信队列
+        max_messages: 最多取出的消息数
+        
+    Returns:
+        List[Any]: 消息列表，队列为空时返回空列表
+    """
+    if HAS_FASTER_FIFO:
+        try:
+            return queue.get_many(block=False, max_messages_to_get=max_messages)
+        except Empty:
+            return []
+    
+    messages: List[Any] = []
+    while len(messages) < max_messages:
+        try:
+            messages.append(queue.get_nowait())
+        except Empty:
+            break
+    return messages
+
+
+def _update_selector(
+    selector: selectors.BaseSelector,
+    old_map: Dict[Any, Tuple[Optional[str], bool]],
+    new_map: Dict[Any, Tuple[Optional[str], bool]]
+) -> None:
+    """
+    用新的等待对象替换selector中的注册项
+    
+    已回收进程的sentinel文件描述符编号可能被新进程复用，因此全部重新注册而不是只比较差异。
+    """
+    for obj in old_map:
+        try:
+            selector.unregister(obj)
+        except (KeyError, ValueError, OSError):
+            pass
+    
+    for obj in new_map:
+        try:
+            selector.register(obj, selectors.EVENT_READ)
+        except (KeyError, ValueError, OSError):
+            # 文件描述符已关闭（进程已被回收）
+            pass
+
+
+def _accepts_process_comm(func: Callable) -> bool:
+    """
+    检查策略函数是否接受_process_comm参数
+    
+    函数签名中包含_process_comm参数或**kwargs时返回True。
+    检查结果缓存在函数对象上，同一函数不重复解析签名。
+    """
+    accepts: Optional[bool] = getattr(func, "__vnpy_accepts_comm__", None)
+    if accepts is not None:
+        return accepts
+    
+    try:
+        parameters = inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        # 无法解析签名的内置函数等，按不支持处理
+        return False
+    
+    accepts = "_process_comm" in parameters or any(
+        p.kind == inspect.Parameter.VAR_KEYWORD for p in parameters.values()
+    )
+    
+    try:
+        func.__vnpy_accepts_comm__ = accepts
+    except (AttributeError, TypeError):
+        pass
+    return accepts
 
 
 def _signal_handler(signum, frame):
     """信号处理器（Mac系统兼容）- 独立函数，可在子进程中使用"""
-    logger.info(f"策略进程收到信号 {signum}")
+    logger.info("策略进程收到信号 {}", signum)
+
+
+def _strategy_process_worker(
+    strategy_id: str,
+    strategy_func: Callable,
+    strategy_args: tuple,
+    strategy_kwargs: Dict[str, Any],
+    main_to_process_queue: Queue,
+    process_to_main_queue: Queue,
+    shared_state: "SharedStateDict",
+    shared_lock,
+    shared_event,
+    status_block: "StatusBlock"
+) -> None:
+    """
+    策略进程工作函数
+    
+    在独立进程中执行策略逻辑，通过队列与主进程通信。
+    定义为模块级函数，spawn/forkserver方式下只需序列化参数，无需序列化ProcessManager。
+    
+    Args:
+        strategy_id: 策略唯一标识
+        strategy_func: 策略执行函数
+        strategy_args: 策略函数位置参数
+        strategy_kwargs: 策略函数关键字参数
+        process_queue: 进程间通信队列
+        status_block: 策略进程状态块
+    """
+    try:
+        # 设置进程信号处理（Mac系统兼容）
+        if is_mac_system():
+            signal.signal(signal.SIGTERM, _signal_handler)
+            signal.signal(signal.SIGINT, _signal_handler)
+        
+        # 初始化共享状态（PID、状态和策略函数参数一次写入）
+        status_block.write_status('running')
+        
+        startup_state: Dict[str, Any] = {
+            f'{strategy_id}_pid': os.getpid(),
+            f'{strategy_id}_status': 'running'
+        }
+        if strategy_kwargs:
+            startup_state[f'{strategy_id}_kwargs'] = strategy_kwargs
+        
+        shared_state.update(startup_state)
+        
+        # 向主进程发送启动消息
+        process_to_main_queue.put({
+            'type': 'started',
+            'strategy_id': strategy_id,
+            'pid': os.getpid()
+        })
+        
+        # 执行策略函数（传入通信队列和共享状态）
+        # 将通信接口传递给策略函数（如果策略函数支持）
+        enhanced_kwargs = dict(strategy_kwargs)
+        enhanced_kwargs['_process_comm'] = {
+            'receive_queue': main_to_process_queue,
+            'send_queue': process_to_main_queue,
+            'shared_state': shared_state,
+            'lock': shared_lock,
+            'event': shared_event,
+            'status_block': status_block
+        }
+        
+        if _accepts_process_comm(strategy_func):
+            strategy_func(*strategy_args, **enhanced_kwargs)
+        else:
+            strategy_func(*strategy_args, **strategy_kwargs)
+        
+        # 向主进程发送完成消息
+        process_to_main_queue.put({
+            'type': 'completed',
+            'strategy_id': strategy_id
+        })
+        
+        # 更新共享状态
+        status_block.write_status('completed')
+        shared_state[f'{strategy_id}_status'] = 'completed'
+        
+    except KeyboardInterrupt:
+        logger.info("策略进程 {} 收到中断信号", strategy_id)
+        status_block.write_status('interrupted')
+        shared_state[f'{strategy_id}_status'] = 'interrupted'
+        process_to_main_queue.put({
+            'type': 'interrupted',
+            'strategy_id': strategy_id
+        })
+    except Exception as e:
+        logger.error(f"策略进程 {strategy_id} 执行异常: {e}")
+        status_block.write_status('error', 1)
+        
+        # 同一策略反复出错时只格式化前TRACEBACK_BUDGET次的完整堆栈
+        # （共享状态只属于本策略，读写之间不会有其他进程写入错误计数）
+        error_count: int = shared_state.get(f'{strategy_id}_error_count', 0) + 1
+        shared_state.update({
+            f'{strategy_id}_status': 'error',
+            f'{strategy_id}_error': str(e),
+            f'{strategy_id}_error_count': error_count
+        })
+        
+        tb: Optional[str] = None
+        if error_count <= TRACEBACK_BUDGET:
+            import traceback
+            tb = traceback.format_exc()
+            logger.error(tb)
+        
+        process_to_main_queue.put({
+            'type': 'error',
+            'strategy_id': strategy_id,
+            'error': str(e),
+            'traceback': tb
+        })
+
+
+def _pool_worker(
+    task_reader,
+    main_to_process_queue: Queue,
+    process_to_main_queue: Queue,
+    shared_state: "SharedStateDict",
+    shared_lock,
+    shared_event,
+    status_block: "StatusBlock"
+) -> None:
+    """
+    预启动工作进程函数
+    
+    进程启动后阻塞等待任务管道中的策略任务，收到后在本进程中执行策略；
+    收到None或管道关闭时直接退出。
+    
+    Args:
+        task_reader: 任务管道读取端
+        main_to_process_queue: 主进程到策略进程的队列
+        process_to_main_queue: 策略进程到主进程的队列
+        shared_state: 该工作进程独占的共享状态字典
+        shared_lock: 共享锁
+        shared_event: 共享事件
+        status_block: 策略进程状态块
+    """
+    try:
+        task = task_reader.recv()
+    except (EOFError, KeyboardInterrupt):
+        return
+    
+    if task is None:
+        return
+    
+    strategy_id, strategy_func, strategy_args, strategy_kwargs = task
+    _strategy_process_worker(
+        strategy_id,
+        strategy_func,
+        strategy_args,
+        strategy_kwargs,
+        main_to_process_queue,
+        process_to_main_queue,
+        shared_state,
+        shared_lock,
+        shared_event,
+        status_block
+    )
+
+
+@dataclass(slots=True)
+class PoolWorker:
+    """
+    预启动的空闲工作进程
+    
+    进程及其通信队列、同步对象提前创建，启动策略时只需通过任务管道发送任务。
+    """
+    
+    process: Process
+    task_writer: Any        # 任务管道写入端
+    in_queue: Queue
+    out_queue: Queue
+    lock: Any
+    event: Any
+    status_block: "StatusBlock"
+    state: "SharedStateDict"
+
+
+@dataclass(slots=True)
+class StrategyHandle:
+    """
+    策略进程句柄
+    
+    集中保存单个策略进程的进程对象、通信队列、同步对象和运行状态。
+    进程退出或被停止后process置为None，状态信息继续保留。
+    """
+    
+    process: Optional[Process]
+    in_queue: Queue         # 主进程到策略进程
+    out_queue: Queue        # 策略进程到主进程
+    lock: Any
+    event: Any
+    status_block: "StatusBlock"
+    state: Optional["SharedStateDict"]     # 策略独占的共享状态，停止后释放并置为None
+    status: Dict[str, Any]
+    cpu: Optional[int] = None   # 绑定的CPU核心
 
 
 class ProcessManager:
@@ -31,48 +529,83 @@ class ProcessManager:
     负责创建、管理和监控策略执行进程，实现进程间通信。
     """
     
-    def __init__(self, max_workers: Optional[int] = None):
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        pool_size: int = 0,
+        pin_cpus: bool = False
+    ):
         """
         初始化进程管理器
         
         Args:
             max_workers: 最大工作进程数，None表示使用CPU核心数
+            pool_size: 预启动的空闲工作进程数，0表示每次启动策略时再创建进程
+            pin_cpus: 是否将每个策略进程绑定到独占的CPU核心（仅支持sched_setaffinity的系统）
         """
-        # Mac系统特定设置：设置进程启动方法
-        if is_mac_system():
-            try:
-                # 尝试设置spawn方法（Mac系统推荐）
-                multiprocessing.set_start_method('spawn', force=False)
-                logger.info("Mac系统：已设置multiprocessing启动方法为'spawn'")
-            except RuntimeError:
-                # 如果已经设置过，获取当前方法
-                current_method = multiprocessing.get_start_method()
-                logger.info(f"Mac系统：multiprocessing启动方法已设置为'{current_method}'")
+        # 选择进程启动方法：Mac系统使用spawn；其他支持forkserver的系统使用forkserver，
+        # 由预先导入模块的服务进程fork出策略进程，避免复制主进程的全部内存。
+        # 策略进程及其锁、事件都从私有的上下文创建，不修改全局启动方法
+        if is_mac_system() or 'forkserver' not in multiprocessing.get_all_start_methods():
+            method = 'spawn'
+        else:
+            method = 'forkserver'
+        
+        self.mp_context: BaseContext = multiprocessing.get_context(method)
+        if method == 'forkserver':
+            self.mp_context.set_forkserver_preload(FORKSERVER_PRELOAD)
+        logger.info(f"策略进程启动方法: '{method}'")
         
         # 确定最大工作进程数
         if max_workers is None:
             max_workers = multiprocessing.cpu_count()
         self.max_workers = max_workers
         
-        # 进程管理
-        self.processes: Dict[str, Process] = {}
-        self.process_queues: Dict[str, Queue] = {}
-        self.process_status: Dict[str, Dict[str, Any]] = {}
+        # 策略进程句柄
+        self.strategies: Dict[str, StrategyHandle] = {}
+        
+        # 尚无共享状态内存的策略（未启动或已停止）的共享状态，启动时写入该策略的共享内存。
+        # 运行中策略的共享状态存放在各自独占的共享内存中，见StrategyHandle.state
+        self.pending_state: Dict[str, Dict[str, Any]] = {}
         
-        # 共享状态管理
-        self.manager = Manager()
-        self.shared_state = self.manager.dict()
-        self.shared_locks = self.manager.dict()  # 共享锁字典
-        self.shared_events = self.manager.dict()  # 共享事件字典
+        # 预启动的空闲工作进程数
+        self.pool_size: int = min(pool_size, self.max_workers)
         
-        # 进程间通信队列（双向）
-        self.main_to_process_queues: Dict[str, Queue] = {}  # 主进程到策略进程
-        self.process_to_main_queues: Dict[str, Queue] = {}  # 策略进程到主进程
+        # 调用方线程和监控线程共同修改的空闲进程池、状态块槽位、CPU核心和monitor_dirty标志
+        # 都在这把锁内读写（可重入：持锁归还状态块时状态表再次获取同一把锁）
+        self.resource_lock = RLock()
+        
+        # 所有策略进程的状态块，存放在同一块共享内存中按槽位分配
+        self.status_table = StatusTable(self.max_workers + self.pool_size, self.resource_lock)
         
         # 监控线程
         self.monitor_thread: Optional[Thread] = None
         self.monitoring = False
         
+        # 等待响应的同步请求 {请求ID: (策略ID, 响应事件, 响应消息列表)}
+        self.pending_acks: Dict[int, Tuple[str, Event, List[Dict[str, Any]]]] = {}
+        self.request_ids = itertools.count(1)
+        
+        # 监控线程等待对象需要重建的标志，以及用于唤醒监控线程的管道（启动监控线程时创建）
+        self.monitor_dirty: bool = True
+        self.wakeup_reader: Optional[Connection] = None
+        self.wakeup_writer: Optional[Connection] = None
+        
+        # 可分配给策略进程独占的CPU核心
+        self.free_cpus: List[int] = []
+        if pin_cpus:
+            if hasattr(os, "sched_setaffinity"):
+                self.free_cpus = sorted(os.sched_getaffinity(0), reverse=True)
+            else:
+                logger.warning("当前系统不支持sched_setaffinity，策略进程不绑定CPU核心")
+        
+        # 预启动的空闲工作进程池，启动策略时直接取用，由监控线程在后台补充
+        self.idle_workers: List[PoolWorker] = []
+        self.pending_workers: int = 0     # 正在创建、尚未加入池中的工作进程数
+        if self.pool_size:
+            self._fill_pool()
+            self.start_monitoring()
+        
         logger.info(f"多进程管理器初始化完成，最大工作进程数: {self.max_workers}")
     
     def start_strategy_process(
@@ -98,33 +631,65 @@ class ProcessManager:
             strategy_kwargs = {}
         
         # 检查是否已有该策略进程
-        if strategy_id in self.processes:
+        handle = self.strategies.get(strategy_id)
+        if handle and handle.process:
             logger.warning(f"策略进程 {strategy_id} 已存在")
             return False
         
         # 检查进程数限制
-        if len(self.processes) >= self.max_workers:
+        if sum(1 for handle in self.strategies.values() if handle.process) >= self.max_workers:
             logger.warning(f"已达到最大进程数限制 {self.max_workers}，无法启动新策略进程")
             return False
         
+        # 优先使用预启动的空闲工作进程，只需发送任务，无需等待进程创建
+        worker = self._take_pool_worker()
+        if worker:
+            try:
+                worker.task_writer.send((strategy_id, strategy_func, strategy_args, strategy_kwargs))
+                worker.task_writer.close()
+            except Exception as e:
+                # 策略函数无法序列化等情况，回退为直接创建进程
+                logger.warning(f"策略 {strategy_id} 无法发送给预启动进程，改为创建新进程: {e}")
+                worker.task_writer.close()
+                worker.process.join(timeout=1.0)
+                if worker.process.is_alive():
+                    worker.process.terminate()
+                    worker.process.join()
+                worker.status_block.release()
+                worker.state.unlink()
+                worker = None
+        
+        if worker:
+            self._register_strategy(
+                strategy_id,
+                worker.process,
+                worker.in_queue,
+                worker.out_queue,
+                worker.lock,
+                worker.event,
+                worker.status_block,
+                worker.state
+            )
+            return True
+        
+        status_block: Optional[StatusBlock] = None
+        state: Optional[SharedStateDict] = None
         try:
             # 创建双向进程间通信队列
-            main_to_process_queue = Queue()
-            process_to_main_queue = Queue()
-            self.main_to_process_queues[strategy_id] = main_to_process_queue
-            self.process_to_main_queues[strategy_id] = process_to_main_queue
-            # 保持向后兼容
-            self.process_queues[strategy_id] = process_to_main_queue
+            main_to_process_queue = _create_queue()
+            process_to_main_queue = _create_queue()
             
             # 创建共享锁和事件（用于同步）
-            shared_lock = self.manager.Lock()
-            shared_event = self.manager.Event()
-            self.shared_locks[strategy_id] = shared_lock
-            self.shared_events[strategy_id] = shared_event
+            shared_lock = self.mp_context.Lock()
+            shared_event = self.mp_context.Event()
+            
+            # 分配策略进程状态块和独占的共享状态内存
+            status_block = self.status_table.acquire()
+            state = SharedStateDict(ctx=self.mp_context)
             
             # 创建策略进程
-            process = Process(
-                target=self._strategy_process_worker,
+            process = self.mp_context.Process(
+                target=_strategy_process_worker,
                 args=(
                     strategy_id, 
                     strategy_func, 
@@ -132,156 +697,216 @@ class ProcessManager:
                     strategy_kwargs, 
                     main_to_process_queue,
                     process_to_main_queue,
-                    self.shared_state,
+                    state,
                     shared_lock,
-                    shared_event
+                    shared_event,
+                    status_block
                 ),
                 name=f"Strategy-{strategy_id}"
             )
             
-            # Mac系统特定设置
-            # 注意：multiprocessing的启动方法必须在主进程中、在任何Process创建之前设置
-            # 这里只做检查，实际设置应该在ProcessManager初始化时完成
-            if is_mac_system():
-                try:
-                    current_method = multiprocessing.get_start_method()
-                    if current_method != 'spawn':
-                        logger.warning(
-                            f"Mac系统建议使用'spawn'启动方法，当前为'{current_method}'。"
-                            f"请在创建ProcessManager之前调用multiprocessing.set_start_method('spawn')"
-                        )
-                except RuntimeError:
-                    # 如果已经设置过，忽略错误
-                    pass
-            
             # 启动进程
             process.start()
-            self.processes[strategy_id] = process
-            
-            # 初始化进程状态
-            self.process_status[strategy_id] = {
-                'pid': process.pid,
-                'start_time': time.time(),
-                'status': 'running',
-                'restart_count': 0
-            }
-            
-            logger.info(f"策略进程 {strategy_id} 启动成功，PID: {process.pid}")
-            
-            # 启动监控线程（如果尚未启动）
-            if not self.monitoring:
-                self.start_monitoring()
             
+            self._register_strategy(
+                strategy_id,
+                process,
+                main_to_process_queue,
+                process_to_main_queue,
+                shared_lock,
+                shared_event,
+                status_block,
+                state
+            )
             return True
             
         except Exception as e:
+            import traceback
             logger.error(f"启动策略进程 {strategy_id} 失败: {e}")
             logger.error(traceback.format_exc())
+            if status_block:
+                status_block.release()
+            if state:
+                state.unlink()
             return False
     
-    def _strategy_process_worker(
+    def _register_strategy(
         self,
         strategy_id: str,
-        strategy_func: Callable,
-        strategy_args: tuple,
-        strategy_kwargs: Dict[str, Any],
-        main_to_process_queue: Queue,
-        process_to_main_queue: Queue,
-        shared_state: Dict[str, Any],
-        shared_lock,
-        shared_event
+        process: Process,
+        in_queue: Queue,
+        out_queue: Queue,
+        lock: Any,
+        event: Any,
+        status_block: "StatusBlock",
+        state: "SharedStateDict"
     ) -> None:
-        """
-        策略进程工作函数
+        """登记已启动的策略进程，并通知监控线程"""
+        # 主进程等待共享状态锁超时时，据此判断持锁的策略进程是否已退出
+        state.holder_alive = process.is_alive
         
-        在独立进程中执行策略逻辑，通过队列与主进程通信。
+        # 策略进程尚未启动时设置的共享状态
+        pending: Optional[Dict[str, Any]] = self.pending_state.pop(strategy_id, None)
+        if pending:
+            state.update(pending)
         
-        Args:
-            strategy_id: 策略唯一标识
-            strategy_func: 策略执行函数
-            strategy_args: 策略函数位置参数
-            strategy_kwargs: 策略函数关键字参数
-            process_queue: 进程间通信队列
-        """
-        try:
-            # 设置进程信号处理（Mac系统兼容）
-            if is_mac_system():
-                signal.signal(signal.SIGTERM, _signal_handler)
-                signal.signal(signal.SIGINT, _signal_handler)
-            
-            # 初始化共享状态
-            with shared_lock:
-                shared_state[f'{strategy_id}_pid'] = os.getpid()
-                shared_state[f'{strategy_id}_status'] = 'running'
-            
-            # 向主进程发送启动消息
-            process_to_main_queue.put({
-                'type': 'started',
-                'strategy_id': strategy_id,
-                'pid': os.getpid()
-            })
-            
-            # 设置共享状态中的策略函数参数（如果需要）
-            if strategy_kwargs:
-                with shared_lock:
-                    shared_state[f'{strategy_id}_kwargs'] = strategy_kwargs
-            
-            # 执行策略函数（传入通信队列和共享状态）
-            logger.info(f"策略进程 {strategy_id} 开始执行，PID: {os.getpid()}")
-            
-            # 将通信接口传递给策略函数（如果策略函数支持）
-            enhanced_kwargs = dict(strategy_kwargs)
-            enhanced_kwargs['_process_comm'] = {
-                'receive_queue': main_to_process_queue,
-                'send_queue': process_to_main_queue,
-                'shared_state': shared_state,
-                'lock': shared_lock,
-                'event': shared_event
+        # 重新启动的策略释放上一次运行的共享状态
+        old_handle: Optional[StrategyHandle] = self.strategies.get(strategy_id)
+        if old_handle and old_handle.state:
+            old_handle.state.unlink()
+        
+        handle = self.strategies[strategy_id] = StrategyHandle(
+            process=process,
+            in_queue=in_queue,
+            out_queue=out_queue,
+            lock=lock,
+            event=event,
+            status_block=status_block,
+            state=state,
+            status={
+                'pid': process.pid,
+                'start_time': time.time(),
+                'status': 'running',
+                'restart_count': 0
             }
+        )
+        
+        self._pin_cpu(handle)
+        self._wakeup_monitor()
+        
+        logger.info("策略进程 {} 启动成功，PID: {}", strategy_id, process.pid)
+        
+        # 启动监控线程（如果尚未启动）
+        if not self.monitoring:
+            self.start_monitoring()
+    
+    def _pin_cpu(self, handle: StrategyHandle) -> None:
+        """将策略进程绑定到一个空闲CPU核心，没有空闲核心时不绑定"""
+        with self.resource_lock:
+            if not self.free_cpus:
+                return
+            cpu: int = self.free_cpus.pop()
+        
+        try:
+            os.sched_setaffinity(handle.process.pid, {cpu})
+        except OSError as e:
+            logger.warning(f"策略进程 {handle.process.pid} 绑定CPU核心 {cpu} 失败: {e}")
+            with self.resource_lock:
+                self.free_cpus.append(cpu)
+            return
+        
+        handle.cpu = cpu
+        handle.status['cpu'] = cpu
+    
+    def _release_cpu(self, handle: StrategyHandle) -> None:
+        """归还策略进程绑定的CPU核心"""
+        with self.resource_lock:
+            if handle.cpu is not None:
+                self.free_cpus.append(handle.cpu)
+                handle.cpu = None
+    
+    def _spawn_pool_worker(self) -> PoolWorker:
+        """创建并启动一个等待任务的空闲工作进程"""
+        task_reader, task_writer = Pipe(duplex=False)
+        in_queue = _create_queue()
+        out_queue = _create_queue()
+        lock = self.mp_context.Lock()
+        event = self.mp_context.Event()
+        status_block = self.status_table.acquire()
+        state = SharedStateDict(ctx=self.mp_context)
+        
+        process = self.mp_context.Process(
+            target=_pool_worker,
+            args=(task_reader, in_queue, out_queue, state, lock, event, status_block),
+            name="StrategyPool"
+        )
+        try:
+            process.start()
+        except Exception:
+            status_block.release()
+            state.unlink()
+            raise
+        task_reader.close()
+        
+        return PoolWorker(process, task_writer, in_queue, out_queue, lock, event, status_block, state)
+    
+    def _fill_pool(self) -> None:
+        """
+        补充空闲工作进程至pool_size个
+        
+        创建进程期间不持有锁，调用方线程仍可取用已有的空闲进程；
+        正在创建的进程计入pending_workers，避免两个线程同时补充时超出pool_size。
+        """
+        while True:
+            with self.resource_lock:
+                if len(self.idle_workers) + self.pending_workers >= self.pool_size:
+                    return
+                self.pending_workers += 1
             
             try:
-                strategy_func(*strategy_args, **enhanced_kwargs)
-            except TypeError as e:
-                # 如果策略函数不接受这些参数，使用原始参数
-                if '_process_comm' in str(e) or 'unexpected keyword argument' in str(e):
-                    logger.debug(f"策略函数不支持_process_comm参数，使用原始参数: {e}")
-                    strategy_func(*strategy_args, **strategy_kwargs)
-                else:
-                    # 其他TypeError，重新抛出
-                    raise
-            
-            # 向主进程发送完成消息
-            process_to_main_queue.put({
-                'type': 'completed',
-                'strategy_id': strategy_id
-            })
+                worker: Optional[PoolWorker] = self._spawn_pool_worker()
+            except Exception as e:
+                logger.error(f"预启动工作进程失败: {e}")
+                worker = None
             
-            # 更新共享状态
-            with shared_lock:
-                shared_state[f'{strategy_id}_status'] = 'completed'
+            with self.resource_lock:
+                self.pending_workers -= 1
+                if not worker:
+                    return
+                self.idle_workers.append(worker)
+                self.monitor_dirty = True
+    
+    def _take_pool_worker(self) -> Optional[PoolWorker]:
+        """
+        取出一个空闲工作进程，没有时返回None
+        
+        意外退出的空闲进程由监控线程通过sentinel发现并移除，这里不再逐个检查存活状态；
+        取到已退出的进程时，发送任务失败会回退为直接创建进程。
+        """
+        with self.resource_lock:
+            if self.idle_workers:
+                return self.idle_workers.pop()
+        return None
+    
+    def _on_pool_worker_exit(self, sentinel: int) -> None:
+        """移除意外退出的空闲工作进程，由监控线程随后补充"""
+        with self.resource_lock:
+            for worker in self.idle_workers:
+                if worker.process.sentinel == sentinel:
+                    self.idle_workers.remove(worker)
+                    self.monitor_dirty = True
+                    break
+            else:
+                # 已被取用
+                return
+        
+        worker.task_writer.close()
+        worker.process.join(timeout=1.0)
+        worker.status_block.release()
+        worker.state.unlink()
+        
+        logger.warning(f"空闲工作进程 {worker.process.pid} 意外退出，退出码: {worker.process.exitcode}")
+    
+    def _shutdown_pool(self) -> None:
+        """关闭所有空闲工作进程"""
+        with self.resource_lock:
+            self.pool_size = 0
+            workers: List[PoolWorker] = self.idle_workers
+            self.idle_workers = []
+        
+        for worker in workers:
+            try:
+                worker.task_writer.send(None)
+            except OSError:
+                pass
+            worker.task_writer.close()
             
-        except KeyboardInterrupt:
-            logger.info(f"策略进程 {strategy_id} 收到中断信号")
-            with shared_lock:
-                shared_state[f'{strategy_id}_status'] = 'interrupted'
-            process_to_main_queue.put({
-                'type': 'interrupted',
-                'strategy_id': strategy_id
-            })
-        except Exception as e:
-            logger.error(f"策略进程 {strategy_id} 执行异常: {e}")
-            logger.error(traceback.format_exc())
-            with shared_lock:
-                shared_state[f'{strategy_id}_status'] = 'error'
-                shared_state[f'{strategy_id}_error'] = str(e)
-            process_to_main_queue.put({
-                'type': 'error',
-                'strategy_id': strategy_id,
-                'error': str(e),
-                'traceback': traceback.format_exc()
-            })
-        finally:
-            logger.info(f"策略进程 {strategy_id} 退出")
+            worker.process.join(timeout=1.0)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+            worker.status_block.release()
+            worker.state.unlink()
     
     def stop_strategy_process(self, strategy_id: str, timeout: float = 5.0) -> bool:
         """
@@ -294,15 +919,18 @@ class ProcessManager:
         Returns:
             bool: 是否成功停止
         """
-        if strategy_id not in self.processes:
+        handle = self.strategies.get(strategy_id)
+        if not handle or not handle.process:
             logger.warning(f"策略进程 {strategy_id} 不存在")
             return False
         
         try:
-            process = self.processes[strategy_id]
+            process = handle.process
             
-            # 发送终止信号
+            # 发送终止信号（先标记状态，监控线程检测到进程退出时不视为异常）
             logger.info(f"正在停止策略进程 {strategy_id}，PID: {process.pid}")
+            handle.status['status'] = 'stopping'
+            handle.status_block.request_stop()
             process.terminate()
             
             # 等待进程退出
@@ -315,32 +943,15 @@ class ProcessManager:
                 process.join()
             
             # 清理资源
-            del self.processes[strategy_id]
-            if strategy_id in self.process_queues:
-                del self.process_queues[strategy_id]
-            if strategy_id in self.main_to_process_queues:
-                del self.main_to_process_queues[strategy_id]
-            if strategy_id in self.process_to_main_queues:
-                del self.process_to_main_queues[strategy_id]
-            if strategy_id in self.shared_locks:
-                del self.shared_locks[strategy_id]
-            if strategy_id in self.shared_events:
-                del self.shared_events[strategy_id]
-            # 清理共享状态（使用已存在的锁）
-            if strategy_id in self.shared_locks:
-                with self.shared_locks[strategy_id]:
-                    keys_to_remove = [k for k in list(self.shared_state.keys()) if k.startswith(f'{strategy_id}_')]
-                    for key in keys_to_remove:
-                        if key in self.shared_state:
-                            del self.shared_state[key]
-            else:
-                # 如果没有锁，直接清理（可能锁已被删除）
-                keys_to_remove = [k for k in list(self.shared_state.keys()) if k.startswith(f'{strategy_id}_')]
-                for key in keys_to_remove:
-                    if key in self.shared_state:
-                        del self.shared_state[key]
-            if strategy_id in self.process_status:
-                self.process_status[strategy_id]['status'] = 'stopped'
+            handle.process = None
+            handle.status['status'] = 'stopped'
+            handle.status_block.release()
+            self._release_cpu(handle)
+            self._wakeup_monitor()
+            
+            # 释放策略独占的共享状态内存（进程已退出，无需获取任何锁）
+            handle.state.unlink()
+            handle.state = None
             
             logger.info(f"策略进程 {strategy_id} 已停止")
             return True
@@ -360,13 +971,14 @@ class ProcessManager:
         Returns:
             bool: 是否成功发送
         """
-        if strategy_id not in self.main_to_process_queues:
+        handle = self.strategies.get(strategy_id)
+        if not handle or not handle.process:
             logger.warning(f"策略进程 {strategy_id} 的通信队列不存在")
             return False
         
         try:
             # 使用双向队列发送消息，避免死锁
-            self.main_to_process_queues[strategy_id].put(message, block=False)
+            handle.in_queue.put(message, block=False)
             return True
         except Exception as e:
             logger.error(f"向策略进程 {strategy_id} 发送消息失败: {e}")
@@ -381,6 +993,10 @@ class ProcessManager:
         """
         同步向策略进程发送消息并等待响应
         
+        发送的消息附带_req_id字段，策略进程回复的ack消息应携带相同的_req_id。
+        响应由监控线程按_req_id转交，不会与其他消息争抢队列；
+        未携带_req_id的ack消息转交给该策略最早的未完成请求。
+        
         Args:
             strategy_id: 策略唯一标识
             message: 消息字典
@@ -389,12 +1005,23 @@ class ProcessManager:
         Returns:
             bool: 是否成功发送并收到响应
         """
-        if not self.send_message_to_process(strategy_id, message):
-            return False
+        request_id = next(self.request_ids)
+        event = Event()
+        responses: List[Dict[str, Any]] = []
+        self.pending_acks[request_id] = (strategy_id, event, responses)
         
-        # 等待响应
-        response = self.receive_message_from_process(strategy_id, timeout=timeout)
-        return response is not None and response.get('type') == 'ack'
+        try:
+            if not self.send_message_to_process(strategy_id, dict(message, _req_id=request_id)):
+                return False
+            
+            # 等待监控线程转交响应
+            if not event.wait(timeout):
+                logger.warning(f"等待策略进程 {strategy_id} 响应超时")
+                return False
+            
+            return responses[0].get('type') == 'ack'
+        finally:
+            self.pending_acks.pop(request_id, None)
     
     def receive_message_from_process(self, strategy_id: str, timeout: float = 0.1) -> Optional[Dict[str, Any]]:
         """
@@ -407,11 +1034,12 @@ class ProcessManager:
         Returns:
             Optional[Dict[str, Any]]: 消息字典，超时返回None
         """
-        if strategy_id not in self.process_to_main_queues:
+        handle = self.strategies.get(strategy_id)
+        if not handle:
             return None
         
         try:
-            return self.process_to_main_queues[strategy_id].get(timeout=timeout)
+            return handle.out_queue.get(timeout=timeout)
         except Empty:
             return None
         except Exception as e:
@@ -430,10 +1058,17 @@ class ProcessManager:
             Any: 状态值
         """
         full_key = f'{strategy_id}_{key}'
-        if strategy_id in self.shared_locks:
-            with self.shared_locks[strategy_id]:
-                return self.shared_state.get(full_key)
-        return self.shared_state.get(full_key)
+        handle = self.strategies.get(strategy_id)
+        
+        # 运行中进程的PID和状态直接从状态块读取，无需加锁和反序列化
+        if handle and handle.process and key in ('pid', 'status'):
+            pid, status, _, _ = handle.status_block.read_status()
+            if pid:
+                return pid if key == 'pid' else status
+        
+        if handle and handle.state:
+            return handle.state.get(full_key)
+        return self.pending_state.get(strategy_id, {}).get(full_key)
     
     def set_shared_state(self, strategy_id: str, key: str, value: Any) -> None:
         """
@@ -445,11 +1080,11 @@ class ProcessManager:
             value: 状态值
         """
         full_key = f'{strategy_id}_{key}'
-        if strategy_id in self.shared_locks:
-            with self.shared_locks[strategy_id]:
-                self.shared_state[full_key] = value
+        handle = self.strategies.get(strategy_id)
+        if handle and handle.state:
+            handle.state[full_key] = value
         else:
-            self.shared_state[full_key] = value
+            self.pending_state.setdefault(strategy_id, {})[full_key] = value
     
     def wait_for_process_event(self, strategy_id: str, timeout: Optional[float] = None) -> bool:
         """
@@ -462,10 +1097,11 @@ class ProcessManager:
         Returns:
             bool: 是否等到事件
         """
-        if strategy_id not in self.shared_events:
+        handle = self.strategies.get(strategy_id)
+        if not handle:
             return False
         
-        return self.shared_events[strategy_id].wait(timeout=timeout)
+        return handle.event.wait(timeout=timeout)
     
     def set_process_event(self, strategy_id: str) -> None:
         """
@@ -474,8 +1110,9 @@ class ProcessManager:
         Args:
             strategy_id: 策略唯一标识
         """
-        if strategy_id in self.shared_events:
-            self.shared_events[strategy_id].set()
+        handle = self.strategies.get(strategy_id)
+        if handle:
+            handle.event.set()
     
     def clear_process_event(self, strategy_id: str) -> None:
         """
@@ -484,86 +1121,271 @@ class ProcessManager:
         Args:
             strategy_id: 策略唯一标识
         """
-        if strategy_id in self.shared_events:
-            self.shared_events[strategy_id].clear()
+        handle = self.strategies.get(strategy_id)
+        if handle:
+            handle.event.clear()
     
     def start_monitoring(self) -> None:
         """启动进程监控线程"""
         if self.monitoring:
             return
         
+        if self.wakeup_reader is None:
+            self.wakeup_reader, self.wakeup_writer = Pipe(duplex=False)
+        
         self.monitoring = True
         self.monitor_thread = Thread(target=self._monitor_processes, daemon=True)
         self.monitor_thread.start()
         logger.info("进程监控线程已启动")
     
+    def _wakeup_monitor(self) -> None:
+        """通知监控线程重建等待对象"""
+        with self.resource_lock:
+            self.monitor_dirty = True
+        if self.wakeup_writer is None:
+            return
+        
+        try:
+            self.wakeup_writer.send_bytes(b"")
+        except OSError:
+            pass
+    
+    def _build_wait_map(self) -> Tuple[Dict[Any, Tuple[Optional[str], bool]], List[str]]:
+        """
+        生成监控线程的等待对象
+        
+        Returns:
+            Tuple: ({等待对象: (策略ID, 是否为进程sentinel)}, 需要轮询的faster_fifo队列对应的策略ID列表)，
+                空闲工作进程的sentinel对应的策略ID为None
+        """
+        wait_map: Dict[Any, Tuple[Optional[str], bool]] = {}
+        polled: List[str] = []
+        
+        with self.resource_lock:
+            for worker in self.idle_workers:
+                wait_map[worker.process.sentinel] = (None, True)
+        
+        for strategy_id, handle in list(self.strategies.items()):
+            # 停止中的进程由stop_strategy_process负责回收
+            if not handle.process or handle.status['status'] == 'stopping':
+                continue
+            
+            wait_map[handle.process.sentinel] = (strategy_id, True)
+            
+            if hasattr(handle.out_queue, "_reader"):
+                wait_map[handle.out_queue._reader] = (strategy_id, False)
+            else:
+                polled.append(strategy_id)
+        
+        return wait_map, polled
+    
     def _monitor_processes(self) -> None:
-        """监控进程状态"""
+        """
+        监控进程状态
+        
+        同时等待进程sentinel和消息队列，只在进程退出或消息到达时唤醒；
+        faster_fifo队列没有文件描述符，按MONITOR_INTERVAL轮询。
+        
+        POSIX系统上使用常驻的selector，等待对象只在策略启动或退出时增删，
+        每次唤醒的开销与策略数量无关；Windows上使用multiprocessing.connection.wait。
+        """
+        selector: Optional[selectors.BaseSelector] = None
+        if not is_windows_system():
+            selector = selectors.DefaultSelector()
+            selector.register(self.wakeup_reader, selectors.EVENT_READ)
+        
+        wait_map: Dict[Any, Tuple[Optional[str], bool]] = {}
+        polled: List[str] = []
+        
         while self.monitoring:
             try:
-                # 检查所有进程状态
-                for strategy_id, process in list(self.processes.items()):
-                    if not process.is_alive():
-                        # 进程异常退出
-                        exit_code = process.exitcode
-                        logger.warning(
-                            f"策略进程 {strategy_id} 异常退出，退出码: {exit_code}"
-                        )
-                        
-                        # 更新状态
-                        if strategy_id in self.process_status:
-                            self.process_status[strategy_id]['status'] = 'crashed'
-                            self.process_status[strategy_id]['exit_code'] = exit_code
-                        
-                        # 清理资源
-                        if strategy_id in self.process_queues:
-                            del self.process_queues[strategy_id]
-                        del self.processes[strategy_id]
+                # 在后台补充被取用或意外退出的空闲工作进程
+                self._fill_pool()
+                
+                with self.resource_lock:
+                    dirty: bool = self.monitor_dirty
+                    self.monitor_dirty = False
                 
-                # 接收进程消息（避免阻塞，使用非阻塞方式）
-                for strategy_id in list(self.process_to_main_queues.keys()):
-                    try:
-                        message = self.process_to_main_queues[strategy_id].get_nowait()
-                        if message:
-                            self._handle_process_message(strategy_id, message)
-                    except Empty:
-                        pass
-                    except Exception as e:
-                        logger.error(f"接收进程 {strategy_id} 消息异常: {e}")
+                if dirty:
+                    new_map, polled = self._build_wait_map()
+                    if selector:
+                        _update_selector(selector, wait_map, new_map)
+                    wait_map = new_map
                 
-                # 休眠一段时间
-                time.sleep(0.5)
+                timeout: float = MONITOR_INTERVAL if polled else MONITOR_TIMEOUT
+                if selector:
+                    ready = [key.fileobj for key, _ in selector.select(timeout)]
+                else:
+                    ready = wait([self.wakeup_reader, *wait_map], timeout=timeout)
+                
+                for obj in ready:
+                    if obj is self.wakeup_reader:
+                        while self.wakeup_reader.poll():
+                            self.wakeup_reader.recv_bytes()
+                        continue
+                    
+                    target = wait_map.get(obj)
+                    if target is None:
+                        continue
+                    
+                    strategy_id, is_sentinel = target
+                    if strategy_id is None:
+                        self._on_pool_worker_exit(obj)
+                    elif is_sentinel:
+                        self._on_process_exit(strategy_id)
+                    else:
+                        self._drain_process_messages(strategy_id)
+                
+                for strategy_id in polled:
+                    self._drain_process_messages(strategy_id)
                 
             except Exception as e:
                 logger.error(f"进程监控异常: {e}")
                 time.sleep(1)
+        
+        if selector:
+            selector.close()
+    
+    def _on_process_exit(self, strategy_id: str) -> None:
+        """
+        处理策略进程退出
+        
+        Args:
+            strategy_id: 策略唯一标识
+        """
+        handle = self.strategies.get(strategy_id)
+        if not handle or not handle.process:
+            return
+        
+        # 先处理进程退出前发送的消息
+        self._drain_process_messages(strategy_id)
+        
+        # sentinel就绪时进程可能尚未被回收，短暂等待以获取退出码
+        process = handle.process
+        process.join(timeout=1.0)
+        exit_code = process.exitcode
+        status = handle.status
+        
+        # 结束消息未送达时以状态块中策略进程写入的状态为准
+        if status['status'] == 'running':
+            block_status: str = handle.status_block.read_status()[1]
+            if block_status not in ('starting', 'running'):
+                status['status'] = block_status
+        
+        # 未报告结束状态即退出的进程视为异常退出
+        if status['status'] != 'running':
+            logger.debug("策略进程 {} 已退出，退出码: {}", strategy_id, exit_code)
+        else:
+            logger.warning(
+                f"策略进程 {strategy_id} 异常退出，退出码: {exit_code}"
+            )
+            status['status'] = 'crashed'
+        status['exit_code'] = exit_code
+        
+        # 进程可能在持有共享状态锁时退出，之后只在主进程内加锁
+        handle.state.release_process_lock()
+        
+        # 清理资源（停止流程中由stop_strategy_process负责）
+        if status['status'] != 'stopping':
+            handle.process = None
+            handle.status_block.release()
+            self._release_cpu(handle)
+        with self.resource_lock:
+            self.monitor_dirty = True
+    
+    def _drain_process_messages(self, strategy_id: str) -> None:
+        """
+        处理策略进程消息队列中的所有待处理消息
+        
+        Args:
+            strategy_id: 策略唯一标识
+        """
+        handle = self.strategies.get(strategy_id)
+        if handle is None:
+            return
+        
+        try:
+            while True:
+                messages = _drain_queue(handle.out_queue)
+                for message in messages:
+                    if message:
+                        self._handle_process_message(strategy_id, message)
+                
+                if len(messages) < DRAIN_BATCH_SIZE:
+                    break
+        except Exception as e:
+            logger.error(f"接收进程 {strategy_id} 消息异常: {e}")
     
     def _handle_process_message(self, strategy_id: str, message: Dict[str, Any]) -> None:
         """处理进程消息"""
+        handle = self.strategies.get(strategy_id)
+        if handle is None:
+            return
+        
+        status = handle.status
         msg_type = message.get('type')
         
+        # 同步请求的响应直接转交给等待方
+        request_id = message.get('_req_id')
+        if request_id is None and msg_type == 'ack':
+            request_id = next(
+                (rid for rid, pending in list(self.pending_acks.items()) if pending[0] == strategy_id),
+                None
+            )
+        
+        pending = self.pending_acks.get(request_id) if request_id is not None else None
+        if pending:
+            pending[2].append(message)
+            pending[1].set()
+            return
+        
         if msg_type == 'started':
-            logger.info(f"策略进程 {strategy_id} 已启动")
-            if strategy_id in self.process_status:
-                self.process_status[strategy_id]['status'] = 'running'
+            logger.debug("策略进程 {} 已启动", strategy_id)
+            status['status'] = 'running'
         
         elif msg_type == 'completed':
-            logger.info(f"策略进程 {strategy_id} 执行完成")
-            if strategy_id in self.process_status:
-                self.process_status[strategy_id]['status'] = 'completed'
+            logger.info("策略进程 {} 执行完成", strategy_id)
+            status['status'] = 'completed'
         
         elif msg_type == 'error':
             logger.error(
                 f"策略进程 {strategy_id} 执行错误: {message.get('error')}"
             )
-            if strategy_id in self.process_status:
-                self.process_status[strategy_id]['status'] = 'error'
-                self.process_status[strategy_id]['error'] = message.get('error')
+            status['status'] = 'error'
+            status['error'] = message.get('error')
         
         elif msg_type == 'interrupted':
-            logger.info(f"策略进程 {strategy_id} 被中断")
-            if strategy_id in self.process_status:
-                self.process_status[strategy_id]['status'] = 'interrupted'
+            logger.info("策略进程 {} 被中断", strategy_id)
+            status['status'] = 'interrupted'
+    
+    def get_heartbeat(self, strategy_id: str) -> Optional[Dict[str, Any]]:
+        """
+        获取策略进程的最新心跳
+        
+        策略函数通过_process_comm['status_block'].heartbeat()写入心跳，
+        这里直接读取共享内存中的记录。
+        
+        Args:
+            strategy_id: 策略唯一标识
+            
+        Returns:
+            Optional[Dict[str, Any]]: 心跳信息（序号、距今秒数、状态、标签），进程未运行或尚无心跳时返回None
+        """
+        handle = self.strategies.get(strategy_id)
+        if not handle or not handle.process:
+            return None
+        
+        record = handle.status_block.last_heartbeat()
+        if record is None:
+            return None
+        
+        sequence, timestamp, status, tag = record
+        return {
+            'seq': sequence,
+            'age': (time.monotonic_ns() - timestamp) / 1e9,
+            'status': status,
+            'tag': tag
+        }
     
     def get_process_status(self, strategy_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -575,7 +1397,8 @@ class ProcessManager:
         Returns:
             Optional[Dict[str, Any]]: 进程状态字典
         """
-        return self.process_status.get(strategy_id)
+        handle = self.strategies.get(strategy_id)
+        return handle.status if handle else None
     
     def get_all_process_status(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -584,13 +1407,14 @@ class ProcessManager:
         Returns:
             Dict[str, Dict[str, Any]]: 所有进程状态字典
         """
-        return dict(self.process_status)
+        return {strategy_id: handle.status for strategy_id, handle in self.strategies.items()}
     
     def stop_all_processes(self) -> None:
         """停止所有策略进程"""
         logger.info("正在停止所有策略进程...")
-        for strategy_id in list(self.processes.keys()):
-            self.stop_strategy_process(strategy_id)
+        for strategy_id, handle in list(self.strategies.items()):
+            if handle.process:
+                self.stop_strategy_process(strategy_id)
         logger.info("所有策略进程已停止")
     
     def close(self) -> None:
@@ -599,13 +1423,437 @@ class ProcessManager:
         
         # 停止监控
         self.monitoring = False
+        self._wakeup_monitor()
         if self.monitor_thread and self.monitor_thread.is_alive():
             self.monitor_thread.join(timeout=2.0)
         
         # 停止所有进程
+        self._shutdown_pool()
         self.stop_all_processes()
+        if self.wakeup_reader:
+            self.wakeup_reader.close()
+            self.wakeup_writer.close()
         
-        # 关闭共享状态管理器
-        self.manager.shutdown()
+        # 释放已退出策略保留的共享状态内存
+        for handle in self.strategies.values():
+            if handle.state:
+                handle.state.unlink()
+                handle.state = None
+        self.status_table.close()
         
         logger.info("进程管理器已关闭")
+
+
+def _release_shared_memory(shm: SharedMemory) -> None:
+    """关闭并释放创建方的共享内存"""
+    shm.close()
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _release_shared_state(shm: SharedMemory) -> None:
+    """释放共享状态的头部段，以及头部记录的当前数据段"""
+    generation: int = STATE_HEADER.unpack_from(shm.buf, 0)[1]
+    if generation:
+        try:
+            data_shm = SharedMemory(name=_state_segment_name(shm.name, generation))
+        except FileNotFoundError:
+            pass
+        else:
+            _release_shared_memory(data_shm)
+    
+    _release_shared_memory(shm)
+
+
+def _state_segment_name(name: str, generation: int) -> str:
+    """共享状态扩容后数据段的名称"""
+    return f"{name}_{generation}"
+
+
+class SharedStateDict:
+    """
+    基于共享内存的策略共享状态字典
+    
+    代替Manager().dict()：每个策略独占一块共享内存和一把进程间锁，键值序列化后存放在
+    共享内存中，读写只需加锁和内存拷贝，不再经过Manager服务进程的socket往返，
+    不同策略之间也不争用同一把锁。每次写入递增版本号，读取时版本号未变化则直接使用
+    本进程缓存的数据，无需重复反序列化。
+    
+    新数据总是写在已发布数据之外的区域，最后更新头部，写入中途被终止不会破坏已发布的数据；
+    空间不足时写入方新建一块更大的数据段，头部记录数据段代数，其他进程读取时按代数重新映射。
+    
+    主进程通过holder_alive检查子进程是否存活：子进程持锁时被终止，锁不会再被释放，
+    主进程等待超时后发现子进程已退出，改为只在本进程内加锁。
+    
+    可以作为参数传递给子进程，子进程中按名称重新映射同一块共享内存。
+    """
+    
+    def __init__(self, size: int = SHARED_STATE_SIZE, ctx: Optional[BaseContext] = None):
+        """
+        Args:
+            size: 共享内存初始大小（字节），数据超出时自动扩容
+            ctx: 创建锁使用的multiprocessing上下文，需与使用该字典的子进程一致，None表示默认上下文
+        """
+        self.shm: SharedMemory = SharedMemory(create=True, size=size)
+        self.lock: Optional[Any] = (ctx or multiprocessing).Lock()
+        
+        # 使用该字典的子进程是否存活，由主进程在子进程启动后设置
+        self.holder_alive: Optional[Callable[[], bool]] = None
+        
+        self._init_local()
+        
+        # 创建方未调用unlink时，对象回收或解释器退出时释放共享内存
+        self._finalizer: Optional[weakref.finalize] = weakref.finalize(self, _release_shared_state, self.shm)
+    
+    def _init_local(self) -> None:
+        """初始化本进程内的状态"""
+        self._local_lock = Lock()           # 本进程内的线程先在这里排队，再获取进程间锁
+        self._data_shm: SharedMemory = self.shm
+        self._generation: int = 0
+        self._version: int = 0
+        self._data: Dict[str, Any] = {}
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"name": self.shm.name, "lock": self.lock}
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.shm = SharedMemory(name=state["name"])
+        self.lock = state["lock"]
+        self.holder_alive = None
+        self._init_local()
+        self._finalizer = None
+    
+    def _acquire(self) -> None:
+        """
+        获取锁
+        
+        本进程的线程已由本地锁串行化，等待进程间锁超时说明锁由子进程持有；
+        子进程已退出时不再等待，之后只在本进程内加锁。
+        """
+        self._local_lock.acquire()
+        
+        while self.lock and not self.lock.acquire(timeout=STATE_LOCK_TIMEOUT):
+            if self.holder_alive and not self.holder_alive():
+                logger.warning("持有共享状态锁的策略进程已退出，改为只在本进程内加锁")
+                self.lock = None
+    
+    def _release(self) -> None:
+        """释放锁"""
+        if self.lock:
+            self.lock.release()
+        self._local_lock.release()
+    
+    def release_process_lock(self) -> None:
+        """使用该字典的子进程已退出，之后只在本进程内加锁（子进程可能持锁退出）"""
+        with self._local_lock:
+            self.lock = None
+    
+    def _data_segment(self, generation: int) -> Tuple[SharedMemory, int]:
+        """
+        映射当前数据段（调用方需持有锁）
+        
+        Returns:
+            Tuple: (数据段, 数据区起始偏移)，未扩容时数据位于头部段中头部之后
+        """
+        if not generation:
+            return self.shm, STATE_HEADER.size
+        
+        if generation != self._generation:
+            if self._data_shm is not self.shm:
+                self._data_shm.close()
+            self._data_shm = SharedMemory(name=_state_segment_name(self.shm.name, generation))
+            self._generation = generation
+        return self._data_shm, 0
+    
+    def _load(self) -> Dict[str, Any]:
+        """读取共享内存中的数据（调用方需持有锁）"""
+        version, generation, offset, length = STATE_HEADER.unpack_from(self.shm.buf, 0)
+        
+        if version != self._version:
+            data_shm, _ = self._data_segment(generation)
+            self._data = pickle.loads(data_shm.buf[offset:offset + length]) if length else {}
+            self._version = version
+        
+        return self._data
+    
+    def _store(self, data: Dict[str, Any]) -> None:
+        """写入数据到共享内存（调用方需持有锁）"""
+        payload: bytes = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        size: int = len(payload)
+        
+        version, generation, offset, length = STATE_HEADER.unpack_from(self.shm.buf, 0)
+        data_shm, base = self._data_segment(generation)
+        
+        # 写在已发布数据之外：优先写在数据区开头，放不下时写在已发布数据之后
+        old_shm: Optional[SharedMemory] = None
+        if not length or base + size <= offset:
+            start: int = base
+        elif offset + length + size <= data_shm.size:
+            start = offset + length
+        else:
+            old_shm = data_shm
+            data_shm = self._grow(generation, max(data_shm.size, size) * 2)
+            generation += 1
+            start = 0
+        
+        data_shm.buf[start:start + size] = payload
+        STATE_HEADER.pack_into(self.shm.buf, 0, version + 1, generation, start, size)
+        
+        # 头部已指向新数据段，释放旧数据段（其他进程下次读取时按代数重新映射）
+        if old_shm is not None and old_shm is not self.shm:
+            _release_shared_memory(old_shm)
+        
+        self._version = version + 1
+        self._data = data
+    
+    def _grow(self, generation: int, size: int) -> SharedMemory:
+        """新建下一代数据段并映射到本进程（调用方需持有锁）"""
+        new_shm = SharedMemory(
+            name=_state_segment_name(self.shm.name, generation + 1),
+            create=True,
+            size=size
+        )
+        self._data_shm = new_shm
+        self._generation = generation + 1
+        return new_shm
+    
+    def __getitem__(self, key: str) -> Any:
+        self._acquire()
+        try:
+            return self._load()[key]
+        finally:
+            self._release()
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.update({key: value})
+    
+    def __delitem__(self, key: str) -> None:
+        self._acquire()
+        try:
+            data: Dict[str, Any] = dict(self._load())
+            del data[key]
+            self._store(data)
+        finally:
+            self._release()
+    
+    def __contains__(self, key: str) -> bool:
+        self._acquire()
+        try:
+            return key in self._load()
+        finally:
+            self._release()
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        self._acquire()
+        try:
+            return self._load().get(key, default)
+        finally:
+            self._release()
+    
+    def keys(self) -> List[str]:
+        self._acquire()
+        try:
+            return list(self._load())
+        finally:
+            self._release()
+    
+    def update(self, items: Union[Dict[str, Any], Iterable[Tuple[str, Any]]]) -> None:
+        """批量写入，只序列化和拷贝一次"""
+        self._acquire()
+        try:
+            data: Dict[str, Any] = dict(self._load())
+            data.update(items)
+            self._store(data)
+        finally:
+            self._release()
+    
+    def pop(self, key: str, default: Any = None) -> Any:
+        self._acquire()
+        try:
+            data: Dict[str, Any] = self._load()
+            if key not in data:
+                return default
+            
+            data = dict(data)
+            value: Any = data.pop(key)
+            self._store(data)
+            return value
+        finally:
+            self._release()
+    
+    def close(self) -> None:
+        """关闭共享内存映射"""
+        self._data = {}
+        if self._data_shm is not self.shm:
+            self._data_shm.close()
+        self._data_shm = self.shm
+        self._generation = 0
+        
+        # 创建方的头部段由unlink释放（释放时需要读取头部中的数据段代数）
+        if not self._finalizer:
+            self.shm.close()
+    
+    def unlink(self) -> None:
+        """释放共享内存（仅由创建方调用，子进程应已退出）"""
+        if self._finalizer:
+            self.close()
+            self._finalizer()
+
+
+class StatusTable:
+    """
+    策略进程状态表
+    
+    所有策略进程的状态块存放在同一块共享内存中，每个槽位STATUS_BLOCK_SIZE字节，
+    按槽位分配给策略进程，进程退出后归还槽位。
+    """
+    
+    def __init__(self, slots: int, lock: Any = None):
+        """
+        Args:
+            slots: 槽位数量
+            lock: 保护槽位分配的可重入锁，None表示新建，ProcessManager传入自身的资源锁
+        """
+        self.shm: SharedMemory = SharedMemory(create=True, size=STATUS_BLOCK_SIZE * max(slots, 1))
+        self.free_slots: List[int] = list(range(slots - 1, -1, -1))
+        self.lock = lock or RLock()
+        
+        # 未调用close时，对象回收或解释器退出时释放共享内存
+        self._finalizer: weakref.finalize = weakref.finalize(self, _release_shared_memory, self.shm)
+    
+    def acquire(self) -> "StatusBlock":
+        """分配一个清零的状态块"""
+        with self.lock:
+            if not self.free_slots:
+                raise RuntimeError("策略进程状态块槽位已用完")
+            offset: int = self.free_slots.pop() * STATUS_BLOCK_SIZE
+        
+        self.shm.buf[offset:offset + STATUS_BLOCK_SIZE] = bytes(STATUS_BLOCK_SIZE)
+        return StatusBlock(self, offset)
+    
+    def release(self, offset: int) -> None:
+        """归还状态块槽位"""
+        with self.lock:
+            self.free_slots.append(offset // STATUS_BLOCK_SIZE)
+    
+    def close(self) -> None:
+        """关闭并释放共享内存"""
+        self._finalizer()
+
+
+class StatusBlock:
+    """
+    策略进程状态块
+    
+    状态表中的一个槽位：第一个缓存行由策略进程写入PID、状态码、更新时间戳、错误码和心跳计数，
+    第二个缓存行由主进程写入停止标志和命令序号。两个方向的写入落在不同缓存行上，
+    读写双方所在的CPU核心之间不会互相使缓存行失效。
+    
+    之后是固定长度记录组成的心跳环形缓冲区：策略进程先写入记录再递增心跳计数，
+    主进程按计数读取最新记录，心跳无需经过消息队列和序列化。
+    
+    可以作为参数传递给子进程，子进程中按名称重新映射状态表的共享内存。
+    """
+    
+    def __init__(self, table: Optional[StatusTable], offset: int):
+        """
+        Args:
+            table: 所属状态表，子进程中为None
+            offset: 状态块在共享内存中的偏移量
+        """
+        self.table: Optional[StatusTable] = table
+        self.shm: SharedMemory = table.shm
+        self.offset: int = offset
+        self.heartbeat_count: int = 0
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"name": self.shm.name, "offset": self.offset}
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.table = None
+        self.shm = SharedMemory(name=state["name"])
+        self.offset = state["offset"]
+        self.heartbeat_count = HEARTBEAT_COUNT.unpack_from(self.shm.buf, self.offset + HEARTBEAT_COUNT_OFFSET)[0]
+    
+    def write_status(self, status: str, error_code: int = 0) -> None:
+        """写入策略进程状态（策略进程调用）"""
+        WORKER_STATUS.pack_into(
+            self.shm.buf, self.offset, os.getpid(), STATUS_CODES[status], time.time(), error_code
+        )
+    
+    def read_status(self) -> Tuple[int, str, float, int]:
+        """
+        读取策略进程状态
+        
+        Returns:
+            Tuple: (PID, 状态, 更新时间戳, 错误码)
+        """
+        pid, code, timestamp, error_code = WORKER_STATUS.unpack_from(self.shm.buf, self.offset)
+        return pid, STATUS_NAMES.get(code, "starting"), timestamp, error_code
+    
+    def _heartbeat_offset(self, sequence: int) -> int:
+        """心跳序号对应记录在共享内存中的偏移量"""
+        ring_offset: int = self.offset + STATUS_BLOCK_SIZE - HEARTBEAT_SLOTS * HEARTBEAT_RECORD.size
+        return ring_offset + (sequence & (HEARTBEAT_SLOTS - 1)) * HEARTBEAT_RECORD.size
+    
+    def heartbeat(self, status: str = "running", tag: bytes = b"") -> None:
+        """
+        写入一条心跳记录（策略进程调用）
+        
+        Args:
+            status: 策略状态
+            tag: 附加标签，最多8字节
+        """
+        sequence: int = self.heartbeat_count
+        record_offset: int = self._heartbeat_offset(sequence)
+        HEARTBEAT_RECORD.pack_into(
+            self.shm.buf, record_offset, sequence, time.monotonic_ns(), STATUS_CODES[status], tag
+        )
+        
+        # 记录写完后再发布计数，读取方不会看到未写完的记录
+        self.heartbeat_count = sequence + 1
+        HEARTBEAT_COUNT.pack_into(self.shm.buf, self.offset + HEARTBEAT_COUNT_OFFSET, self.heartbeat_count)
+    
+    def last_heartbeat(self) -> Optional[Tuple[int, int, str, bytes]]:
+        """
+        读取最新的心跳记录（主进程调用）
+        
+        Returns:
+            Optional[Tuple]: (序号, time.monotonic_ns时间戳, 状态, 标签)，尚无心跳时返回None
+        """
+        count: int = HEARTBEAT_COUNT.unpack_from(self.shm.buf, self.offset + HEARTBEAT_COUNT_OFFSET)[0]
+        if not count:
+            return None
+        
+        sequence: int = count - 1
+        record_offset: int = self._heartbeat_offset(sequence)
+        record_sequence, timestamp, code, tag = HEARTBEAT_RECORD.unpack_from(self.shm.buf, record_offset)
+        
+        # 读取期间记录已被环形缓冲区覆盖
+        if record_sequence != sequence:
+            return None
+        return sequence, timestamp, STATUS_NAMES.get(code, "starting"), tag.rstrip(b"\0")
+    
+    def request_stop(self) -> None:
+        """设置停止标志（主进程调用）"""
+        offset: int = self.offset + CACHE_LINE_SIZE
+        _, sequence = MONITOR_COMMAND.unpack_from(self.shm.buf, offset)
+        MONITOR_COMMAND.pack_into(self.shm.buf, offset, 1, sequence + 1)
+    
+    @property
+    def stop_requested(self) -> bool:
+        """主进程是否已请求停止，策略函数可定期检查以主动退出"""
+        return bool(MONITOR_COMMAND.unpack_from(self.shm.buf, self.offset + CACHE_LINE_SIZE)[0])
+    
+    def release(self) -> None:
+        """将槽位归还状态表（主进程调用，可重复调用）"""
+        table: Optional[StatusTable] = self.table
+        if not table:
+            return
+        
+        with table.lock:
+            if self.table:
+                table.release(self.offset)
+                self.table = None
@@ -7,15 +7,20 @@
 
 from typing import Dict, List, Optional, Tuple
 import math
+import sys
 import traceback
 
 from .logger import logger
 
 try:
     import matplotlib
-    matplotlib.use('Agg')  # 使用非交互式后端，避免Mac系统显示问题
+    # 使用非交互式后端，避免Mac系统显示问题；pyplot已导入时不再切换，避免重复导入时的警告
+    if "matplotlib.pyplot" not in sys.modules:
+        matplotlib.use('Agg')
     import matplotlib.pyplot as plt
     import matplotlib.cm as cm
+    from matplotlib import font_manager
+    from matplotlib.figure import Figure
     HAS_MATPLOTLIB = True
 except ImportError:
     HAS_MATPLOTLIB = False
@@ -29,6 +34,39 @@ except ImportError:
     logger.warning("numpy未安装，部分可视化功能可能不可用")
 
 
+def _argmax(values: List[float]) -> int:
+    """
+    返回最大值的位置（多个最大值时取第一个）
+    
+    Args:
+        values: 数值列表
+        
+    Returns:
+        int: 最大值所在索引
+    """
+    if HAS_NUMPY:
+        return int(np.asarray(values).argmax())
+    return max(range(len(values)), key=values.__getitem__)
+
+
+def _warm_font_cache() -> None:
+    """
+    预先解析并加载默认字体
+    
+    首次绘图时才查找和加载字体文件会增加首张图的延迟，
+    在回测子进程中使用时每个进程都会遇到，因此在导入时完成。
+    """
+    try:
+        properties = font_manager.FontProperties(family=plt.rcParams['font.family'])
+        font_manager.get_font(font_manager.fontManager.findfont(properties))
+    except Exception as e:
+        logger.debug(f"预加载matplotlib字体失败: {e}")
+
+
+if HAS_MATPLOTLIB:
+    _warm_font_cache()
+
+
 class OptimizationVisualization:
     """
     参数优化可视化工具
@@ -41,8 +79,66 @@ class OptimizationVisualization:
         if not HAS_MATPLOTLIB:
             logger.warning("matplotlib未安装，可视化功能受限")
         
+        # 复用的图形对象，批量绘图时避免反复创建Figure
+        self._reusable_fig: Optional["Figure"] = None
+        
+        # 交互模式下按矩阵形状缓存的热力图，重绘时只更新数据
+        self._heatmap_cache: Dict[Tuple[int, int], dict] = {}
+        
         logger.info("OptimizationVisualization初始化完成")
     
+    def _get_axes(self, figsize: Tuple[float, float], projection: Optional[str] = None):
+        """
+        获取复用的图形和坐标轴
+        
+        首次调用时创建Figure，之后清空内容并调整尺寸后复用，
+        不经过pyplot，因此无需在每次绘图后关闭。
+        
+        Args:
+            figsize: 图形尺寸（英寸）
+            projection: 坐标轴投影类型（如'3d'）
+            
+        Returns:
+            Tuple: (图形, 坐标轴)
+        """
+        fig = self._reusable_fig
+        if fig is None:
+            fig = Figure(figsize=figsize)
+            self._reusable_fig = fig
+        else:
+            fig.clear()
+            fig.set_size_inches(figsize)
+        
+        ax = fig.add_subplot(111, projection=projection)
+        return fig, ax
+    
+    def close(self) -> None:
+        """释放复用的图形对象"""
+        self._reusable_fig = None
+        self._heatmap_cache.clear()
+    
+    @staticmethod
+    def _heatmap_annotations(metric_array) -> Tuple[float, float, object, object]:
+        """
+        计算热力图的取值范围以及每个单元格的标注文字和颜色
+        
+        Returns:
+            Tuple: (最小值, 最大值, 颜色矩阵, 文字矩阵)
+        """
+        if HAS_NUMPY:
+            vmin = float(metric_array.min())
+            vmax = float(metric_array.max())
+            colors = np.where(metric_array > (vmax + vmin) / 2, "black", "white")
+            labels = np.char.mod("%.2f", metric_array)
+        else:
+            flat = [value for row in metric_array for value in row]
+            vmin = min(flat)
+            vmax = max(flat)
+            threshold = (vmax + vmin) / 2
+            colors = [["black" if value > threshold else "white" for value in row] for row in metric_array]
+            labels = [[f"{value:.2f}" for value in row] for row in metric_array]
+        return vmin, vmax, colors, labels
+    
     def plot_heatmap(
         self,
         param1_name: str,
@@ -52,11 +148,15 @@ class OptimizationVisualization:
         metric_values: List[List[float]],
         metric_name: str = "R-Cubed",
         output_path: Optional[str] = None,
-        title: Optional[str] = None
+        title: Optional[str] = None,
+        interactive: bool = False
     ) -> Optional[str]:
         """
         绘制参数优化热力图
         
+        交互模式下同一形状的热力图只创建一次，之后通过set_data更新数据，
+        适合优化过程中反复刷新同一张热力图。
+        
         Args:
             param1_name: 参数1名称
             param1_values: 参数1取值列表
@@ -66,6 +166,7 @@ class OptimizationVisualization:
             metric_name: 指标名称
             output_path: 输出文件路径（None表示不保存）
             title: 图表标题（None表示自动生成）
+            interactive: 是否复用同一形状的已有热力图
             
         Returns:
             Optional[str]: 输出文件路径，如果未保存则返回None
@@ -75,9 +176,6 @@ class OptimizationVisualization:
             return None
         
         try:
-            # 创建图形
-            fig, ax = plt.subplots(figsize=(10, 8))
-            
             # 准备数据
             if HAS_NUMPY:
                 metric_array = np.array(metric_values)
@@ -87,6 +185,27 @@ class OptimizationVisualization:
                 for row in metric_values:
                     metric_array.append(row)
             
+            xticklabels = [f"{v:.2f}" for v in param2_values]
+            yticklabels = [f"{v:.2f}" for v in param1_values]
+            if not title:
+                title = f"{metric_name} 参数优化热力图"
+            annotate = len(param1_values) <= 20 and len(param2_values) <= 20
+            
+            shape = (len(param1_values), len(param2_values))
+            cached = self._heatmap_cache.get(shape) if interactive else None
+            if cached:
+                return self._update_heatmap(
+                    cached, metric_array, xticklabels, yticklabels,
+                    param1_name, param2_name, metric_name, title, output_path
+                )
+            
+            # 创建图形，交互模式下每种形状使用独立的Figure
+            if interactive:
+                fig = Figure(figsize=(10, 8))
+                ax = fig.add_subplot(111)
+            else:
+                fig, ax = self._get_axes((10, 8))
+            
             # 绘制热力图
             im = ax.imshow(
                 metric_array,
@@ -98,46 +217,60 @@ class OptimizationVisualization:
             # 设置坐标轴
             ax.set_xticks(range(len(param2_values)))
             ax.set_yticks(range(len(param1_values)))
-            ax.set_xticklabels([f"{v:.2f}" for v in param2_values], rotation=45, ha='right')
-            ax.set_yticklabels([f"{v:.2f}" for v in param1_values])
+            ax.set_xticklabels(xticklabels, rotation=45, ha='right')
+            ax.set_yticklabels(yticklabels)
             
             # 设置标签
             ax.set_xlabel(param2_name, fontsize=12)
             ax.set_ylabel(param1_name, fontsize=12)
             
             # 设置标题
-            if title:
-                ax.set_title(title, fontsize=14, fontweight='bold')
-            else:
-                ax.set_title(f"{metric_name} 参数优化热力图", fontsize=14, fontweight='bold')
+            ax.set_title(title, fontsize=14, fontweight='bold')
             
             # 添加颜色条
-            cbar = plt.colorbar(im, ax=ax)
+            cbar = fig.colorbar(im, ax=ax)
             cbar.set_label(metric_name, fontsize=12)
             
             # 在热力图上标注数值（如果矩阵不太大）
-            if len(param1_values) <= 20 and len(param2_values) <= 20:
+            texts = []
+            if annotate:
+                # 颜色阈值和标注文字在循环外一次算好
+                _, _, colors, labels = self._heatmap_annotations(metric_array)
+                
                 for i in range(len(param1_values)):
+                    color_row = colors[i]
+                    label_row = labels[i]
+                    text_row = []
                     for j in range(len(param2_values)):
-                        value = metric_values[i][j]
-                        text = ax.text(
-                            j, i, f"{value:.2f}",
+                        text_row.append(ax.text(
+                            j, i, label_row[j],
                             ha="center", va="center",
-                            color="black" if value > (metric_array.max() + metric_array.min()) / 2 else "white",
-                            fontsize=8
-                        )
-            
-            plt.tight_layout()
+                            color=color_row[j],
+                            fontsize=8,
+                            in_layout=False
+                        ))
+                    texts.append(text_row)
+            
+            if interactive:
+                self._heatmap_cache[shape] = {
+                    'fig': fig,
+                    'ax': ax,
+                    'im': im,
+                    'cbar': cbar,
+                    'texts': texts,
+                    'xticklabels': xticklabels,
+                    'yticklabels': yticklabels
+                }
+            
+            fig.tight_layout()
             
             # 保存或显示
             if output_path:
-                plt.savefig(output_path, dpi=300, bbox_inches='tight')
+                fig.savefig(output_path, dpi=300, bbox_inches='tight')
                 logger.info(f"热力图已保存到: {output_path}")
-                plt.close()
                 return output_path
             else:
                 # 不显示，只返回（Mac系统可能无法显示）
-                plt.close()
                 return None
                 
         except Exception as e:
@@ -145,6 +278,68 @@ class OptimizationVisualization:
             logger.error(traceback.format_exc())
             return None
     
+    def _update_heatmap(
+        self,
+        cached: dict,
+        metric_array,
+        xticklabels: List[str],
+        yticklabels: List[str],
+        param1_name: str,
+        param2_name: str,
+        metric_name: str,
+        title: str,
+        output_path: Optional[str]
+    ) -> Optional[str]:
+        """
+        用新数据更新已缓存的热力图
+        
+        Args:
+            cached: plot_heatmap缓存的图形对象
+            metric_array: 指标值矩阵
+            xticklabels: 横轴刻度文字
+            yticklabels: 纵轴刻度文字
+            param1_name: 参数1名称
+            param2_name: 参数2名称
+            metric_name: 指标名称
+            title: 图表标题
+            output_path: 输出文件路径
+            
+        Returns:
+            Optional[str]: 输出文件路径，如果未保存则返回None
+        """
+        fig = cached['fig']
+        ax = cached['ax']
+        
+        vmin, vmax, colors, labels = self._heatmap_annotations(metric_array)
+        cached['im'].set_data(metric_array)
+        cached['im'].set_clim(vmin, vmax)
+        
+        # 刻度文字只在参数取值变化时更新
+        if xticklabels != cached['xticklabels']:
+            ax.set_xticklabels(xticklabels, rotation=45, ha='right')
+            cached['xticklabels'] = xticklabels
+        if yticklabels != cached['yticklabels']:
+            ax.set_yticklabels(yticklabels)
+            cached['yticklabels'] = yticklabels
+        
+        ax.set_xlabel(param2_name, fontsize=12)
+        ax.set_ylabel(param1_name, fontsize=12)
+        ax.set_title(title, fontsize=14, fontweight='bold')
+        cached['cbar'].set_label(metric_name, fontsize=12)
+        
+        for i, text_row in enumerate(cached['texts']):
+            color_row = colors[i]
+            label_row = labels[i]
+            for j, text in enumerate(text_row):
+                text.set_text(label_row[j])
+                text.set_color(color_row[j])
+        
+        if output_path:
+            fig.savefig(output_path, dpi=300, bbox_inches='tight')
+            logger.info(f"热力图已保存到: {output_path}")
+            return output_path
+        return None
+    
     def plot_parameter_surface(
         self,
         param1_name: str,
@@ -170,37 +365,19 @@ class OptimizationVisualization:
         Returns:
             Optional[str]: 输出文件路径
         """
-        if not HAS_MATPLOTLIB:
-            logger.error("matplotlib未安装，无法绘制3D表面图")
+        if not HAS_MATPLOTLIB or not HAS_NUMPY:
+            logger.error("matplotlib或numpy未安装，无法绘制3D表面图")
             return None
         
         try:
             from mpl_toolkits.mplot3d import Axes3D
             
             # 创建3D图形
-            fig = plt.figure(figsize=(12, 8))
-            ax = fig.add_subplot(111, projection='3d')
+            fig, ax = self._get_axes((12, 8), projection='3d')
             
             # 准备网格数据
-            if HAS_NUMPY:
-                X, Y = np.meshgrid(param2_values, param1_values)
-                Z = np.array(metric_values)
-            else:
-                # 手动创建网格
-                X = []
-                Y = []
-                Z = []
-                for i, p1 in enumerate(param1_values):
-                    row_x = []
-                    row_y = []
-                    row_z = []
-                    for j, p2 in enumerate(param2_values):
-                        row_x.append(p2)
-                        row_y.append(p1)
-                        row_z.append(metric_values[i][j])
-                    X.append(row_x)
-                    Y.append(row_y)
-                    Z.append(row_z)
+            X, Y = np.meshgrid(param2_values, param1_values)
+            Z = np.array(metric_values)
             
             # 绘制表面
             surf = ax.plot_surface(
@@ -220,16 +397,14 @@ class OptimizationVisualization:
             # 添加颜色条
             fig.colorbar(surf, ax=ax, shrink=0.5, aspect=5)
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # 保存
             if output_path:
-                plt.savefig(output_path, dpi=300, bbox_inches='tight')
+                fig.savefig(output_path, dpi=300, bbox_inches='tight')
                 logger.info(f"3D表面图已保存到: {output_path}")
-                plt.close()
                 return output_path
             else:
-                plt.close()
                 return None
                 
         except Exception as e:
@@ -264,13 +439,13 @@ class OptimizationVisualization:
             return None
         
         try:
-            fig, ax = plt.subplots(figsize=(10, 6))
+            fig, ax = self._get_axes((10, 6))
             
             # 绘制曲线
             ax.plot(param_values, metric_values, 'b-o', linewidth=2, markersize=6)
             
             # 标记最优值
-            max_index = metric_values.index(max(metric_values))
+            max_index = _argmax(metric_values)
             max_param = param_values[max_index]
             max_metric = metric_values[max_index]
             
@@ -283,16 +458,14 @@ class OptimizationVisualization:
             ax.grid(True, alpha=0.3)
             ax.legend()
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # 保存
             if output_path:
-                plt.savefig(output_path, dpi=300, bbox_inches='tight')
+                fig.savefig(output_path, dpi=300, bbox_inches='tight')
                 logger.info(f"参数曲线图已保存到: {output_path}")
-                plt.close()
                 return output_path
             else:
-                plt.close()
                 return None
                 
         except Exception as e:
@@ -323,7 +496,7 @@ class OptimizationVisualization:
             return None
         
         try:
-            fig, ax = plt.subplots(figsize=(12, 6))
+            fig, ax = self._get_axes((12, 6))
             
             # 提取数据
             labels = []
@@ -338,7 +511,7 @@ class OptimizationVisualization:
             bars = ax.bar(range(len(labels)), values, color='steelblue', alpha=0.7)
             
             # 标记最优值
-            max_index = values.index(max(values))
+            max_index = _argmax(values)
             bars[max_index].set_color('red')
             bars[max_index].set_alpha(1.0)
             
@@ -358,16 +531,14 @@ class OptimizationVisualization:
                     ha='center', va='bottom', fontsize=8
                 )
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # 保存
             if output_path:
-                plt.savefig(output_path, dpi=300, bbox_inches='tight')
+                fig.savefig(output_path, dpi=300, bbox_inches='tight')
                 logger.info(f"优化对比图已保存到: {output_path}")
-                plt.close()
                 return output_path
             else:
-                plt.close()
                 return None
                 
         except Exception as e:
@@ -406,6 +577,9 @@ class OptimizationVisualization:
             # 可以扩展为生成HTML报告或PDF报告
             # 目前先记录功能接口
             
+            # 报告生成结束，释放复用的图形
+            self.close()
+            
             return True
             
         except Exception as e:
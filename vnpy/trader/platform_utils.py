@@ -9,8 +9,17 @@ import ctypes
 import ctypes.util
 import os
 import platform
-from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
+
+
+# 平台信息在进程生命周期内不变，导入时查询一次
+_SYSTEM = platform.system()
+_IS_MAC = _SYSTEM == "Darwin"
+_IS_WINDOWS = _SYSTEM == "Windows"
+_MACHINE = platform.machine()
+
+# 已加载的动态库句柄，按真实路径索引，避免重复dlopen
+_dylib_cache: Dict[str, ctypes.CDLL] = {}
 
 
 def is_mac_system() -> bool:
@@ -20,7 +29,7 @@ def is_mac_system() -> bool:
     Returns:
         bool: 如果是Mac系统（Darwin）返回True，否则返回False
     """
-    return platform.system() == "Darwin"
+    return _IS_MAC
 
 
 def is_windows_system() -> bool:
@@ -30,7 +39,7 @@ def is_windows_system() -> bool:
     Returns:
         bool: 如果是Windows系统返回True，否则返回False
     """
-    return platform.system() == "Windows"
+    return _IS_WINDOWS
 
 
 def get_dylib_path(base_path: str, lib_name: str) -> str:
@@ -48,9 +57,7 @@ def get_dylib_path(base_path: str, lib_name: str) -> str:
         >>> get_dylib_path("/usr/local/lib", "mylib")
         '/usr/local/lib/mylib.dylib'
     """
-    base = Path(base_path)
-    lib_path = base / f"{lib_name}.dylib"
-    return str(lib_path)
+    return os.path.join(base_path, f"{lib_name}.dylib")
 
 
 def get_framework_path(framework_path: str) -> str:
@@ -73,19 +80,15 @@ def get_framework_path(framework_path: str) -> str:
         >>> get_framework_path("/path/to/thostmduserapi_se.framework")
         '/path/to/thostmduserapi_se.framework/Versions/A/thostmduserapi_se'
     """
-    framework = Path(framework_path)
-    
     # 确保是framework目录
     if not framework_path.endswith(".framework"):
         raise ValueError(f"Invalid framework path: {framework_path}. Must end with .framework")
     
     # 提取framework名称（不含.framework后缀）
-    framework_name = framework.stem
+    framework_name = os.path.basename(framework_path)[:-len(".framework")]
     
     # 构建framework内部路径：Versions/A/xxx
-    internal_path = framework / "Versions" / "A" / framework_name
-    
-    return str(internal_path)
+    return os.path.join(framework_path, "Versions", "A", framework_name)
 
 
 def get_mac_arch() -> str:
@@ -99,7 +102,7 @@ def get_mac_arch() -> str:
         >>> get_mac_arch()
         'arm64'  # 或 'x86_64'
     """
-    return platform.machine()
+    return _MACHINE
 
 
 def validate_framework_path(framework_path: str) -> bool:
@@ -114,15 +117,35 @@ def validate_framework_path(framework_path: str) -> bool:
     """
     try:
         internal_path = get_framework_path(framework_path)
-        return os.path.exists(internal_path) and os.path.isfile(internal_path)
+        return os.path.isfile(internal_path)
     except (ValueError, OSError):
         return False
 
 
+def _load_cached_library(path: str) -> ctypes.CDLL:
+    """
+    加载动态库并按真实路径缓存句柄。
+
+    Args:
+        path: 动态库可执行文件路径
+
+    Returns:
+        ctypes.CDLL: 加载的动态库对象
+    """
+    key = os.path.realpath(path)
+    handle = _dylib_cache.get(key)
+    if handle is None:
+        handle = ctypes.CDLL(path)
+        _dylib_cache[key] = handle
+    return handle
+
+
 def load_mac_library(lib_path: str) -> ctypes.CDLL:
     """
     加载Mac系统动态库，支持.dylib和.framework两种格式。
 
+    同一真实路径的动态库只加载一次，之后返回缓存的句柄。
+
     Args:
         lib_path: 动态库路径，可以是.dylib文件路径或.framework目录路径
 
@@ -153,7 +176,7 @@ def load_mac_library(lib_path: str) -> ctypes.CDLL:
                     f"For Mac system security, you may need to manually open the framework "
                     f"binary file in Finder to add it to the system trust list."
                 )
-            return ctypes.CDLL(internal_path)
+            return _load_cached_library(internal_path)
         except ValueError as e:
             raise OSError(f"Invalid framework path: {e}")
     
@@ -164,7 +187,7 @@ def load_mac_library(lib_path: str) -> ctypes.CDLL:
                 f"Dynamic library not found: {lib_path}\n"
                 f"Please check if the library file exists and the path is correct."
             )
-        return ctypes.CDLL(lib_path)
+        return _load_cached_library(lib_path)
     
     else:
         raise OSError(
@@ -208,6 +231,8 @@ def validate_mac_library(lib_path: str) -> bool:
     """
     验证Mac系统动态库是否有效且可加载。
 
+    加载成功的句柄会被缓存，之后调用load_mac_library不会再次加载。
+
     Args:
         lib_path: 动态库路径
 
@@ -5,9 +5,14 @@
 确保策略运行符合预期，参考Elite版状态监控设计。
 """
 
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, NamedTuple, Sequence, Union
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
+from functools import partial
+from itertools import chain, islice
+from queue import Queue, Empty, Full
+import bisect
+import heapq
 import threading
 import time
 
@@ -15,6 +20,98 @@ from .object import OrderData, TradeData, PositionData, LogData
 from .logger import logger
 
 
+# 每个合约保留的记录数量
+POSITION_HISTORY_SIZE = 1000
+ORDER_HISTORY_SIZE = 100
+TRADE_HISTORY_SIZE = 100
+
+# 记录事件类型
+EVENT_ORDER = 0
+EVENT_TRADE = 1
+EVENT_POSITION = 2
+EVENT_LOG = 3
+EVENT_STATUS = 4
+EVENT_BATCH = 5
+EVENT_SYNC = 6      # 读取方的同步标记，记录为threading.Event
+
+# 读取方等待监控线程处理同步标记、记录方等待队列空位时，检查监控线程是否仍在运行的间隔（秒）
+SYNC_CHECK_INTERVAL = 0.1
+
+# 记录事件队列容量：回调处理慢于记录速度时，记录方阻塞等待而不是无限占用内存
+INGEST_QUEUE_SIZE = 100000
+
+# 直接用tuple.__new__构造记录，跳过NamedTuple逐字段的Python层__new__
+_new_record = tuple.__new__
+
+# 没有状态变化时，监控线程兜底检查策略状态的间隔（秒）
+STATUS_CHECK_INTERVAL = 5.0
+
+# 批量日志回调：攒够条数或超过间隔（秒）时触发一次
+LOG_BATCH_SIZE = 64
+LOG_FLUSH_INTERVAL = 0.1
+
+class OrderRecord(NamedTuple):
+    """订单记录"""
+    datetime: Union[datetime, float]    # 订单自带时间，或记录时的时间戳
+    vt_orderid: str
+    direction: Any
+    offset: Any
+    price: float
+    volume: float
+    traded: float
+    status: Any
+
+
+class TradeRecord(NamedTuple):
+    """成交记录"""
+    datetime: Union[datetime, float]
+    vt_tradeid: str
+    direction: Any
+    offset: Any
+    price: float
+    volume: float
+
+
+class PositionRecord(NamedTuple):
+    """持仓变动记录"""
+    datetime: Union[datetime, float]
+    volume: float
+    direction: Any
+    frozen: float
+    price: float
+    pnl: float
+
+
+class LogRecord(NamedTuple):
+    """日志记录"""
+    datetime: float
+    gateway_name: str
+    msg: str
+
+
+def _timestamp(value) -> float:
+    """记录时间转换为时间戳（记录时间为数据自带的datetime或入队时的时间戳）"""
+    if isinstance(value, float):
+        return value
+    return value.timestamp()
+
+
+def _record_timestamp(record) -> float:
+    """记录的时间戳，用作排序键"""
+    return _timestamp(record.datetime)
+
+
+def _to_dicts(records) -> List[Dict]:
+    """将记录转换为字典列表，时间戳在这里才转换为datetime"""
+    result = []
+    for record in records:
+        item = record._asdict()
+        if isinstance(record.datetime, float):
+            item['datetime'] = datetime.fromtimestamp(record.datetime)
+        result.append(item)
+    return result
+
+
 class StatusMonitor:
     """
     实时状态监控器
@@ -35,23 +132,42 @@ class StatusMonitor:
         self.strategy_status: Dict[str, Dict[str, Any]] = defaultdict(dict)
         
         # 持仓变动监控 {vt_symbol: position_history}
-        self.position_history: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
+        self.position_history: Dict[str, deque] = defaultdict(partial(deque, maxlen=POSITION_HISTORY_SIZE))
+        
+        # 持仓记录时间不是按顺序递增的合约（无法二分查找时间范围）
+        self.unordered_positions: set = set()
         
         # 运行日志监控（最近N条）
         self.recent_logs: deque = deque(maxlen=1000)
         
         # 订单监控 {vt_symbol: order_list}
-        self.recent_orders: Dict[str, deque] = defaultdict(lambda: deque(maxlen=100))
+        self.recent_orders: Dict[str, deque] = defaultdict(partial(deque, maxlen=ORDER_HISTORY_SIZE))
         
         # 成交监控 {vt_symbol: trade_list}
-        self.recent_trades: Dict[str, deque] = defaultdict(lambda: deque(maxlen=100))
+        self.recent_trades: Dict[str, deque] = defaultdict(partial(deque, maxlen=TRADE_HISTORY_SIZE))
+        
+        # 记录事件队列：record_*只入队，由监控线程（或读取方）取出后在_drain_lock内更新记录；
+        # 队列有容量上限，监控线程处理不过来时记录方等待
+        self._ingest: Queue = Queue(maxsize=INGEST_QUEUE_SIZE)
+        self._drain_lock = threading.RLock()
+        self._status_changed: bool = False
         
-        # 监控回调函数
+        # 按合约缓存的记录队列append方法（持仓缓存队列本身），首次记录时取得
+        self._order_appenders: Dict[str, Callable] = {}
+        self._trade_appenders: Dict[str, Callable] = {}
+        self._position_histories: Dict[str, deque] = {}
+        
+        # 监控回调函数（注册时整体替换列表，触发时无需加锁）
         self.status_callbacks: List[Callable] = []
         self.position_callbacks: List[Callable] = []
         self.log_callbacks: List[Callable] = []
+        self.log_batch_callbacks: List[Callable] = []
+        
+        # 等待批量日志回调的日志
+        self._log_batch: List[LogData] = []
+        self._log_flush_at: float = 0.0
         
-        # 线程锁
+        # 线程锁，保护策略状态和回调注册
         self.lock = threading.RLock()
         
         # 监控状态
@@ -74,25 +190,246 @@ class StatusMonitor:
         """停止实时监控"""
         self.monitoring = False
         if self.monitor_thread and self.monitor_thread.is_alive():
+            # 唤醒监控线程（队列已满时监控线程不会阻塞在取事件上，无需唤醒）
+            try:
+                self._ingest.put_nowait(None)
+            except Full:
+                pass
             self.monitor_thread.join(timeout=2.0)
+        
+        # 处理停止前尚未取出的记录
+        self._sync()
         logger.info("实时状态监控已停止")
     
     def _monitor_loop(self) -> None:
-        """监控循环"""
+        """
+        监控循环
+        
+        阻塞等待记录事件；策略状态变化时立即触发状态回调，
+        长时间没有变化时按STATUS_CHECK_INTERVAL兜底检查一次。
+        """
+        next_check = time.monotonic() + STATUS_CHECK_INTERVAL
         while self.monitoring:
             try:
-                # 定期检查策略状态
-                self._check_strategy_status()
+                deadline = next_check
+                if self._log_batch:
+                    deadline = min(deadline, self._log_flush_at)
+                
+                try:
+                    event = self._ingest.get(timeout=max(deadline - time.monotonic(), 0))
+                except Empty:
+                    event = None
                 
-                # 触发状态回调
-                self._trigger_status_callbacks()
+                pending = []
+                with self._drain_lock:
+                    if event is not None:
+                        self._dispatch(event, pending)
+                        self._drain(pending)
+                    if self._log_batch and time.monotonic() >= self._log_flush_at:
+                        self._flush_log_batch(pending)
+                if pending:
+                    self._run_callbacks(pending)
                 
-                time.sleep(1.0)  # 每秒检查一次
+                now = time.monotonic()
+                if self._status_changed or now >= next_check:
+                    self._status_changed = False
+                    
+                    # 检查策略状态
+                    self._check_strategy_status()
+                    
+                    # 触发状态回调
+                    self._trigger_status_callbacks()
+                    
+                    next_check = now + STATUS_CHECK_INTERVAL
                 
             except Exception as e:
                 logger.error(f"监控循环异常: {e}")
                 time.sleep(1.0)
     
+    def _put(self, event: tuple) -> bool:
+        """
+        事件入队，队列已满时等待监控线程取出事件
+        
+        监控线程在回调中记录时不能等待自己，队列已满时返回False；
+        等待期间监控线程退出时同样返回False。
+        
+        Returns:
+            bool: 是否已入队，未入队时由调用方当场处理
+        """
+        thread = self.monitor_thread
+        if thread is threading.current_thread():
+            try:
+                self._ingest.put_nowait(event)
+                return True
+            except Full:
+                return False
+        
+        while True:
+            try:
+                self._ingest.put(event, timeout=SYNC_CHECK_INTERVAL)
+                return True
+            except Full:
+                if not (thread and thread.is_alive()):
+                    return False
+    
+    def _submit(self, event: tuple) -> None:
+        """
+        提交记录事件
+        
+        监控线程运行时只入队；未启动监控、或监控线程自身在队列已满时记录，
+        当场处理（先处理队列中的遗留事件，保持事件顺序），保证回调照常触发。
+        """
+        if self.monitoring and self._put(event):
+            return
+        
+        # 先处理队列中的遗留事件，再直接处理本事件，省去一次入队出队
+        pending = []
+        with self._drain_lock:
+            self._drain(pending)
+            self._dispatch(event, pending)
+            self._flush_log_batch(pending)
+        if pending:
+            self._run_callbacks(pending)
+    
+    def _sync(self) -> None:
+        """
+        使此前提交的记录事件全部生效
+        
+        监控线程运行时只由监控线程按提交顺序处理事件：放入同步标记并等待监控线程处理到该标记，
+        读取方不会越过监控线程已取出、尚未处理的事件，回调也只在监控线程中执行。
+        监控线程未运行或在监控线程（回调）中调用时，直接处理队列中的事件并在释放锁后执行回调。
+        """
+        thread = self.monitor_thread
+        if thread and thread is not threading.current_thread() and thread.is_alive():
+            done = threading.Event()
+            
+            # 监控线程停止时不再处理同步标记，改为当前线程处理
+            if self._put((EVENT_SYNC, None, done, None)):
+                while thread.is_alive():
+                    if done.wait(SYNC_CHECK_INTERVAL):
+                        return
+        
+        pending = []
+        with self._drain_lock:
+            self._drain(pending)
+            self._flush_log_batch(pending)
+        if pending:
+            self._run_callbacks(pending)
+    
+    def _drain(self, pending: list) -> None:
+        """取出并处理队列中的所有记录事件（调用方需持有_drain_lock）"""
+        empty = self._ingest.empty
+        get = self._ingest.get_nowait
+        while not empty():
+            # 监控线程可能在检查后抢先取走事件
+            try:
+                event = get()
+            except Empty:
+                return
+            if event is not None:
+                self._dispatch(event, pending)
+    
+    def _dispatch(self, event: tuple, pending: list) -> None:
+        """
+        处理单个记录事件（调用方需持有_drain_lock）
+        
+        需要触发的回调放入pending，由调用方释放锁后执行，
+        避免耗时的用户回调阻塞记录处理和查询。
+        
+        Args:
+            event: (事件类型, 合约代码, 记录, 原始数据)，批量事件的记录为子事件列表
+            pending: 待执行的回调列表
+        """
+        kind, vt_symbol, record, data = event
+        
+        if kind == EVENT_BATCH:
+            for sub_event in record:
+                self._dispatch(sub_event, pending)
+            return
+        
+        if kind == EVENT_SYNC:
+            record.set()
+            return
+        
+        if kind == EVENT_STATUS:
+            self._status_changed = True
+            return
+        
+        if kind == EVENT_LOG:
+            self.recent_logs.append(record)
+            if self.log_callbacks:
+                pending.append((EVENT_LOG, self.log_callbacks, (data,)))
+            if self.log_batch_callbacks:
+                if not self._log_batch:
+                    self._log_flush_at = time.monotonic() + LOG_FLUSH_INTERVAL
+                self._log_batch.append(data)
+                if len(self._log_batch) >= LOG_BATCH_SIZE:
+                    self._flush_log_batch(pending)
+            return
+        
+        if kind == EVENT_ORDER:
+            append = self._order_appenders.get(vt_symbol)
+            if append is None:
+                append = self.recent_orders[vt_symbol].append
+                self._order_appenders[vt_symbol] = append
+            append(record)
+        elif kind == EVENT_TRADE:
+            append = self._trade_appenders.get(vt_symbol)
+            if append is None:
+                append = self.recent_trades[vt_symbol].append
+                self._trade_appenders[vt_symbol] = append
+            append(record)
+        else:
+            history = self._position_histories.get(vt_symbol)
+            if history is None:
+                history = self.position_history[vt_symbol]
+                self._position_histories[vt_symbol] = history
+            if history and _record_timestamp(record) < _record_timestamp(history[-1]):
+                self.unordered_positions.add(vt_symbol)
+            history.append(record)
+            if self.position_callbacks:
+                pending.append((EVENT_POSITION, self.position_callbacks, (vt_symbol, data)))
+    
+    def _flush_log_batch(self, pending: list) -> None:
+        """取出攒下的日志，放入pending由批量日志回调一次处理（调用方需持有_drain_lock）"""
+        if not self._log_batch:
+            return
+        
+        batch, self._log_batch = self._log_batch, []
+        if self.log_batch_callbacks:
+            pending.append((EVENT_LOG, self.log_batch_callbacks, (batch,)))
+    
+    def _run_callbacks(self, pending: list) -> None:
+        """
+        执行记录事件触发的回调（不持有锁）
+        
+        回调列表在注册时整体替换，这里使用的是事件处理时的快照。
+        """
+        for kind, callbacks, args in pending:
+            for callback in callbacks:
+                try:
+                    callback(*args)
+                except Exception as e:
+                    if kind == EVENT_LOG:
+                        logger.error(f"执行日志回调失败: {e}")
+                    else:
+                        logger.error(f"执行持仓变动回调失败: {e}")
+    
+    def register_symbols(self, vt_symbols: List[str]) -> None:
+        """
+        预先为合约创建记录队列
+        
+        启动时注册要交易的合约，避免运行中首次记录时再创建。
+        
+        Args:
+            vt_symbols: 合约代码列表
+        """
+        with self._drain_lock:
+            for vt_symbol in vt_symbols:
+                self.position_history[vt_symbol]
+                self.recent_orders[vt_symbol]
+                self.recent_trades[vt_symbol]
+    
     def _check_strategy_status(self) -> None:
         """检查策略状态"""
         # 这里可以检查策略是否正常运行
@@ -120,7 +457,12 @@ class StatusMonitor:
                 'details': details or {}
             }
             
-            logger.debug(f"策略 {strategy_name} 状态更新: {status}")
+            # loguru的参数式格式化在级别被过滤时不会格式化消息
+            logger.debug("策略 {} 状态更新: {}", strategy_name, status)
+        
+        # 唤醒监控线程触发状态回调（未能入队时由监控线程下次循环处理）
+        if self.monitoring and not self._put((EVENT_STATUS, None, None, None)):
+            self._status_changed = True
     
     def record_position_change(
         self,
@@ -134,22 +476,15 @@ class StatusMonitor:
             vt_symbol: 合约代码
             position: 持仓数据
         """
-        with self.lock:
-            self.position_history[vt_symbol].append({
-                'datetime': position.datetime or datetime.now(),
-                'volume': position.volume,
-                'direction': position.direction,
-                'frozen': position.frozen,
-                'price': position.price,
-                'pnl': position.pnl
-            })
-            
-            # 触发持仓变动回调
-            for callback in self.position_callbacks:
-                try:
-                    callback(vt_symbol, position)
-                except Exception as e:
-                    logger.error(f"执行持仓变动回调失败: {e}")
+        record = _new_record(PositionRecord, (
+            position.datetime or time.time(),
+            position.volume,
+            position.direction,
+            position.frozen,
+            position.price,
+            position.pnl
+        ))
+        self._submit((EVENT_POSITION, vt_symbol, record, position))
     
     def record_order(self, order: OrderData) -> None:
         """
@@ -158,18 +493,17 @@ class StatusMonitor:
         Args:
             order: 订单数据
         """
-        with self.lock:
-            vt_symbol = order.vt_symbol
-            self.recent_orders[vt_symbol].append({
-                'datetime': order.datetime or datetime.now(),
-                'vt_orderid': order.vt_orderid,
-                'direction': order.direction,
-                'offset': order.offset,
-                'price': order.price,
-                'volume': order.volume,
-                'traded': order.traded,
-                'status': order.status
-            })
+        record = _new_record(OrderRecord, (
+            order.datetime or time.time(),
+            order.vt_orderid,
+            order.direction,
+            order.offset,
+            order.price,
+            order.volume,
+            order.traded,
+            order.status
+        ))
+        self._submit((EVENT_ORDER, order.vt_symbol, record, None))
     
     def record_trade(self, trade: TradeData) -> None:
         """
@@ -178,16 +512,79 @@ class StatusMonitor:
         Args:
             trade: 成交数据
         """
-        with self.lock:
-            vt_symbol = trade.vt_symbol
-            self.recent_trades[vt_symbol].append({
-                'datetime': trade.datetime or datetime.now(),
-                'vt_tradeid': trade.vt_tradeid,
-                'direction': trade.direction,
-                'offset': trade.offset,
-                'price': trade.price,
-                'volume': trade.volume
-            })
+        record = _new_record(TradeRecord, (
+            trade.datetime or time.time(),
+            trade.vt_tradeid,
+            trade.direction,
+            trade.offset,
+            trade.price,
+            trade.volume
+        ))
+        self._submit((EVENT_TRADE, trade.vt_symbol, record, None))
+    
+    def record_orders(self, orders: Sequence[OrderData]) -> None:
+        """
+        批量记录订单
+        
+        整批订单作为一个事件入队，集中回报时只需一次入队和一次加锁处理。
+        
+        Args:
+            orders: 订单数据列表
+        """
+        if not orders:
+            return
+        
+        now = time.time()
+        events = [
+            (
+                EVENT_ORDER,
+                order.vt_symbol,
+                _new_record(OrderRecord, (
+                    order.datetime or now,
+                    order.vt_orderid,
+                    order.direction,
+                    order.offset,
+                    order.price,
+                    order.volume,
+                    order.traded,
+                    order.status
+                )),
+                None
+            )
+            for order in orders
+        ]
+        self._submit((EVENT_BATCH, None, events, None))
+    
+    def record_trades(self, trades: Sequence[TradeData]) -> None:
+        """
+        批量记录成交
+        
+        整批成交作为一个事件入队，集中回报时只需一次入队和一次加锁处理。
+        
+        Args:
+            trades: 成交数据列表
+        """
+        if not trades:
+            return
+        
+        now = time.time()
+        events = [
+            (
+                EVENT_TRADE,
+                trade.vt_symbol,
+                _new_record(TradeRecord, (
+                    trade.datetime or now,
+                    trade.vt_tradeid,
+                    trade.direction,
+                    trade.offset,
+                    trade.price,
+                    trade.volume
+                )),
+                None
+            )
+            for trade in trades
+        ]
+        self._submit((EVENT_BATCH, None, events, None))
     
     def record_log(self, log: LogData) -> None:
         """
@@ -196,19 +593,8 @@ class StatusMonitor:
         Args:
             log: 日志数据
         """
-        with self.lock:
-            self.recent_logs.append({
-                'datetime': datetime.now(),
-                'gateway_name': log.gateway_name,
-                'msg': log.msg
-            })
-            
-            # 触发日志回调
-            for callback in self.log_callbacks:
-                try:
-                    callback(log)
-                except Exception as e:
-                    logger.error(f"执行日志回调失败: {e}")
+        record = _new_record(LogRecord, (time.time(), log.gateway_name, log.msg))
+        self._submit((EVENT_LOG, None, record, log))
     
     def get_strategy_status(self, strategy_name: Optional[str] = None) -> Dict:
         """
@@ -243,16 +629,29 @@ class StatusMonitor:
         Returns:
             List[Dict]: 持仓变动历史列表
         """
-        with self.lock:
+        self._sync()
+        with self._drain_lock:
             history = list(self.position_history.get(vt_symbol, []))
-            
-            # 时间过滤
+            ordered = vt_symbol not in self.unordered_positions
+        
+        # 时间过滤：记录按时间递增时二分查找范围，否则逐条比较
+        if ordered:
+            lo = 0
+            hi = len(history)
             if start_time:
-                history = [h for h in history if h['datetime'] >= start_time]
+                lo = bisect.bisect_left(history, start_time.timestamp(), key=_record_timestamp)
             if end_time:
-                history = [h for h in history if h['datetime'] <= end_time]
-            
-            return history
+                hi = bisect.bisect_right(history, end_time.timestamp(), lo=lo, key=_record_timestamp)
+            history = history[lo:hi]
+        else:
+            if start_time:
+                start_ts = start_time.timestamp()
+                history = [h for h in history if _record_timestamp(h) >= start_ts]
+            if end_time:
+                end_ts = end_time.timestamp()
+                history = [h for h in history if _record_timestamp(h) <= end_ts]
+        
+        return _to_dicts(history)
     
     def get_recent_orders(
         self,
@@ -269,18 +668,19 @@ class StatusMonitor:
         Returns:
             List[Dict]: 订单列表
         """
-        with self.lock:
+        self._sync()
+        with self._drain_lock:
             if vt_symbol:
-                orders = list(self.recent_orders.get(vt_symbol, []))
+                orders = list(self.recent_orders.get(vt_symbol, []))[:limit]
             else:
-                # 合并所有合约的订单
-                orders = []
-                for symbol_orders in self.recent_orders.values():
-                    orders.extend(symbol_orders)
-                # 按时间排序
-                orders.sort(key=lambda x: x['datetime'], reverse=True)
-            
-            return orders[:limit]
+                # 合并所有合约的订单，只取时间最新的limit条，不对全部记录排序
+                orders = heapq.nlargest(
+                    limit,
+                    chain.from_iterable(self.recent_orders.values()),
+                    key=_record_timestamp
+                )
+        
+        return _to_dicts(orders)
     
     def get_recent_trades(
         self,
@@ -297,18 +697,19 @@ class StatusMonitor:
         Returns:
             List[Dict]: 成交列表
         """
-        with self.lock:
+        self._sync()
+        with self._drain_lock:
             if vt_symbol:
-                trades = list(self.recent_trades.get(vt_symbol, []))
+                trades = list(self.recent_trades.get(vt_symbol, []))[:limit]
             else:
-                # 合并所有合约的成交
-                trades = []
-                for symbol_trades in self.recent_trades.values():
-                    trades.extend(symbol_trades)
-                # 按时间排序
-                trades.sort(key=lambda x: x['datetime'], reverse=True)
-            
-            return trades[:limit]
+                # 合并所有合约的成交，只取时间最新的limit条，不对全部记录排序
+                trades = heapq.nlargest(
+                    limit,
+                    chain.from_iterable(self.recent_trades.values()),
+                    key=_record_timestamp
+                )
+        
+        return _to_dicts(trades)
     
     def get_recent_logs(self, limit: int = 100) -> List[Dict]:
         """
@@ -320,8 +721,16 @@ class StatusMonitor:
         Returns:
             List[Dict]: 日志列表
         """
-        with self.lock:
-            return list(self.recent_logs)[-limit:]
+        self._sync()
+        with self._drain_lock:
+            if limit > 0:
+                # 只从尾部取limit条，避免复制整个日志队列
+                logs = list(islice(reversed(self.recent_logs), limit))
+                logs.reverse()
+            else:
+                logs = list(self.recent_logs)[-limit:]
+        
+        return _to_dicts(logs)
     
     def register_status_callback(self, callback: Callable) -> None:
         """
@@ -332,7 +741,7 @@ class StatusMonitor:
         """
         with self.lock:
             if callback not in self.status_callbacks:
-                self.status_callbacks.append(callback)
+                self.status_callbacks = self.status_callbacks + [callback]
                 logger.debug("注册状态监控回调")
     
     def register_position_callback(self, callback: Callable) -> None:
@@ -344,38 +753,46 @@ class StatusMonitor:
         """
         with self.lock:
             if callback not in self.position_callbacks:
-                self.position_callbacks.append(callback)
+                self.position_callbacks = self.position_callbacks + [callback]
                 logger.debug("注册持仓变动回调")
     
-    def register_log_callback(self, callback: Callable) -> None:
+    def register_log_callback(self, callback: Callable, wants_batch: bool = False) -> None:
         """
         注册日志回调函数
         
         Args:
             callback: 回调函数，接收LogData参数
+            wants_batch: 为True时回调接收List[LogData]，日志密集时按批触发，
+                         每LOG_BATCH_SIZE条或LOG_FLUSH_INTERVAL秒调用一次
         """
         with self.lock:
-            if callback not in self.log_callbacks:
-                self.log_callbacks.append(callback)
+            if wants_batch:
+                if callback not in self.log_batch_callbacks:
+                    self.log_batch_callbacks = self.log_batch_callbacks + [callback]
+                    logger.debug("注册批量日志回调")
+            elif callback not in self.log_callbacks:
+                self.log_callbacks = self.log_callbacks + [callback]
                 logger.debug("注册日志回调")
     
     def unregister_status_callback(self, callback: Callable) -> None:
         """取消注册状态监控回调"""
         with self.lock:
             if callback in self.status_callbacks:
-                self.status_callbacks.remove(callback)
+                self.status_callbacks = [c for c in self.status_callbacks if c is not callback]
     
     def unregister_position_callback(self, callback: Callable) -> None:
         """取消注册持仓变动回调"""
         with self.lock:
             if callback in self.position_callbacks:
-                self.position_callbacks.remove(callback)
+                self.position_callbacks = [c for c in self.position_callbacks if c is not callback]
     
     def unregister_log_callback(self, callback: Callable) -> None:
         """取消注册日志回调"""
         with self.lock:
             if callback in self.log_callbacks:
-                self.log_callbacks.remove(callback)
+                self.log_callbacks = [c for c in self.log_callbacks if c is not callback]
+            if callback in self.log_batch_callbacks:
+                self.log_batch_callbacks = [c for c in self.log_batch_callbacks if c is not callback]
     
     def _trigger_status_callbacks(self) -> None:
         """触发状态监控回调"""
@@ -393,18 +810,25 @@ class StatusMonitor:
         Returns:
             Dict: 监控摘要字典
         """
+        self._sync()
+        with self._drain_lock:
+            symbol_count = len(self.position_history)
+            total_orders = sum(len(orders) for orders in self.recent_orders.values())
+            total_trades = sum(len(trades) for trades in self.recent_trades.values())
+            total_logs = len(self.recent_logs)
+        
         with self.lock:
             summary = {
                 'monitoring': self.monitoring,
                 'strategy_count': len(self.strategy_status),
-                'symbol_count': len(self.position_history),
-                'total_orders': sum(len(orders) for orders in self.recent_orders.values()),
-                'total_trades': sum(len(trades) for trades in self.recent_trades.values()),
-                'total_logs': len(self.recent_logs),
+                'symbol_count': symbol_count,
+                'total_orders': total_orders,
+                'total_trades': total_trades,
+                'total_logs': total_logs,
                 'callback_count': {
                     'status': len(self.status_callbacks),
                     'position': len(self.position_callbacks),
-                    'log': len(self.log_callbacks)
+                    'log': len(self.log_callbacks) + len(self.log_batch_callbacks)
                 }
             }
             
@@ -417,18 +841,29 @@ class StatusMonitor:
         Args:
             vt_symbol: 合约代码（None表示所有合约）
         """
-        with self.lock:
+        self._sync()
+        with self._drain_lock:
             if vt_symbol:
                 if vt_symbol in self.position_history:
                     self.position_history[vt_symbol].clear()
+                    self.unordered_positions.discard(vt_symbol)
                 if vt_symbol in self.recent_orders:
                     self.recent_orders[vt_symbol].clear()
                 if vt_symbol in self.recent_trades:
                     self.recent_trades[vt_symbol].clear()
-                logger.info(f"清除 {vt_symbol} 的历史记录")
             else:
                 self.position_history.clear()
+                self.unordered_positions.clear()
                 self.recent_orders.clear()
                 self.recent_trades.clear()
                 self.recent_logs.clear()
-                logger.info("清除所有历史记录")
+                
+                # 记录队列已移除，缓存的append方法随之失效
+                self._order_appenders.clear()
+                self._trade_appenders.clear()
+                self._position_histories.clear()
+        
+        if vt_symbol:
+            logger.info(f"清除 {vt_symbol} 的历史记录")
+        else:
+            logger.info("清除所有历史记录")
@@ -7,7 +7,11 @@ VNPY Mac应用启动器 - 带错误捕获和日志输出
 
 import sys
 import os
+import json
+import importlib
+import site
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import logging
 
@@ -28,6 +32,172 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# 可选应用模块：(模块名, 应用类名, 显示名称)
+OPTIONAL_APPS = [
+    ("vnpy_ctastrategy", "CtaStrategyApp", "CTA策略模块"),
+    ("vnpy_ctabacktester", "CtaBacktesterApp", "CTA回测模块"),
+    ("vnpy_datamanager", "DataManagerApp", "数据管理模块"),
+]
+
+# 已安装可选模块清单，可执行文件和site-packages目录都未变化时跳过对未安装模块的导入探测
+app_manifest_file = Path.home() / ".vntrader" / "apps.json"
+
+
+def get_executable_mtime():
+    """获取可执行文件的修改时间，用于判断安装内容是否变化"""
+    try:
+        return os.stat(sys.executable).st_mtime
+    except OSError:
+        return None
+
+
+def get_site_packages_mtimes():
+    """
+    获取site-packages目录的修改时间
+    
+    pip安装、升级或卸载包时会在site-packages下增删目录，目录修改时间随之变化。
+    
+    Returns:
+        {目录: 修改时间}，不存在的目录不包含在内
+    """
+    paths = list(site.getsitepackages())
+    if site.ENABLE_USER_SITE:
+        paths.append(site.getusersitepackages())
+    
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime
+        except OSError:
+            pass
+    return mtimes
+
+
+def load_app_manifest():
+    """
+    读取已安装可选模块清单
+    
+    Returns:
+        已安装模块名集合；清单不存在、可执行文件或site-packages目录已变化时返回None
+    """
+    try:
+        with open(app_manifest_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if manifest.get("executable") != sys.executable:
+        return None
+    if manifest.get("executable_mtime") != get_executable_mtime():
+        return None
+    if manifest.get("site_packages_mtimes") != get_site_packages_mtimes():
+        return None
+    return set(manifest.get("installed", []))
+
+
+def save_app_manifest(installed):
+    """保存已安装可选模块清单"""
+    try:
+        with open(app_manifest_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                "executable": sys.executable,
+                "executable_mtime": get_executable_mtime(),
+                "site_packages_mtimes": get_site_packages_mtimes(),
+                "installed": sorted(installed),
+            }, f, ensure_ascii=False)
+    except OSError as e:
+        logger.warning(f"⚠️  保存模块清单失败: {e}")
+
+
+def invalidate_app_manifest():
+    """删除模块清单，下次启动重新探测"""
+    try:
+        app_manifest_file.unlink()
+    except OSError:
+        pass
+
+
+def import_optional(module_name):
+    """
+    导入可选模块
+    
+    Returns:
+        (模块, 异常)，导入成功时异常为None
+    """
+    try:
+        return importlib.import_module(module_name), None
+    except Exception as e:
+        return None, e
+
+
+def start_optional_imports():
+    """
+    在后台线程池中开始导入可选模块，不等待导入完成
+    
+    有有效清单时只导入清单中已安装的模块，未安装的模块不再逐个探测；
+    否则尝试导入全部模块。
+    
+    Returns:
+        (是否探测了全部模块, {模块名: Future})
+    """
+    cached = load_app_manifest()
+    probe_all = cached is None
+    
+    names = [
+        module_name for module_name, _, _ in OPTIONAL_APPS
+        if probe_all or module_name in cached
+    ]
+    futures = {}
+    if names:
+        executor = ThreadPoolExecutor(max_workers=len(names))
+        futures = {name: executor.submit(import_optional, name) for name in names}
+        executor.shutdown(wait=False)
+    return probe_all, futures
+
+
+def load_optional_apps(main_engine, imports=None):
+    """
+    加载可选应用模块
+    
+    各模块在线程池中并行导入，重叠文件读取和扩展模块初始化，再按顺序添加到主引擎。
+    探测了全部模块时在结束后写入清单。
+    
+    Args:
+        main_engine: 主引擎
+        imports: start_optional_imports()的返回值，为None时在这里开始导入
+    """
+    if imports is None:
+        imports = start_optional_imports()
+    probe_all, futures = imports
+    installed = set()
+    
+    results = {name: future.result() for name, future in futures.items()}
+    
+    for module_name, class_name, label in OPTIONAL_APPS:
+        if module_name not in results:
+            logger.info(f"ℹ️  {label}未安装（可选）")
+            continue
+        
+        module, error = results[module_name]
+        if isinstance(error, ImportError):
+            logger.info(f"ℹ️  {label}未安装（可选）")
+            if not probe_all:
+                # 清单已过期，下次启动重新探测
+                invalidate_app_manifest()
+            continue
+        
+        installed.add(module_name)
+        try:
+            if error:
+                raise error
+            main_engine.add_app(getattr(module, class_name))
+            logger.info(f"✅ {label}已加载")
+        except Exception as e:
+            logger.warning(f"⚠️  {label}加载失败: {e}")
+    
+    if probe_all:
+        save_app_manifest(installed)
+
 def show_error_dialog(message):
     """显示错误对话框（Mac）"""
     try:
@@ -44,22 +214,7 @@ def show_error_dialog(message):
 def main():
     """主启动函数"""
     try:
-        # 立即写入日志，确保即使后续失败也能看到
-        log_dir = Path.home() / ".vntrader" / "logs"
-        log_dir.mkdir(parents=True, exist_ok=True)
-        log_file = log_dir / "vnpy_startup.log"
-        
-        # 写入启动信息到文件（即使logging还没配置好）
-        with open(log_file, 'a', encoding='utf-8') as f:
-            f.write(f"\n{'='*60}\n")
-            f.write(f"启动时间: {__import__('datetime').datetime.now()}\n")
-            f.write(f"Python版本: {sys.version}\n")
-            f.write(f"可执行文件: {sys.executable}\n")
-            f.write(f"工作目录: {os.getcwd()}\n")
-            f.write(f"脚本路径: {__file__}\n")
-            f.write(f"Frozen: {getattr(sys, 'frozen', False)}\n")
-            f.write(f"{'='*60}\n")
-        
+        # 日志目录和文件处理器已在模块加载时配置，启动信息直接写入日志
         logger.info("=" * 60)
         logger.info("VNPY Mac量化系统启动")
         logger.info("=" * 60)
@@ -102,7 +257,7 @@ def main():
         try:
             from vnpy.event import EventEngine
             from vnpy.trader.engine import MainEngine
-            from vnpy.trader.ui import MainWindow, create_qapp
+            from vnpy.trader.ui import MainWindow, QtWidgets, create_qapp
             logger.info("✅ VNPY核心模块已导入")
         except ImportError as e:
             error_msg = f"VNPY模块导入失败: {e}\n请检查VNPY是否正确安装。"
@@ -115,6 +270,13 @@ def main():
         logger.info("正在创建Qt应用...")
         qapp = create_qapp("VNPY Mac量化系统")
         
+        # 显示启动画面，可选模块在后台导入，与引擎创建重叠
+        splash = QtWidgets.QSplashScreen()
+        splash.showMessage("正在加载VNPY...")
+        splash.show()
+        qapp.processEvents()
+        imports = start_optional_imports()
+        
         # 创建事件引擎
         logger.info("正在创建事件引擎...")
         event_engine = EventEngine()
@@ -124,37 +286,13 @@ def main():
         main_engine = MainEngine(event_engine)
         
         # 尝试加载可选模块
-        try:
-            from vnpy_ctastrategy import CtaStrategyApp
-            main_engine.add_app(CtaStrategyApp)
-            logger.info("✅ CTA策略模块已加载")
-        except ImportError:
-            logger.info("ℹ️  CTA策略模块未安装（可选）")
-        except Exception as e:
-            logger.warning(f"⚠️  CTA策略模块加载失败: {e}")
-        
-        try:
-            from vnpy_ctabacktester import CtaBacktesterApp
-            main_engine.add_app(CtaBacktesterApp)
-            logger.info("✅ CTA回测模块已加载")
-        except ImportError:
-            logger.info("ℹ️  CTA回测模块未安装（可选）")
-        except Exception as e:
-            logger.warning(f"⚠️  CTA回测模块加载失败: {e}")
-        
-        try:
-            from vnpy_datamanager import DataManagerApp
-            main_engine.add_app(DataManagerApp)
-            logger.info("✅ 数据管理模块已加载")
-        except ImportError:
-            logger.info("ℹ️  数据管理模块未安装（可选）")
-        except Exception as e:
-            logger.warning(f"⚠️  数据管理模块加载失败: {e}")
+        load_optional_apps(main_engine, imports)
         
         # 创建主窗口
         logger.info("正在创建主窗口...")
         main_window = MainWindow(main_engine, event_engine)
         main_window.showMaximized()
+        splash.finish(main_window)
         
         logger.info("✅ 系统启动成功！")
         logger.info("=" * 60)
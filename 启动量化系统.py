@@ -17,49 +17,107 @@ VNPY Mac系统A股量化实盘系统 - 启动脚本
 
 import sys
 import os
-import argparse
+import importlib
+import importlib.util
+from functools import lru_cache
 from pathlib import Path
 
 # 添加项目路径
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-def check_dependencies():
-    """检查依赖"""
-    missing = []
-    
-    try:
-        import loguru
-    except ImportError:
-        missing.append("loguru")
+# 启动必需的依赖
+REQUIRED_DEPENDENCIES = ("loguru", "tzlocal")
+
+# UI模式额外需要的依赖
+UI_DEPENDENCIES = ("PySide6",)
+
+# VNPY标准应用（可选安装）：(模块名, 应用类名, 显示名称)
+STANDARD_APPS = [
+    ("vnpy_ctastrategy", "CtaStrategyApp", "CTA策略模块"),
+    ("vnpy_ctabacktester", "CtaBacktesterApp", "CTA回测模块"),
+    ("vnpy_datamanager", "DataManagerApp", "数据管理模块"),
+]
+
+# 增强功能模块（工具类，不需要注册到MainEngine）：(类名, 模块名, 显示名称)
+ENHANCED_FEATURES = [
+    ("ProcessManager", "vnpy.trader.multiprocess_manager", "多进程策略管理器"),
+    ("EnhancedRiskManager", "vnpy.trader.enhanced_risk_manager", "增强风险控制"),
+    ("StatusMonitor", "vnpy.trader.status_monitor", "状态监控"),
+    ("HistoryManager", "vnpy.trader.history_manager", "历史数据管理"),
+    ("DataFilter", "vnpy.trader.data_filter", "数据过滤器"),
+]
+
+@lru_cache(maxsize=None)
+def is_installed(module_name):
+    """
+    判断模块是否已安装
     
+    只查找模块，不执行模块代码（PySide6等模块导入时会加载大量Qt库）。
+    """
     try:
-        import PySide6
-    except ImportError:
-        missing.append("PySide6")
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+def check_dependencies(needs_ui=True):
+    """
+    检查依赖
     
-    try:
-        import tzlocal
-    except ImportError:
-        missing.append("tzlocal")
+    Args:
+        needs_ui: 是否检查UI模式需要的依赖（无UI模式不需要PySide6）
+    """
+    names = REQUIRED_DEPENDENCIES + UI_DEPENDENCIES if needs_ui else REQUIRED_DEPENDENCIES
+    missing = [name for name in names if not is_installed(name)]
     
     if missing:
-        print("⚠️  缺少以下依赖:")
-        for dep in missing:
-            print(f"   - {dep}")
-        print("\n安装命令:")
-        print(f"   pip install {' '.join(missing)}")
+        print(
+            "⚠️  缺少以下依赖:\n"
+            + "".join(f"   - {dep}\n" for dep in missing)
+            + f"\n安装命令:\n   pip install {' '.join(missing)}"
+        )
         return False
     
     return True
 
+def install_uvloop():
+    """
+    安装uvloop事件循环策略（可选，仅Mac系统）
+    
+    需在创建引擎之前调用，之后接口创建的asyncio事件循环都基于libuv。
+    """
+    if not detect_mac_platform()[0] or not is_installed("uvloop"):
+        return False
+    
+    try:
+        import asyncio
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        return True
+    except Exception as e:
+        print(f"⚠️  uvloop安装失败: {e}")
+        return False
+
+@lru_cache(maxsize=1)
+def detect_mac_platform():
+    """
+    检测Mac系统和架构（只检测一次）
+    
+    Returns:
+        (是否Mac系统, 架构)，非Mac系统时架构为None
+    """
+    from vnpy.trader.platform_utils import is_mac_system, get_mac_arch
+    
+    if is_mac_system():
+        return True, get_mac_arch()
+    return False, None
+
 def check_mac_adaptation():
     """检查Mac适配"""
     try:
-        from vnpy.trader.platform_utils import is_mac_system, get_mac_arch
+        is_mac, arch = detect_mac_platform()
         
-        if is_mac_system():
-            arch = get_mac_arch()
+        if is_mac:
             print(f"✅ Mac系统检测: {arch}架构")
             return True
         else:
@@ -69,6 +127,80 @@ def check_mac_adaptation():
         print(f"⚠️  Mac适配检查失败: {e}")
         return False
 
+def load_standard_apps(main_engine, info=print, warning=print):
+    """
+    加载VNPY标准应用
+    
+    先用find_spec判断模块是否安装，未安装的模块不执行导入，
+    也就不会产生ImportError异常。
+    
+    Args:
+        main_engine: 主引擎
+        info: 输出提示信息的函数
+        warning: 输出警告信息的函数
+    """
+    for module_name, class_name, label in STANDARD_APPS:
+        if not is_installed(module_name):
+            info(f"ℹ️  {label}未安装（可选）")
+            continue
+        
+        try:
+            module = importlib.import_module(module_name)
+            main_engine.add_app(getattr(module, class_name))
+            info(f"✅ {label}已加载")
+        except ImportError:
+            info(f"ℹ️  {label}未安装（可选）")
+        except Exception as e:
+            warning(f"⚠️  {label}加载失败: {e}")
+
+def load_enhanced_features(info=print, warning=print):
+    """
+    加载并初始化增强功能模块
+    
+    逐个模块先用find_spec检查再导入，单个模块失败不影响其他模块，
+    并分别报告失败原因。
+    
+    Returns:
+        {类名: 实例}，只包含加载成功的模块
+    """
+    features = {}
+    loaded = []
+    for class_name, module_name, label in ENHANCED_FEATURES:
+        if not is_installed(module_name):
+            warning(f"⚠️  {label}模块不存在: {module_name}")
+            continue
+        
+        try:
+            feature_class = getattr(importlib.import_module(module_name), class_name)
+            features[class_name] = feature_class()
+            loaded.append(label)
+        except Exception as e:
+            warning(f"⚠️  {label}加载失败: {e}")
+    
+    if loaded:
+        info("✅ 增强功能模块已加载：\n" + "\n".join(f"   - {label}" for label in loaded))
+    return features
+
+def close_enhanced_features(features, warning=print):
+    """
+    关闭增强功能实例
+    
+    ProcessManager等模块持有共享内存和后台线程，系统退出前需要逐个关闭。
+    
+    Args:
+        features: load_enhanced_features返回的{类名: 实例}
+        warning: 输出警告信息的函数
+    """
+    for class_name, feature in features.items():
+        close = getattr(feature, "close", None)
+        if close is None:
+            continue
+        
+        try:
+            close()
+        except Exception as e:
+            warning(f"⚠️  {class_name}关闭失败: {e}")
+
 def start_ui_mode():
     """启动UI模式"""
     print("=" * 60)
@@ -83,6 +215,9 @@ def start_ui_mode():
         # 检查Mac适配
         check_mac_adaptation()
         
+        # Mac系统上异步接口使用uvloop事件循环（如果已安装）
+        install_uvloop()
+        
         # 创建Qt应用
         qapp = create_qapp("VNPY Mac量化系统")
         
@@ -93,58 +228,10 @@ def start_ui_mode():
         main_engine = MainEngine(event_engine)
         
         # 加载并注册VNPY标准应用（如果可用）
-        try:
-            from vnpy_ctastrategy import CtaStrategyApp
-            main_engine.add_app(CtaStrategyApp)
-            print("✅ CTA策略模块已加载")
-        except ImportError:
-            print("ℹ️  CTA策略模块未安装（可选）")
-        except Exception as e:
-            print(f"⚠️  CTA策略模块加载失败: {e}")
+        load_standard_apps(main_engine)
         
-        try:
-            from vnpy_ctabacktester import CtaBacktesterApp
-            main_engine.add_app(CtaBacktesterApp)
-            print("✅ CTA回测模块已加载")
-        except ImportError:
-            print("ℹ️  CTA回测模块未安装（可选）")
-        except Exception as e:
-            print(f"⚠️  CTA回测模块加载失败: {e}")
-        
-        try:
-            from vnpy_datamanager import DataManagerApp
-            main_engine.add_app(DataManagerApp)
-            print("✅ 数据管理模块已加载")
-        except ImportError:
-            print("ℹ️  数据管理模块未安装（可选）")
-        except Exception as e:
-            print(f"⚠️  数据管理模块加载失败: {e}")
-        
-        # 加载并初始化增强功能模块（我们开发的）
-        try:
-            from vnpy.trader.multiprocess_manager import ProcessManager
-            from vnpy.trader.enhanced_risk_manager import EnhancedRiskManager
-            from vnpy.trader.status_monitor import StatusMonitor
-            from vnpy.trader.history_manager import HistoryManager
-            from vnpy.trader.data_filter import DataFilter
-            
-            # 初始化增强功能（这些是工具类，不需要注册到MainEngine）
-            process_manager = ProcessManager()
-            risk_manager = EnhancedRiskManager()
-            status_monitor = StatusMonitor()
-            history_manager = HistoryManager()
-            data_filter = DataFilter()
-            
-            print("✅ 增强功能模块已加载：")
-            print("   - 多进程策略管理器")
-            print("   - 增强风险控制")
-            print("   - 状态监控")
-            print("   - 历史数据管理")
-            print("   - 数据过滤器")
-        except Exception as e:
-            print(f"⚠️  增强功能模块加载失败: {e}")
-            import traceback
-            traceback.print_exc()
+        # 加载并初始化增强功能模块（我们开发的），系统退出时关闭
+        features = load_enhanced_features()
         
         # 添加Gateway（需要用户安装）
         # 示例：如果有vnpy_xtp或vnpy_tora
@@ -161,6 +248,8 @@ def start_ui_mode():
         # 运行应用
         qapp.exec()
         
+        close_enhanced_features(features)
+        
     except ImportError as e:
         print(f"❌ 导入失败: {e}")
         print("\n请确保已安装VNPY完整依赖:")
@@ -180,6 +269,7 @@ def start_no_ui_mode():
     print("启动VNPY量化交易系统 - 无UI模式（后台运行）")
     print("=" * 60)
     
+    features = {}
     try:
         from vnpy.event import EventEngine
         from vnpy.trader.engine import MainEngine
@@ -188,6 +278,9 @@ def start_no_ui_mode():
         # 检查Mac适配
         check_mac_adaptation()
         
+        # Mac系统上异步接口使用uvloop事件循环（如果已安装）
+        install_uvloop()
+        
         # 创建事件引擎
         event_engine = EventEngine()
         
@@ -195,72 +288,29 @@ def start_no_ui_mode():
         main_engine = MainEngine(event_engine)
         
         # 加载并注册VNPY标准应用（如果可用）
-        try:
-            from vnpy_ctastrategy import CtaStrategyApp
-            main_engine.add_app(CtaStrategyApp)
-            logger.info("✅ CTA策略模块已加载")
-        except ImportError:
-            logger.info("ℹ️  CTA策略模块未安装（可选）")
-        except Exception as e:
-            logger.warning(f"⚠️  CTA策略模块加载失败: {e}")
+        load_standard_apps(main_engine, logger.info, logger.warning)
         
-        try:
-            from vnpy_ctabacktester import CtaBacktesterApp
-            main_engine.add_app(CtaBacktesterApp)
-            logger.info("✅ CTA回测模块已加载")
-        except ImportError:
-            logger.info("ℹ️  CTA回测模块未安装（可选）")
-        except Exception as e:
-            logger.warning(f"⚠️  CTA回测模块加载失败: {e}")
-        
-        try:
-            from vnpy_datamanager import DataManagerApp
-            main_engine.add_app(DataManagerApp)
-            logger.info("✅ 数据管理模块已加载")
-        except ImportError:
-            logger.info("ℹ️  数据管理模块未安装（可选）")
-        except Exception as e:
-            logger.warning(f"⚠️  数据管理模块加载失败: {e}")
-        
-        # 加载并初始化增强功能模块（我们开发的）
-        try:
-            from vnpy.trader.multiprocess_manager import ProcessManager
-            from vnpy.trader.enhanced_risk_manager import EnhancedRiskManager
-            from vnpy.trader.status_monitor import StatusMonitor
-            from vnpy.trader.history_manager import HistoryManager
-            from vnpy.trader.data_filter import DataFilter
-            
-            # 初始化增强功能（这些是工具类，不需要注册到MainEngine）
-            process_manager = ProcessManager()
-            risk_manager = EnhancedRiskManager()
-            status_monitor = StatusMonitor()
-            history_manager = HistoryManager()
-            data_filter = DataFilter()
-            
-            print("✅ 增强功能模块已加载：")
-            print("   - 多进程策略管理器")
-            print("   - 增强风险控制")
-            print("   - 状态监控")
-            print("   - 历史数据管理")
-            print("   - 数据过滤器")
-            logger.info("增强功能模块加载成功")
-        except Exception as e:
-            print(f"⚠️  增强功能模块加载失败: {e}")
-            logger.warning(f"增强功能模块加载失败: {e}")
-            import traceback
-            traceback.print_exc()
+        # 加载并初始化增强功能模块（我们开发的），系统退出时关闭
+        features = load_enhanced_features(logger.info, logger.warning)
         
         print("✅ 系统启动成功（后台运行）")
         print("=" * 60)
         print("按 Ctrl+C 退出")
         
-        # 保持运行
-        import time
-        while True:
-            time.sleep(1)
+        # 保持运行：阻塞到收到信号（Ctrl+C触发KeyboardInterrupt），不再定时唤醒
+        import signal
+        if hasattr(signal, "pause"):
+            while True:
+                signal.pause()
+        else:
+            # Windows没有signal.pause
+            import time
+            while True:
+                time.sleep(1)
             
     except KeyboardInterrupt:
         print("\n正在关闭系统...")
+        close_enhanced_features(features, logger.warning)
         try:
             main_engine.close()
         except:
@@ -278,6 +328,136 @@ def start_no_ui_mode():
         traceback.print_exc()
         return False
 
+# 单个测试脚本的超时时间（秒）
+TEST_TIMEOUT = 60
+
+def exec_test_script(script_path, write_fd):
+    """在fork出的子进程中执行测试脚本，输出写入管道"""
+    import runpy
+    
+    os.dup2(write_fd, 1)
+    os.dup2(write_fd, 2)
+    os.close(write_fd)
+    os.chdir(project_root)
+    sys.argv = [str(script_path)]
+    runpy.run_path(str(script_path), run_name="__main__")
+
+def start_test_script(script_path):
+    """
+    启动测试脚本
+    
+    支持fork的系统上直接fork当前解释器，用runpy执行脚本，省去新解释器的启动；
+    否则启动新的Python子进程。
+    
+    Returns:
+        (进程, 输出管道)
+    """
+    import multiprocessing
+    import subprocess
+    
+    if "fork" not in multiprocessing.get_all_start_methods():
+        process = subprocess.Popen(
+            [sys.executable, str(script_path)],
+            cwd=str(project_root),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT
+        )
+        return process, process.stdout
+    
+    read_fd, write_fd = os.pipe()
+    context = multiprocessing.get_context("fork")
+    process = context.Process(target=exec_test_script, args=(script_path, write_fd))
+    process.start()
+    os.close(write_fd)
+    return process, os.fdopen(read_fd, "rb")
+
+# 测试超时时保留的最后输出行数
+TIMEOUT_TAIL_LINES = 20
+
+def wait_process(process):
+    """等待测试进程结束，返回返回码"""
+    import subprocess
+    
+    if isinstance(process, subprocess.Popen):
+        return process.wait()
+    
+    process.join()
+    return process.exitcode
+
+def timeout_error(output):
+    """测试超时的异常，附带最后几行输出"""
+    tail = "\n".join(output.splitlines()[-TIMEOUT_TAIL_LINES:])
+    return TimeoutError(f"测试超时（{TEST_TIMEOUT}秒），最后输出:\n{tail}")
+
+def collect_test_scripts(handles):
+    """
+    读取全部测试脚本的输出并等待结束
+    
+    用selectors同时读取各脚本的输出管道，所有脚本共用一个截止时间，
+    超时的脚本被结束，已读取的输出仍然保留。
+    Windows的管道不支持select，逐个调用communicate。
+    
+    Args:
+        handles: {脚本名: (进程, 输出管道)}
+    
+    Returns:
+        {脚本名: (返回码, 输出, 异常)}
+    """
+    import time
+    
+    results = {}
+    
+    if os.name == "nt":
+        import subprocess
+        
+        for script, (process, _) in handles.items():
+            try:
+                output, _ = process.communicate(timeout=TEST_TIMEOUT)
+                output = output.decode("utf-8", errors="replace")
+                results[script] = (process.returncode, output, None)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                output, _ = process.communicate()
+                output = output.decode("utf-8", errors="replace")
+                results[script] = (None, output, timeout_error(output))
+        return results
+    
+    import selectors
+    
+    chunks = {script: [] for script in handles}
+    selector = selectors.DefaultSelector()
+    for script, (_, reader) in handles.items():
+        selector.register(reader, selectors.EVENT_READ, script)
+    
+    deadline = time.monotonic() + TEST_TIMEOUT
+    timed_out = set()
+    while selector.get_map():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            # 超时：结束仍未关闭输出的脚本
+            for key in list(selector.get_map().values()):
+                timed_out.add(key.data)
+                handles[key.data][0].kill()
+                selector.unregister(key.fileobj)
+                key.fileobj.close()
+            break
+        
+        for key, _ in selector.select(remaining):
+            data = os.read(key.fileobj.fileno(), 65536)
+            if data:
+                chunks[key.data].append(data)
+            else:
+                selector.unregister(key.fileobj)
+                key.fileobj.close()
+    selector.close()
+    
+    for script, (process, _) in handles.items():
+        returncode = wait_process(process)
+        output = b"".join(chunks[script]).decode("utf-8", errors="replace")
+        error = timeout_error(output) if script in timed_out else None
+        results[script] = (returncode, output, error)
+    return results
+
 def run_test_mode():
     """测试模式"""
     print("=" * 60)
@@ -290,54 +470,97 @@ def run_test_mode():
         "test_datafeed_mac.py",
     ]
     
-    import subprocess
+    # 预先编译VNPY模块的字节码缓存，各测试进程导入时直接读取.pyc
+    # （缓存已是最新时只检查修改时间；目录不可写时编译失败不影响测试）
+    import compileall
+    compileall.compile_dir(str(project_root / "vnpy"), quiet=2, workers=0)
+    
+    # fork前清空输出缓冲，避免子进程重复输出
+    sys.stdout.flush()
+    sys.stderr.flush()
     
+    # 先在主线程中启动全部测试脚本（fork时不存在其他线程）
+    started = []
     for script in test_scripts:
         script_path = project_root / script
-        if script_path.exists():
-            print(f"\n运行测试: {script}")
-            print("-" * 60)
-            try:
-                result = subprocess.run(
-                    [sys.executable, str(script_path)],
-                    cwd=str(project_root),
-                    timeout=60
-                )
-                if result.returncode == 0:
-                    print(f"✅ {script} 测试通过")
-                else:
-                    print(f"⚠️  {script} 测试未完全通过（可能是环境问题）")
-            except Exception as e:
-                print(f"❌ {script} 测试失败: {e}")
-        else:
+        if not script_path.exists():
             print(f"⚠️  测试脚本不存在: {script}")
+            continue
+        
+        try:
+            started.append((script, start_test_script(script_path), None))
+        except Exception as e:
+            started.append((script, None, e))
+    
+    # 各测试脚本并行运行，输出捕获后按原顺序打印，避免交错
+    results = collect_test_scripts({
+        script: handle for script, handle, error in started if handle
+    })
+    
+    for script, handle, error in started:
+        print(f"\n运行测试: {script}")
+        print("-" * 60)
+        try:
+            if error:
+                raise error
+            returncode, output, error = results[script]
+            if error:
+                raise error
+            print(output, end="")
+            if returncode == 0:
+                print(f"✅ {script} 测试通过")
+            else:
+                print(f"⚠️  {script} 测试未完全通过（可能是环境问题）")
+        except Exception as e:
+            print(f"❌ {script} 测试失败: {e}")
     
     print("\n" + "=" * 60)
     print("测试完成")
     print("=" * 60)
 
+# 命令行开关
+CLI_FLAGS = ("--no-ui", "--test", "--skip-check")
+
+def parse_args(argv):
+    """
+    解析命令行参数
+    
+    只有三个开关，直接扫描参数；出现其他参数（包括-h/--help）时
+    才交给argparse输出帮助或错误信息，常规启动不导入argparse。
+    """
+    if not set(argv).issubset(CLI_FLAGS):
+        import argparse
+        
+        parser = argparse.ArgumentParser(description="VNPY Mac系统A股量化实盘系统")
+        parser.add_argument("--no-ui", action="store_true", help="无UI模式（后台运行）")
+        parser.add_argument("--test", action="store_true", help="测试模式")
+        parser.add_argument("--skip-check", action="store_true", help="跳过依赖检查")
+        return parser.parse_args(argv)
+    
+    from types import SimpleNamespace
+    return SimpleNamespace(
+        no_ui="--no-ui" in argv,
+        test="--test" in argv,
+        skip_check="--skip-check" in argv
+    )
+
 def main():
     """主函数"""
-    parser = argparse.ArgumentParser(description="VNPY Mac系统A股量化实盘系统")
-    parser.add_argument("--no-ui", action="store_true", help="无UI模式（后台运行）")
-    parser.add_argument("--test", action="store_true", help="测试模式")
-    parser.add_argument("--skip-check", action="store_true", help="跳过依赖检查")
+    args = parse_args(sys.argv[1:])
     
-    args = parser.parse_args()
+    # 测试模式：只运行测试脚本，不检查依赖也不启动引擎（同时指定--no-ui时同样如此）
+    if args.test:
+        run_test_mode()
+        return
     
-    # 检查依赖（除非跳过）
-    if not args.skip_check and not args.test:
-        if not check_dependencies():
+    # 检查依赖（除非跳过），无UI模式不检查Qt相关依赖
+    if not args.skip_check:
+        if not check_dependencies(needs_ui=not args.no_ui):
             print("\n是否继续启动？(y/n): ", end="")
             choice = input().strip().lower()
             if choice != 'y':
                 return
     
-    # 测试模式
-    if args.test:
-        run_test_mode()
-        return
-    
     # 启动系统
     if args.no_ui:
         start_no_ui_mode()
@@ -17,18 +17,34 @@ VNPY量化功能自动化测试脚本
 
 import sys
 import os
+import io
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
 
 # 添加项目路径
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+# 设置环境变量VNPY_TEST_VERBOSE后，测试失败时输出完整堆栈
+VERBOSE = bool(os.environ.get("VNPY_TEST_VERBOSE"))
+
+def print_traceback():
+    """输出当前异常的堆栈（仅详细模式）"""
+    if not VERBOSE:
+        print("   设置VNPY_TEST_VERBOSE=1可查看详细错误堆栈")
+        return
+    
+    import traceback
+    traceback.print_exc()
+
+def print_banner(title):
+    """输出测试标题块"""
+    print(f"{'=' * 60}\n{title}\n{'=' * 60}")
+
 def test_multiprocess_manager():
     """测试多进程管理器"""
-    print("=" * 60)
-    print("测试: 多进程管理器")
-    print("=" * 60)
+    print_banner("测试: 多进程管理器")
     
     try:
         from vnpy.trader.multiprocess_manager import ProcessManager
@@ -39,18 +55,19 @@ def test_multiprocess_manager():
         # 测试基本功能
         print(f"✅ 管理器状态: 已初始化")
         
+        # 关闭管理器，释放共享内存
+        manager.close()
+        print("✅ ProcessManager 已关闭")
+        
         return True
     except Exception as e:
         print(f"❌ 测试失败: {e}")
-        import traceback
-        traceback.print_exc()
+        print_traceback()
         return False
 
 def test_enhanced_cta_template():
     """测试增强策略模板"""
-    print("=" * 60)
-    print("测试: 增强策略模板")
-    print("=" * 60)
+    print_banner("测试: 增强策略模板")
     
     try:
         from vnpy.trader.enhanced_cta_template import EnhancedCtaTemplate
@@ -67,8 +84,10 @@ def test_enhanced_cta_template():
             'load_bar'
         ]
         
+        # 一次取出类的全部属性名，不再逐个hasattr
+        attributes = set(dir(EnhancedCtaTemplate))
         for method in required_methods:
-            if hasattr(EnhancedCtaTemplate, method):
+            if method in attributes:
                 print(f"✅ 方法存在: {method}")
             else:
                 print(f"❌ 方法缺失: {method}")
@@ -77,15 +96,12 @@ def test_enhanced_cta_template():
         return True
     except Exception as e:
         print(f"❌ 测试失败: {e}")
-        import traceback
-        traceback.print_exc()
+        print_traceback()
         return False
 
 def test_history_manager():
     """测试历史数据管理器"""
-    print("=" * 60)
-    print("测试: 历史数据管理器")
-    print("=" * 60)
+    print_banner("测试: 历史数据管理器")
     
     try:
         from vnpy.trader.history_manager import HistoryManager
@@ -105,15 +121,12 @@ def test_history_manager():
                 raise
     except Exception as e:
         print(f"❌ 测试失败: {e}")
-        import traceback
-        traceback.print_exc()
+        print_traceback()
         return False
 
 def test_data_filter():
     """测试数据过滤器"""
-    print("=" * 60)
-    print("测试: 数据过滤器")
-    print("=" * 60)
+    print_banner("测试: 数据过滤器")
     
     try:
         from vnpy.trader.data_filter import DataFilter
@@ -122,25 +135,35 @@ def test_data_filter():
         print("✅ DataFilter 创建成功")
         
         # 测试A股交易时间检查
-        from datetime import datetime, time
         from vnpy.trader.constant import Exchange
         test_datetime = datetime(2024, 1, 1, 10, 30)  # 10:30，应该是交易时间
         
         is_trading = filter_obj.is_trading_time(test_datetime, Exchange.SSE)
         print(f"✅ 交易时间检查: {test_datetime.time()} -> {is_trading}")
         
+        # 批量交易时间检查：一个交易日内每分钟的时间点，结果应与逐个检查一致
+        import numpy as np
+        times = np.arange(
+            np.datetime64("2024-01-01T09:00"),
+            np.datetime64("2024-01-01T15:30"),
+            np.timedelta64(1, "m")
+        )
+        mask = filter_obj.is_trading_time_array(times, Exchange.SSE)
+        expected = [filter_obj.is_trading_time(dt, Exchange.SSE) for dt in times.astype(datetime)]
+        if not isinstance(mask, np.ndarray) or mask.dtype != np.bool_ or mask.tolist() != expected:
+            print("❌ 批量交易时间检查结果与逐个检查不一致")
+            return False
+        print(f"✅ 批量交易时间检查: {mask.sum()}/{len(mask)} 个时间点在交易时段")
+        
         return True
     except Exception as e:
         print(f"❌ 测试失败: {e}")
-        import traceback
-        traceback.print_exc()
+        print_traceback()
         return False
 
 def test_optimization_metrics():
     """测试优化指标"""
-    print("=" * 60)
-    print("测试: 优化指标计算")
-    print("=" * 60)
+    print_banner("测试: 优化指标计算")
     
     try:
         from vnpy.trader.optimization_metrics import OptimizationMetrics
@@ -149,7 +172,9 @@ def test_optimization_metrics():
         print("✅ OptimizationMetrics 创建成功")
         
         # 测试指标计算（使用模拟数据）
-        returns = [0.01, -0.02, 0.03, -0.01, 0.02]
+        # 指标函数直接接受float64数组，不再逐个转换列表
+        import numpy as np
+        returns = np.array([0.01, -0.02, 0.03, -0.01, 0.02], dtype=np.float64)
         
         sharpe = metrics.calculate_sharpe_ratio(returns)
         print(f"✅ Sharpe比率计算: {sharpe:.4f}")
@@ -167,15 +192,12 @@ def test_optimization_metrics():
         return True
     except Exception as e:
         print(f"❌ 测试失败: {e}")
-        import traceback
-        traceback.print_exc()
+        print_traceback()
         return False
 
 def test_risk_manager():
     """测试风险管理器"""
-    print("=" * 60)
-    print("测试: 增强风险管理器")
-    print("=" * 60)
+    print_banner("测试: 增强风险管理器")
     
     try:
         from vnpy.trader.enhanced_risk_manager import EnhancedRiskManager
@@ -196,15 +218,12 @@ def test_risk_manager():
         return True
     except Exception as e:
         print(f"❌ 测试失败: {e}")
-        import traceback
-        traceback.print_exc()
+        print_traceback()
         return False
 
 def test_gateway_adapter():
     """测试Gateway适配器"""
-    print("=" * 60)
-    print("测试: Gateway Mac适配器")
-    print("=" * 60)
+    print_banner("测试: Gateway Mac适配器")
     
     try:
         from vnpy.trader.gateway_mac_adapter import GatewayMacAdapter, create_xtp_adapter, create_tora_adapter
@@ -222,15 +241,12 @@ def test_gateway_adapter():
         return True
     except Exception as e:
         print(f"❌ 测试失败: {e}")
-        import traceback
-        traceback.print_exc()
+        print_traceback()
         return False
 
 def test_platform_utils():
     """测试平台工具"""
-    print("=" * 60)
-    print("测试: Mac平台工具")
-    print("=" * 60)
+    print_banner("测试: Mac平台工具")
     
     try:
         from vnpy.trader.platform_utils import is_mac_system, get_mac_arch
@@ -244,18 +260,62 @@ def test_platform_utils():
         return True
     except Exception as e:
         print(f"❌ 测试失败: {e}")
-        import traceback
-        traceback.print_exc()
+        print_traceback()
+        return False
+
+class WorkerOutput:
+    """
+    工作进程的标准输出，写入当前测试的输出缓冲
+    
+    日志模块在添加处理器时会保存当时的sys.stdout，
+    所以在进程启动时整体替换，而不是每个测试临时重定向。
+    """
+    
+    def __init__(self):
+        self.buffer = io.StringIO()
+    
+    def write(self, text):
+        return self.buffer.write(text)
+    
+    def flush(self):
+        pass
+    
+    def isatty(self):
         return False
 
+worker_output = None
+
+def init_worker():
+    """初始化工作进程，替换标准输出"""
+    global worker_output
+    worker_output = WorkerOutput()
+    sys.stdout = sys.stderr = worker_output
+
+def run_captured(test_func):
+    """
+    在工作进程中运行测试函数，捕获其输出
+    
+    Returns:
+        (是否通过, 测试输出)
+    """
+    worker_output.buffer = io.StringIO()
+    try:
+        success = test_func()
+    except Exception as e:
+        print(f"❌ 测试异常: {e}")
+        success = False
+    return success, worker_output.buffer.getvalue()
+
 def main():
     """主函数"""
-    print("=" * 60)
-    print("VNPY量化功能自动化测试")
-    print("=" * 60)
-    print(f"测试时间: {datetime.now()}")
-    print(f"Python版本: {sys.version}")
-    print()
+    print("\n".join([
+        "=" * 60,
+        "VNPY量化功能自动化测试",
+        "=" * 60,
+        f"测试时间: {datetime.now()}",
+        f"Python版本: {sys.version}",
+        ""
+    ]))
     
     # 测试列表
     tests = [
@@ -269,40 +329,41 @@ def main():
         ("Gateway适配器", test_gateway_adapter),
     ]
     
-    # 运行测试
+    # 运行测试：各测试在工作进程中并行执行（导入互不影响），输出按原顺序打印
     results = []
-    for name, test_func in tests:
-        try:
-            success = test_func()
-            results.append((name, success))
-            print()
-        except Exception as e:
-            print(f"❌ {name} 测试异常: {e}")
-            results.append((name, False))
-            print()
-    
-    # 统计结果
-    print("=" * 60)
-    print("测试总结")
-    print("=" * 60)
+    max_workers = min(len(tests), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker) as executor:
+        futures = [(name, executor.submit(run_captured, test_func)) for name, test_func in tests]
+        
+        for name, future in futures:
+            try:
+                success, output = future.result()
+                print(output)
+                results.append((name, success))
+            except Exception as e:
+                print(f"❌ {name} 测试异常: {e}")
+                results.append((name, False))
+                print()
     
+    # 统计结果（整段拼接后一次输出）
     passed = sum(1 for _, success in results if success)
     total = len(results)
     
-    for name, success in results:
-        status = "✅" if success else "❌"
-        print(f"{status} {name}")
-    
-    print()
-    print(f"通过: {passed}/{total} ({passed/max(total,1)*100:.1f}%)")
+    lines = ["=" * 60, "测试总结", "=" * 60]
+    lines.extend(f"{'✅' if success else '❌'} {name}" for name, success in results)
+    lines.append("")
+    lines.append(f"通过: {passed}/{total} ({passed/max(total,1)*100:.1f}%)")
     
     if passed == total:
-        print("\n✅ 所有测试通过！")
-        return 0
+        lines.append("\n✅ 所有测试通过！")
+        code = 0
     else:
-        print(f"\n⚠️  {total - passed} 个测试未通过")
-        print("注意: 部分测试失败可能是因为缺少VNPY依赖，这是环境问题，不是代码问题")
-        return 1
+        lines.append(f"\n⚠️  {total - passed} 个测试未通过")
+        lines.append("注意: 部分测试失败可能是因为缺少VNPY依赖，这是环境问题，不是代码问题")
+        code = 1
+    
+    print("\n".join(lines))
+    return code
 
 if __name__ == "__main__":
     sys.exit(main())